@@ -4,9 +4,10 @@ from collections import defaultdict
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import spacy
 import yaml
 
+from prompt_efficiency_suite.nlp_pool import get_nlp
+
 
 class BatchOptimizer:
     def __init__(self, scan_paths: List[str], macro_threshold: int = 2):
@@ -15,7 +16,7 @@ class BatchOptimizer:
         self.patterns = defaultdict(int)
         self.files = []
         self.macros = {}
-        self.nlp = spacy.load("en_core_web_sm")
+        self.nlp = get_nlp()
 
     def _parse_file_content(self, file_path: Path) -> str:
         """Parse file content based on its format."""
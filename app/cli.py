@@ -7,6 +7,9 @@ import click
 import yaml
 
 from app.compressor.multimodal import MultimodalCompressor
+from prompt_efficiency_suite.domain_bundle import compile_domain_bundle
+from prompt_efficiency_suite.image_optimizer import DEFAULT_IMAGE_MODEL
+from prompt_efficiency_suite.token_counter import get_token_engine
 
 from .batch.optimizer import BatchOptimizer
 from .cicd.integration import CICDIntegration
@@ -41,13 +44,24 @@ def cli():
 @click.option(
     "--min-importance", default=0.7, help="Minimum importance score for tokens"
 )
+@click.option(
+    "--max-tokens",
+    type=int,
+    help="Token budget; keeps the most important sentences that fit",
+)
 @click.option("--config", help="Path to config file")
 def trim(
-    domain: str, input: str, output: str, min_importance: float, config: Optional[str]
+    domain: str,
+    input: str,
+    output: str,
+    min_importance: float,
+    max_tokens: Optional[int],
+    config: Optional[str],
 ):
     """Trim a prompt while preserving important domain-specific terms."""
     config_data = load_config(config)
     dictionary_path = config_data.get("paths", {}).get("dictionary_path", "data/dicts")
+    get_token_engine().configure_cache(config_data.get("cache", {}))
 
     # Use Path for path handling
     dictionary_path = Path(dictionary_path)
@@ -63,7 +77,10 @@ def trim(
         prompt = f.read()
 
     try:
-        trimmed_prompt = trimmer.trim_prompt(prompt, domain, min_importance)
+        if max_tokens is not None:
+            trimmed_prompt = trimmer.trim_to_budget(prompt, domain, max_tokens)
+        else:
+            trimmed_prompt = trimmer.trim_prompt(prompt, domain, min_importance)
         tokens_before = trimmer.get_token_count(prompt)
         tokens_after = trimmer.get_token_count(trimmed_prompt)
 
@@ -81,6 +98,25 @@ def trim(
         raise click.Abort()
 
 
+@cli.command("build-bundles")
+@click.option(
+    "--dictionary-path",
+    type=click.Path(exists=True, file_okay=False),
+    default="data/dicts",
+    help="Directory of JSON/YAML domain dictionaries",
+)
+def build_bundles(dictionary_path):
+    """Compile domain dictionaries into mmap-loadable bundles."""
+    sources = sorted(
+        path
+        for pattern in ("*.json", "*.yaml", "*.yml")
+        for path in Path(dictionary_path).glob(pattern)
+    )
+    for source in sources:
+        bundle_path = compile_domain_bundle(source)
+        click.echo(f"Compiled {source} -> {bundle_path}")
+
+
 @cli.command()
 @click.option("--repo", type=click.Path(exists=True), help="Path to prompt repository")
 @click.option(
@@ -114,23 +150,65 @@ def bulk_optimize(repo, report, config):
     type=click.Choice(["json", "yaml", "python", "text", "image"]),
     help="Content format",
 )
-def compress(input, output, format):
+@click.option(
+    "--model",
+    default=DEFAULT_IMAGE_MODEL,
+    help="Target model whose image token pricing guides image resizing",
+)
+@click.option("--drop-nulls", is_flag=True, help="Drop null members (JSON/YAML)")
+@click.option(
+    "--drop-empty", is_flag=True, help="Drop empty object/array members (JSON/YAML)"
+)
+@click.option(
+    "--drop-key", multiple=True, help="Drop this key at any depth (JSON/YAML)"
+)
+@click.option("--strip-docstrings", is_flag=True, help="Drop docstrings (Python)")
+@click.option("--rename-locals", is_flag=True, help="Shorten local names (Python)")
+def compress(
+    input,
+    output,
+    format,
+    model,
+    drop_nulls,
+    drop_empty,
+    drop_key,
+    strip_docstrings,
+    rename_locals,
+):
     """Compress content using the multimodal compressor."""
-    compressor = MultimodalCompressor()
-
-    with open(input, "r") as f:
-        content = f.read()
-
-    compressed = compressor.compress(content, format)
-    ratio = compressor.get_compression_ratio()
+    compressor = MultimodalCompressor(
+        model=model,
+        minify_options={
+            "drop_nulls": drop_nulls,
+            "drop_empty": drop_empty,
+            "drop_keys": drop_key,
+        },
+        code_options={
+            "strip_docstrings": strip_docstrings,
+            "rename_locals": rename_locals,
+        },
+    )
 
     output_path = Path(output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output, "w") as f:
-        f.write(compressed)
+    if format in ["json", "yaml"]:
+        # Stream structured data so huge documents are never held in memory
+        compressor.compress_stream(input, output_path, format)
+    else:
+        with open(input, "r") as f:
+            content = f.read()
+
+        compressed = compressor.compress(content, format)
+
+        with open(output, "w") as f:
+            f.write(compressed)
+
+    ratio = compressor.get_compression_ratio()
 
     click.echo(f"Compression complete. Ratio: {ratio:.2f}")
+    if format == "image":
+        click.echo(f"Estimated image tokens saved: {compressor.image_tokens_saved}")
 
 
 if __name__ == "__main__":
@@ -1,20 +1,43 @@
 import base64
 import io
-import json
 import re
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-import yaml
 from PIL import Image
 
+from prompt_efficiency_suite.code_minifier import CodeMinifier
+from prompt_efficiency_suite.image_optimizer import (
+    DEFAULT_IMAGE_MODEL,
+    ImageOptimizer,
+)
+from prompt_efficiency_suite.streaming import StreamSource
+from prompt_efficiency_suite.structured_minifier import (
+    minify_json,
+    minify_json_stream,
+    minify_yaml,
+    minify_yaml_stream,
+)
+
 
 class MultimodalCompressor:
-    def __init__(self):
+    def __init__(
+        self,
+        model: str = DEFAULT_IMAGE_MODEL,
+        image_options: Optional[Dict[str, Any]] = None,
+        minify_options: Optional[Dict[str, Any]] = None,
+        code_options: Optional[Dict[str, Any]] = None,
+    ):
         self.original_tokens = 0
         self.compressed_tokens = 0
+        self.image_tokens_saved = 0
         self.Image = Image
         self.io = io
+        self.image_optimizer = ImageOptimizer(model=model, **(image_options or {}))
+        # drop_nulls / drop_empty / drop_keys for JSON and YAML content
+        self.minify_options = minify_options or {}
+        # strip_comments / strip_docstrings / rename_locals for Python code
+        self.code_minifier = CodeMinifier(**(code_options or {}))
 
     def compress(self, content: str, content_type: str = "text") -> str:
         """Compress content based on its type."""
@@ -29,62 +52,61 @@ class MultimodalCompressor:
         else:
             return self._compress_text(content)
 
+    def compress_stream(
+        self, source: StreamSource, sink: StreamSource, content_type: str
+    ) -> None:
+        """Compress JSON or YAML from a file or stream without loading it whole."""
+        if content_type == "json":
+            minify, error = minify_json_stream, "Invalid JSON content"
+        elif content_type in ["yaml", "yml"]:
+            minify, error = minify_yaml_stream, "Invalid YAML content"
+        else:
+            raise ValueError(f"Streaming is not supported for {content_type}")
+        try:
+            stats = minify(source, sink, **self.minify_options)
+        except ValueError as e:
+            raise ValueError(f"{error}: {e}")
+        self.original_tokens = stats.input_chars
+        self.compressed_tokens = stats.output_chars
+
     def _compress_json(self, content: str) -> str:
         """Compress JSON content."""
         try:
-            data = json.loads(content)
-            # Remove unnecessary whitespace
-            compressed = json.dumps(data, separators=(",", ":"))
-            self._update_token_counts(content, compressed)
-            return compressed
-        except json.JSONDecodeError:
+            compressed = minify_json(content, **self.minify_options)
+        except ValueError:
             raise ValueError("Invalid JSON content")
+        self._update_token_counts(content, compressed)
+        return compressed
 
     def _compress_yaml(self, content: str) -> str:
         """Compress YAML content."""
         try:
-            data = yaml.safe_load(content)
             # Convert to JSON for better compression
-            compressed = json.dumps(data, separators=(",", ":"))
-            self._update_token_counts(content, compressed)
-            return compressed
-        except yaml.YAMLError:
+            compressed = minify_yaml(content, **self.minify_options)
+        except ValueError:
             raise ValueError("Invalid YAML content")
+        self._update_token_counts(content, compressed)
+        return compressed
 
     def _compress_python(self, content: str) -> str:
-        """Compress Python code."""
-        # Remove comments and unnecessary whitespace
-        lines = []
-        for line in content.split("\n"):
-            line = line.strip()
-            if line and not line.startswith("#"):
-                # Preserve docstrings
-                if not (line.startswith('"""') or line.startswith("'''")):
-                    lines.append(line)
-
-        compressed = " ".join(lines)
+        """Compress Python code, keeping it valid."""
+        compressed = self.code_minifier.minify(content, "python")
         self._update_token_counts(content, compressed)
         return compressed
 
     def _compress_image(self, content: str) -> str:
-        """Compress image content."""
+        """Compress image content for the target model's image pricing."""
         try:
-            # Decode base64 image
             image_data = base64.b64decode(content)
-            image = self.Image.open(self.io.BytesIO(image_data))
-
-            # Compress image
-            output = self.io.BytesIO()
-            image.save(output, format="JPEG", quality=60, optimize=True)
-            compressed_data = output.getvalue()
-
-            # Encode back to base64
-            compressed = base64.b64encode(compressed_data).decode()
-            self._update_token_counts(content, compressed)
-            return compressed
+            optimized = self.image_optimizer.optimize(image_data)
         except Exception as e:
             raise ValueError(f"Image compression failed: {str(e)}")
 
+        compressed = base64.b64encode(optimized.data).decode()
+        self.image_tokens_saved = optimized.tokens_saved
+        self._update_token_counts(content, compressed)
+        return compressed
+
     def _compress_text(self, content: str) -> str:
         """Compress text content."""
         # Basic text compression: remove extra whitespace
@@ -1,25 +1,51 @@
 import os
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
 
+import yaml
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
+from prompt_efficiency_suite.token_counter import get_token_engine
+
 from .cicd.integration import CICDIntegration
 from .trimmer.domain_aware import DomainAwareTrimmer
 
 # Load environment variables
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pick up dictionary edits without restarting the service
+    trimmer.start_watching()
+    yield
+    trimmer.stop_watching()
+
+
 app = FastAPI(
     title="Prompt Efficiency Suite",
     description="A unified platform for optimizing, managing, and monitoring LLM prompts",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Load shared settings
+config_path = os.getenv("CONFIG_PATH", "config.yaml")
+config: Dict[str, Any] = {}
+if os.path.exists(config_path):
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f) or {}
+
 # Initialize services
+get_token_engine().configure_cache(config.get("cache", {}))
 dictionary_path = os.getenv("DICTIONARY_PATH", "data/dicts")
-trimmer = DomainAwareTrimmer(dictionary_path=dictionary_path)
+trimmer = DomainAwareTrimmer(
+    dictionary_path=dictionary_path,
+    poll_interval=float(os.getenv("DICTIONARY_POLL_INTERVAL", "2.0")),
+)
+trimmer.preload()
 cicd = CICDIntegration(
     max_tokens=int(os.getenv("MAX_DEFAULT_TOKENS", "1800")),
     build_failure=os.getenv("BUILD_FAILURE", "true").lower() == "true",
@@ -31,6 +57,7 @@ class TrimRequest(BaseModel):
     prompt: str
     domain: str
     min_importance: Optional[float] = 0.7
+    max_tokens: Optional[int] = None
 
 
 class TrimResponse(BaseModel):
@@ -43,9 +70,14 @@ class TrimResponse(BaseModel):
 async def trim_prompt(request: TrimRequest):
     try:
         tokens_before = trimmer.get_token_count(request.prompt)
-        trimmed_prompt = trimmer.trim_prompt(
-            request.prompt, request.domain, request.min_importance
-        )
+        if request.max_tokens is not None:
+            trimmed_prompt = trimmer.trim_to_budget(
+                request.prompt, request.domain, request.max_tokens
+            )
+        else:
+            trimmed_prompt = trimmer.trim_prompt(
+                request.prompt, request.domain, request.min_importance
+            )
         tokens_after = trimmer.get_token_count(trimmed_prompt)
 
         return TrimResponse(
@@ -1,67 +1,100 @@
-import json
 import logging
 import os
-import re
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
-import tiktoken
+from prompt_efficiency_suite.budget_trimming import fit_to_budget, score_spans
+from prompt_efficiency_suite.term_matcher import PackedTermMatcher, TermMatcher
+from prompt_efficiency_suite.token_counter import get_token_engine
+
+from .registry import DEFAULT_POLL_INTERVAL, DictionaryRegistry, LoadedDictionary
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
 class DomainAwareTrimmer:
-    def __init__(self, dictionary_path: str = "data/dicts"):
+    def __init__(
+        self,
+        dictionary_path: str = "data/dicts",
+        model: str = "gpt-4",
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
         # Handle relative paths
         self.dictionary_path = Path(dictionary_path).resolve()
         logger.debug(f"Dictionary path set to: {self.dictionary_path}")
-        self.enc = tiktoken.get_encoding("cl100k_base")
-        self.domain_dictionaries: Dict[str, Dict[str, float]] = {}
+        self.model = model
+        self.token_engine = get_token_engine()
+        self.registry = DictionaryRegistry(
+            self.dictionary_path,
+            fallback_paths=[Path.cwd() / "data/dicts"],
+            poll_interval=poll_interval,
+        )
+
+    @property
+    def domain_dictionaries(self) -> Dict[str, Dict[str, float]]:
+        """Term importance of every loaded domain."""
+        return {
+            domain: entry.importance for domain, entry in self.registry.entries.items()
+        }
+
+    @property
+    def term_matchers(self) -> Dict[str, Union[TermMatcher, PackedTermMatcher]]:
+        """Term matcher of every loaded domain."""
+        return {
+            domain: entry.matcher for domain, entry in self.registry.entries.items()
+        }
 
     def load_domain_dictionary(self, domain: str) -> None:
-        """Load a domain-specific dictionary from file."""
-        dict_path = self.dictionary_path / f"{domain}.json"
-        logger.debug(f"Attempting to load dictionary from: {dict_path}")
-        if dict_path.exists():
-            logger.debug(f"Dictionary file found at: {dict_path}")
-            with open(dict_path, "r") as f:
-                self.domain_dictionaries[domain] = json.load(f)
-                logger.debug(
-                    f"Loaded {len(self.domain_dictionaries[domain])} terms for domain {domain}"
-                )
-        else:
-            logger.error(f"Dictionary file not found at: {dict_path}")
-            # Try current working directory as fallback
-            cwd_path = Path.cwd() / "data/dicts" / f"{domain}.json"
-            logger.debug(f"Trying fallback path: {cwd_path}")
-            if cwd_path.exists():
-                logger.debug(f"Dictionary file found at fallback path: {cwd_path}")
-                with open(cwd_path, "r") as f:
-                    self.domain_dictionaries[domain] = json.load(f)
-                    logger.debug(
-                        f"Loaded {len(self.domain_dictionaries[domain])} terms for domain {domain}"
-                    )
+        """Load a domain-specific dictionary from file.
+
+        A compiled bundle (``<domain>.pesb``) is mapped directly when it is at
+        least as new as the JSON dictionary; otherwise the JSON is parsed.
+        """
+        self.registry.load(domain)
+
+    def preload(self) -> List[str]:
+        """Load every dictionary in the dictionary directory up front.
+
+        Returns:
+            List[str]: Domains that were loaded.
+        """
+        return self.registry.preload()
+
+    def start_watching(self) -> None:
+        """Reload dictionaries in the background when their files change."""
+        self.registry.start()
+
+    def stop_watching(self) -> None:
+        """Stop reloading dictionaries."""
+        self.registry.stop()
+
+    def _get_dictionary(self, domain: str) -> LoadedDictionary:
+        """Get a domain's dictionary, loading it on first use."""
+        entry = self.registry.get(domain)
+        if entry is None:
+            raise ValueError(f"Domain dictionary not found for {domain}")
+        return entry
 
     def find_important_spans(
         self, text: str, domain: str, min_importance: float = 0.7
     ) -> List[tuple[int, int]]:
         """Find spans of text that contain important domain terms."""
-        important_spans = []
-
-        # Sort terms by length (longest first) to handle overlapping matches
-        terms = sorted(
-            self.domain_dictionaries[domain].items(),
-            key=lambda x: len(x[0]),
-            reverse=True,
+        return self._find_important_spans(
+            text, self._get_dictionary(domain), min_importance
         )
 
-        # Find all occurrences of each term
-        for term, importance in terms:
-            if importance >= min_importance:
-                pattern = re.compile(re.escape(term), re.IGNORECASE)
-                for match in pattern.finditer(text):
-                    important_spans.append((match.start(), match.end()))
+    def _find_important_spans(
+        self, text: str, dictionary: LoadedDictionary, min_importance: float
+    ) -> List[tuple[int, int]]:
+        """Find important spans using one version of a domain dictionary."""
+        important_spans = []
+
+        # Find all occurrences of every sufficiently important term in one pass
+        importance = dictionary.importance
+        for match in dictionary.matcher.iter_matches(text):
+            if importance[match.term] >= min_importance:
+                important_spans.append((match.start, match.end))
 
         # Sort spans by start position
         important_spans.sort()
@@ -83,15 +116,10 @@ class DomainAwareTrimmer:
 
     def trim_prompt(self, prompt: str, domain: str, min_importance: float = 0.7) -> str:
         """Trim a prompt while preserving important domain-specific terms."""
-        if domain not in self.domain_dictionaries:
-            logger.debug(f"Loading dictionary for domain: {domain}")
-            self.load_domain_dictionary(domain)
-
-        if domain not in self.domain_dictionaries:
-            raise ValueError(f"Domain dictionary not found for {domain}")
+        dictionary = self._get_dictionary(domain)
 
         # Find important spans
-        important_spans = self.find_important_spans(prompt, domain, min_importance)
+        important_spans = self._find_important_spans(prompt, dictionary, min_importance)
         logger.debug(f"Found {len(important_spans)} important spans")
 
         # Extract and join important spans
@@ -100,6 +128,29 @@ class DomainAwareTrimmer:
 
         return trimmed_text
 
+    def trim_to_budget(
+        self, prompt: str, domain: str, max_tokens: int, model: Optional[str] = None
+    ) -> str:
+        """Trim a prompt to a token budget, keeping its most important sentences.
+
+        Sentences are valued by the summed importance of the domain terms they
+        contain, and the most valuable set that fits ``max_tokens`` is kept in
+        order, in a single pass.
+        """
+        dictionary = self._get_dictionary(domain)
+        matches = list(dictionary.matcher.iter_matches(prompt))
+        selection = fit_to_budget(
+            prompt,
+            max_tokens,
+            lambda spans: score_spans(spans, matches, dictionary.importance),
+            model or self.model,
+            self.token_engine,
+        )
+        logger.debug(
+            f"Kept {len(selection.spans)} spans ({selection.token_count} tokens)"
+        )
+        return selection.text
+
     def get_token_count(self, prompt: str) -> int:
         """Get the token count for a prompt."""
-        return len(self.enc.encode(prompt))
+        return self.token_engine.count(prompt, self.model)
@@ -0,0 +1,189 @@
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from prompt_efficiency_suite.domain_bundle import BUNDLE_SUFFIX, DomainBundle
+from prompt_efficiency_suite.term_matcher import PackedTermMatcher, TermMatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+@dataclass(frozen=True)
+class LoadedDictionary:
+    """A domain dictionary and its matcher, as loaded from one file version."""
+
+    domain: str
+    importance: Dict[str, float]
+    matcher: Union[TermMatcher, PackedTermMatcher]
+    path: Path
+    mtime_ns: int
+
+
+class DictionaryRegistry:
+    """Domain dictionaries that are reloaded when their files change.
+
+    Loaded dictionaries live in a mapping that is replaced, never mutated, so
+    a reader that fetched an entry keeps a consistent dictionary and matcher
+    for the whole request while a newer version is swapped in. Reloads run
+    on the polling thread; readers never wait for them.
+    """
+
+    def __init__(
+        self,
+        dictionary_path: Union[str, Path],
+        fallback_paths: Sequence[Union[str, Path]] = (),
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        self.dictionary_path = Path(dictionary_path)
+        self.search_paths = [self.dictionary_path] + [Path(p) for p in fallback_paths]
+        self.poll_interval = poll_interval
+        self._entries: Dict[str, LoadedDictionary] = {}
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def entries(self) -> Dict[str, LoadedDictionary]:
+        """Snapshot of the loaded dictionaries."""
+        return self._entries
+
+    def get(self, domain: str) -> Optional[LoadedDictionary]:
+        """Get a domain's dictionary, loading it on first use."""
+        entry = self._entries.get(domain)
+        if entry is None:
+            entry = self.load(domain)
+        return entry
+
+    def load(self, domain: str) -> Optional[LoadedDictionary]:
+        """Load a domain's dictionary from disk and swap it in."""
+        source = self._find_source(domain)
+        if source is None:
+            logger.error(f"Dictionary for {domain} not found in: {self.search_paths}")
+            return None
+        return self._swap(self._read(domain, *source))
+
+    def preload(self) -> List[str]:
+        """Load every dictionary in the dictionary directory."""
+        domains = sorted(
+            {
+                path.stem
+                for pattern in ("*.json", f"*{BUNDLE_SUFFIX}")
+                for path in self.dictionary_path.glob(pattern)
+            }
+        )
+        loaded = []
+        for domain in domains:
+            try:
+                if domain in self._entries or self.load(domain):
+                    loaded.append(domain)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not preload dictionary for {domain}: {e}")
+        return loaded
+
+    def refresh(self) -> List[str]:
+        """Reload every loaded dictionary whose file changed.
+
+        A dictionary that fails to load (e.g. a file caught mid-write) keeps
+        its previous version until the next refresh.
+
+        Returns:
+            List[str]: Domains that were reloaded.
+        """
+        reloaded = []
+        for domain, current in self._entries.items():
+            source = self._find_source(domain)
+            if source is None or source == (current.path, current.mtime_ns):
+                continue
+            try:
+                self._swap(self._read(domain, *source))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Keeping previous dictionary for {domain}: {e}")
+                continue
+            logger.info(f"Reloaded dictionary for {domain} from {source[0]}")
+            reloaded.append(domain)
+        return reloaded
+
+    def start(self) -> None:
+        """Start polling dictionary files in a background thread."""
+        if self._thread is not None or self.poll_interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="dictionary-registry", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the polling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self) -> None:
+        """Poll for changed dictionaries until stopped."""
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Dictionary refresh failed")
+
+    def _find_source(self, domain: str) -> Optional[Tuple[Path, int]]:
+        """Pick the file to load a domain from, with its modification time.
+
+        A compiled bundle is used when it is at least as new as the JSON
+        dictionary next to it.
+        """
+        for directory in self.search_paths:
+            candidates = []
+            for path in (
+                directory / f"{domain}{BUNDLE_SUFFIX}",
+                directory / f"{domain}.json",
+            ):
+                try:
+                    candidates.append((path, os.stat(path).st_mtime_ns))
+                except FileNotFoundError:
+                    continue
+            if candidates:
+                return max(candidates, key=lambda candidate: candidate[1])
+        return None
+
+    def _read(self, domain: str, path: Path, mtime_ns: int) -> LoadedDictionary:
+        """Parse a dictionary file and build its matcher."""
+        importance: Dict[str, float]
+        matcher: Union[TermMatcher, PackedTermMatcher]
+        if path.suffix == BUNDLE_SUFFIX:
+            bundle = DomainBundle(path)
+            importance, matcher = bundle.importance(), bundle.matcher
+        else:
+            with open(path, "r") as f:
+                importance = json.load(f)
+            matcher = TermMatcher(importance)
+        logger.debug(f"Loaded {len(importance)} terms for domain {domain}")
+        return LoadedDictionary(domain, importance, matcher, path, mtime_ns)
+
+    def _swap(self, entry: LoadedDictionary) -> LoadedDictionary:
+        """Publish a dictionary by replacing the entries mapping.
+
+        A read of an older version of the file already published is dropped,
+        so a slow request-path load cannot undo a newer reload.
+
+        Returns:
+            LoadedDictionary: The entry now published for the domain.
+        """
+        with self._load_lock:
+            current = self._entries.get(entry.domain)
+            if (
+                current is not None
+                and current.path == entry.path
+                and current.mtime_ns > entry.mtime_ns
+            ):
+                return current
+            self._entries = {**self._entries, entry.domain: entry}
+            return entry
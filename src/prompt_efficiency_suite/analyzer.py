@@ -3,17 +3,50 @@ Prompt Analyzer module for analyzing prompts and their components.
 """
 
 import json
+import operator
 import re
+import unicodedata
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Pattern, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Pattern, Union
 
-import spacy
 from pydantic import BaseModel
 
+from .columnar import ColumnarStore
 from .models import AnalysisMetrics, AnalysisResult
+from .nlp_pool import (
+    DEFAULT_SPACY_MODEL,
+    FEATURE_COMPONENTS,
+    components_to_disable,
+    get_nlp,
+)
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+    from spacy.tokens import Doc
+
+DEFAULT_NLP_BATCH_SIZE = 64
+
+SPACY_MODE = "spacy"
+FAST_MODE = "fast"
+ANALYSIS_MODES = (SPACY_MODE, FAST_MODE)
+
+# Regex approximation of spaCy's English tokenizer for the fast analysis mode.
+# Like spaCy, whitespace other than a single separating space is a token.
+_FAST_TOKEN_PATTERN = re.compile(
+    r"\w+(?=n't\b)|n't\b|'(?:s|re|ve|ll|d|m)\b|\d+(?:[.,]\d+)+|\w+|\.{2,}"
+    r"|[^\w\s]|\s{2,}|[^\S ]",
+    re.IGNORECASE,
+)
+_FAST_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _is_punct(token: str) -> bool:
+    """Check whether a token consists only of punctuation, like spaCy's is_punct."""
+    return all(unicodedata.category(char).startswith("P") for char in token)
 
 
 @dataclass
@@ -56,10 +89,69 @@ class PromptAnalysis(BaseModel):
 class PromptAnalyzer:
     """Analyzes prompts for efficiency and quality metrics."""
 
-    def __init__(self) -> None:
-        """Initialize the analyzer with a specific spaCy model."""
-        self.nlp = spacy.load("en_core_web_sm")
+    def __init__(
+        self,
+        model_name: str = DEFAULT_SPACY_MODEL,
+        features: Optional[Iterable[str]] = None,
+        batch_size: int = DEFAULT_NLP_BATCH_SIZE,
+        n_process: int = 1,
+        analysis_mode: str = SPACY_MODE,
+    ) -> None:
+        """Initialize the analyzer.
+
+        The spaCy pipeline is shared process-wide and loaded on first use, so
+        constructing an analyzer is cheap.
+
+        Args:
+            model_name (str): spaCy package name or path to a saved pipeline.
+            features (Optional[Iterable[str]]): Analysis features to compute
+                (defaults to all of FEATURE_COMPONENTS). Pipeline components that
+                no enabled feature needs are disabled.
+            batch_size (int): Documents per batch in batch_analyze.
+            n_process (int): Worker processes used by batch_analyze.
+            analysis_mode (str): "spacy" for a full parse, or "fast" to compute
+                counts with a regex tokenizer without loading spaCy (key phrases
+                are not extracted).
+
+        Raises:
+            ValueError: If the analysis mode is unknown.
+        """
+        if analysis_mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode: {analysis_mode}")
+        self.analysis_mode = analysis_mode
+        self.model_name = model_name
+        self.features = (
+            tuple(features) if features is not None else tuple(FEATURE_COMPONENTS)
+        )
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self._disabled: Optional[List[str]] = None
         self.analysis_history: List[AnalysisResult] = []
+        self.analysis_store: ColumnarStore[PromptAnalysis] = ColumnarStore(
+            columns={
+                name: operator.attrgetter(name)
+                for name in (
+                    "token_count",
+                    "word_count",
+                    "sentence_count",
+                    "readability_score",
+                    "complexity_score",
+                    "redundancy_score",
+                )
+            }
+        )
+
+    @property
+    def nlp(self) -> "Language":
+        """The shared spaCy pipeline."""
+        return get_nlp(self.model_name)
+
+    @property
+    def disabled_components(self) -> List[str]:
+        """Pipeline components skipped for the enabled features."""
+        if self._disabled is None:
+            self._disabled = components_to_disable(self.nlp, self.features)
+        return self._disabled
 
     def analyze_prompt(self, prompt: str) -> AnalysisResult:
         """Analyze a prompt and return analysis results."""
@@ -79,11 +171,11 @@ class PromptAnalyzer:
             quality_analysis=self._analyze_quality(doc),
         )
 
-    def _calculate_clarity(self, doc: spacy.tokens.Doc) -> float:
+    def _calculate_clarity(self, doc: "Doc") -> float:
         """Calculate clarity score for the prompt."""
         return 0.0  # Placeholder implementation
 
-    def _calculate_complexity(self, doc: spacy.tokens.Doc) -> float:
+    def _calculate_complexity(self, doc: "Doc") -> float:
         """Calculate complexity score for the prompt."""
         return 0.0  # Placeholder implementation
 
@@ -91,15 +183,15 @@ class PromptAnalyzer:
         """Estimate cost based on token count."""
         return 0.0  # Placeholder implementation
 
-    def _analyze_structure(self, doc: spacy.tokens.Doc) -> Dict[str, Any]:
+    def _analyze_structure(self, doc: "Doc") -> Dict[str, Any]:
         """Analyze the structure of the prompt."""
         return {}  # Placeholder implementation
 
-    def _analyze_patterns(self, doc: spacy.tokens.Doc) -> Dict[str, Any]:
+    def _analyze_patterns(self, doc: "Doc") -> Dict[str, Any]:
         """Analyze patterns in the prompt."""
         return {}  # Placeholder implementation
 
-    def _analyze_quality(self, doc: spacy.tokens.Doc) -> Dict[str, Any]:
+    def _analyze_quality(self, doc: "Doc") -> Dict[str, Any]:
         """Analyze the quality of the prompt."""
         return {}  # Placeholder implementation
 
@@ -112,12 +204,80 @@ class PromptAnalyzer:
         Returns:
             PromptAnalysis: Analysis results containing various metrics and insights.
         """
-        doc = self.nlp(text)
+        if self.analysis_mode == FAST_MODE:
+            return self._analyze_fast(text)
+        return self._analyze_doc(self.nlp(text, disable=self.disabled_components))
+
+    def _analyze_doc(self, doc: "Doc") -> PromptAnalysis:
+        """Compute analysis metrics for a processed document.
+
+        Args:
+            doc (Doc): Document processed by the shared pipeline.
+
+        Returns:
+            PromptAnalysis: Analysis results.
+        """
+        sentence_count = len(list(doc.sents)) if doc.has_annotation("SENT_START") else 0
+
+        # Extract key phrases (noun chunks)
+        key_phrases = (
+            [chunk.text for chunk in doc.noun_chunks]
+            if doc.has_annotation("DEP")
+            else []
+        )
 
+        return self._build_analysis(
+            [token.text for token in doc],
+            [token.is_punct for token in doc],
+            sentence_count,
+            key_phrases,
+        )
+
+    def _analyze_fast(self, text: str) -> PromptAnalysis:
+        """Compute analysis metrics with a regex tokenizer instead of spaCy.
+
+        Tokens approximate spaCy's English tokenizer (punctuation and
+        contractions are split off) and sentences end at terminal punctuation
+        or blank lines. Key phrases need a parse, so they are left empty.
+
+        Args:
+            text (str): The prompt text to analyze.
+
+        Returns:
+            PromptAnalysis: Analysis results.
+        """
+        tokens = _FAST_TOKEN_PATTERN.findall(text)
+        sentence_count = sum(
+            1
+            for sentence in _FAST_SENTENCE_BOUNDARY.split(text)
+            if _WORD_CHAR.search(sentence)
+        )
+        return self._build_analysis(
+            tokens, [_is_punct(token) for token in tokens], sentence_count, []
+        )
+
+    def _build_analysis(
+        self,
+        tokens: List[str],
+        punct: List[bool],
+        sentence_count: int,
+        key_phrases: List[str],
+    ) -> PromptAnalysis:
+        """Build a PromptAnalysis from tokenized text and record it in the store.
+
+        Args:
+            tokens (List[str]): Token texts.
+            punct (List[bool]): Whether each token is punctuation.
+            sentence_count (int): Number of sentences.
+            key_phrases (List[str]): Extracted key phrases.
+
+        Returns:
+            PromptAnalysis: Analysis results.
+        """
         # Basic metrics
-        token_count = len(doc)
-        word_count = len([token for token in doc if not token.is_punct])
-        sentence_count = len(list(doc.sents))
+        token_count = len(tokens)
+        words = [token for token, is_punct in zip(tokens, punct) if not is_punct]
+        word_count = len(words)
 
         # Calculate readability score (simplified Flesch-Kincaid)
         if sentence_count > 0:
@@ -127,19 +287,14 @@ class PromptAnalyzer:
             readability_score = 0.0
 
         # Calculate complexity score
-        complex_words = len([token for token in doc if len(token.text) > 6])
+        complex_words = len([token for token in tokens if len(token) > 6])
         complexity_score = complex_words / word_count if word_count > 0 else 0.0
 
         # Calculate redundancy score (simplified)
-        unique_words = len(
-            set(token.text.lower() for token in doc if not token.is_punct)
-        )
+        unique_words = len(set(word.lower() for word in words))
         redundancy_score = 1 - (unique_words / word_count) if word_count > 0 else 0.0
 
-        # Extract key phrases (noun chunks)
-        key_phrases = [chunk.text for chunk in doc.noun_chunks]
-
-        return PromptAnalysis(
+        analysis = PromptAnalysis(
             token_count=token_count,
             word_count=word_count,
             sentence_count=sentence_count,
@@ -149,57 +304,63 @@ class PromptAnalyzer:
             key_phrases=key_phrases,
             metadata={
                 "avg_word_length": (
-                    sum(len(token.text) for token in doc) / token_count
+                    sum(len(token) for token in tokens) / token_count
                     if token_count > 0
                     else 0
                 ),
                 "unique_word_ratio": unique_words / word_count if word_count > 0 else 0,
             },
         )
+        self.analysis_store.append(analysis)
+        return analysis
 
-    def batch_analyze(self, texts: List[str]) -> List[PromptAnalysis]:
-        """Analyze multiple prompts in batch.
+    def batch_analyze(
+        self,
+        texts: Iterable[str],
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None,
+    ) -> List[PromptAnalysis]:
+        """Analyze multiple prompts in batch with ``nlp.pipe``.
 
         Args:
-            texts (List[str]): List of prompt texts to analyze.
+            texts (Iterable[str]): Prompt texts to analyze.
+            batch_size (Optional[int]): Documents per batch (defaults to the
+                analyzer's batch_size).
+            n_process (Optional[int]): Worker processes (defaults to the
+                analyzer's n_process).
 
         Returns:
-            List[PromptAnalysis]: List of analysis results.
+            List[PromptAnalysis]: List of analysis results, in input order.
         """
-        return [self.analyze(text) for text in texts]
+        if self.analysis_mode == FAST_MODE:
+            return [self._analyze_fast(text) for text in texts]
+
+        docs = self.nlp.pipe(
+            texts,
+            batch_size=batch_size or self.batch_size,
+            n_process=n_process or self.n_process,
+            disable=self.disabled_components,
+        )
+        return [self._analyze_doc(doc) for doc in docs]
 
     def get_analysis_stats(self) -> Dict[str, Any]:
         """Get statistics about analysis results.
 
+        Statistics are vectorized over the columnar store of analyses produced
+        by analyze and batch_analyze: totals and averages cover every analysis,
+        percentiles the store's most recent rows.
+
         Returns:
             Dict[str, Any]: Analysis statistics.
         """
-        if not self.analysis_history:
+        store = self.analysis_store
+        if not store.total:
             return {}
 
-        total_analyses = len(self.analysis_history)
-
-        # Calculate average scores
-        avg_scores: Dict[str, float] = {
-            "clarity": sum(r.metrics.clarity_score for r in self.analysis_history)
-            / total_analyses,
-            "completeness": sum(
-                r.metrics.completeness_score for r in self.analysis_history
-            )
-            / total_analyses,
-            "consistency": sum(
-                r.metrics.consistency_score for r in self.analysis_history
-            )
-            / total_analyses,
-            "efficiency": sum(r.metrics.efficiency_score for r in self.analysis_history)
-            / total_analyses,
-            "complexity": sum(r.metrics.complexity_score for r in self.analysis_history)
-            / total_analyses,
-        }
-
         return {
-            "total_analyses": total_analyses,
-            "average_scores": avg_scores,
+            "total_analyses": store.total,
+            "average_scores": store.means(),
+            "percentiles": {name: store.percentiles(name) for name in store.columns},
             "suggestion_frequency": self._calculate_suggestion_frequency(),
         }
 
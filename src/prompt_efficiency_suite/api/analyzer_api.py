@@ -66,8 +66,7 @@ async def analyze_prompts_batch(request: BatchAnalyzeRequest) -> BatchAnalyzeRes
         total_complexity = 0
         total_clarity = 0
 
-        for prompt in request.prompts:
-            result = analyzer.analyze(prompt)
+        for result in analyzer.batch_analyze(request.prompts):
             results.append(result)
             total_tokens += result.metrics.token_count
             total_complexity += result.metrics.complexity_score
@@ -1,9 +1,49 @@
+import asyncio
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ThreadPoolExecutor
 from typing import Dict, List, Optional, Union
 
-import tiktoken
 from pydantic import BaseModel
 
+from .token_counter import Encoding, get_token_engine
+
+DEFAULT_BATCH_CHUNK_SIZE = 32
+DEFAULT_MAX_CONCURRENCY = 4
+
+_shared_executor: Optional[ThreadPoolExecutor] = None
+_shared_executor_lock = threading.Lock()
+
+
+def get_shared_executor() -> ThreadPoolExecutor:
+    """Get the process-wide executor for CPU-bound compression work.
+
+    The executor is created on first use and shared by every compressor that
+    is not given its own, so concurrent batches cannot multiply thread counts.
+
+    Returns:
+        ThreadPoolExecutor: The shared executor.
+    """
+    global _shared_executor
+    if _shared_executor is None:
+        with _shared_executor_lock:
+            if _shared_executor is None:
+                _shared_executor = ThreadPoolExecutor(thread_name_prefix="compressor")
+    return _shared_executor
+
+
+def shutdown_shared_executor(wait: bool = True) -> None:
+    """Shut down the shared executor; the next use creates a fresh one.
+
+    Args:
+        wait: Whether to wait for running work to finish.
+    """
+    global _shared_executor
+    with _shared_executor_lock:
+        executor, _shared_executor = _shared_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
 
 class CompressionResult(BaseModel):
     """Model for storing compression results."""
@@ -21,11 +61,12 @@ class BaseCompressor(ABC):
     def __init__(self, model_name: str = "gpt-3.5-turbo"):
         """Initialize the compressor with a specific model."""
         self.model_name = model_name
-        self.encoding: tiktoken.Encoding = tiktoken.encoding_for_model(model_name)
+        self.token_engine = get_token_engine()
+        self.encoding: Encoding = self.token_engine.get_encoding(model_name)
 
     def count_tokens(self, text: str) -> int:
         """Count the number of tokens in a text."""
-        return len(self.encoding.encode(text))
+        return self.token_engine.count(text, self.model_name)
 
     def calculate_compression_ratio(
         self, original_tokens: int, compressed_tokens: int
@@ -64,3 +105,121 @@ class BaseCompressor(ABC):
             List of CompressionResult objects
         """
         pass
+
+
+class ExecutorCompressor(BaseCompressor):
+    """Base class for compressors whose work is synchronous and CPU-bound.
+
+    Subclasses implement ``compress_sync``; the async methods run it on an
+    executor so the event loop is never blocked. Batches are split into chunks,
+    each chunk is one executor job, and at most ``max_concurrency`` chunks are
+    in flight at a time.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "gpt-3.5-turbo",
+        executor: Optional[Executor] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE,
+    ):
+        """Initialize the compressor.
+
+        Args:
+            model_name: Model whose tokenizer measures compression
+            executor: Executor for compression work (defaults to the shared one)
+            max_concurrency: Maximum number of chunks in flight per batch
+            chunk_size: Number of texts compressed per executor job
+        """
+        if max_concurrency < 1 or chunk_size < 1:
+            raise ValueError("max_concurrency and chunk_size must be at least 1")
+        super().__init__(model_name)
+        self._executor = executor
+        self.max_concurrency = max_concurrency
+        self.chunk_size = chunk_size
+
+    @property
+    def executor(self) -> Executor:
+        """Executor that runs compression work."""
+        return self._executor or get_shared_executor()
+
+    @abstractmethod
+    def compress_sync(
+        self, text: str, target_ratio: Optional[float] = None
+    ) -> CompressionResult:
+        """Compress the input text on the calling thread.
+
+        Args:
+            text: The text to compress
+            target_ratio: Optional target compression ratio (0.0 to 1.0)
+
+        Returns:
+            CompressionResult containing compression metrics and results
+        """
+
+    async def compress(
+        self, text: str, target_ratio: Optional[float] = None
+    ) -> CompressionResult:
+        """Compress the input text on the executor.
+
+        Args:
+            text: The text to compress
+            target_ratio: Optional target compression ratio (0.0 to 1.0)
+
+        Returns:
+            CompressionResult containing compression metrics and results
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, self.compress_sync, text, target_ratio
+        )
+
+    async def batch_compress(
+        self, texts: List[str], target_ratio: Optional[float] = None
+    ) -> List[CompressionResult]:
+        """Compress multiple texts on the executor, in chunks.
+
+        If the batch is cancelled or a chunk fails, chunks that have not
+        started are cancelled and running chunks stop after their current text.
+
+        Args:
+            texts: List of texts to compress
+            target_ratio: Optional target compression ratio (0.0 to 1.0)
+
+        Returns:
+            List of CompressionResult objects, in input order
+        """
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        stop = threading.Event()
+
+        async def run_chunk(chunk: List[str]) -> List[CompressionResult]:
+            async with semaphore:
+                return await loop.run_in_executor(
+                    executor, self._compress_chunk, chunk, target_ratio, stop
+                )
+
+        tasks = [
+            asyncio.ensure_future(run_chunk(texts[i : i + self.chunk_size]))
+            for i in range(0, len(texts), self.chunk_size)
+        ]
+        try:
+            chunks = await asyncio.gather(*tasks)
+        except BaseException:
+            stop.set()
+            for task in tasks:
+                task.cancel()
+            raise
+        return [result for chunk in chunks for result in chunk]
+
+    def _compress_chunk(
+        self, texts: List[str], target_ratio: Optional[float], stop: threading.Event
+    ) -> List[CompressionResult]:
+        """Compress one chunk of a batch, stopping early once ``stop`` is set."""
+        results = []
+        for text in texts:
+            if stop.is_set():
+                break
+            results.append(self.compress_sync(text, target_ratio))
+        return results
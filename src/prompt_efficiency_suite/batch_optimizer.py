@@ -4,13 +4,26 @@ Batch Optimizer module for optimizing multiple prompts in parallel.
 
 import asyncio
 import json
+import logging
+from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .checkpoint import (
+    STATUS_FAILED,
+    STATUS_OK,
+    CheckpointJournal,
+    ProgressCallback,
+    ProgressTracker,
+    prompt_id,
+)
 from .models import CompressionResult, EfficiencyMetrics, PromptAnalysis
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class OptimizationResult:
@@ -65,30 +78,80 @@ class BatchOptimizer:
         }
 
     async def optimize_batch_async(
-        self, prompts: List[str], optimization_params: Optional[Dict[str, Any]] = None
+        self,
+        prompts: List[str],
+        optimization_params: Optional[Dict[str, Any]] = None,
+        journal: Optional[CheckpointJournal] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[OptimizationResult]:
         """Optimize a batch of prompts in parallel.
 
+        A prompt that fails is logged (and recorded in the journal) without
+        affecting the others. With a journal, each result is appended as soon
+        as it completes, and prompts already recorded as finished are read back
+        from it instead of being optimized again.
+
         Args:
             prompts (List[str]): List of prompts to optimize.
             optimization_params (Optional[Dict[str, Any]]): Optimization parameters.
+            journal (Optional[CheckpointJournal]): Checkpoint journal to record
+                results in and resume from.
+            progress (Optional[ProgressCallback]): Callback receiving progress
+                reports.
 
         Returns:
-            List[OptimizationResult]: List of optimization results.
+            List[OptimizationResult]: Results of the prompts that did not fail,
+            in input order.
         """
-        loop = asyncio.get_event_loop()
-        tasks = []
+        loop = asyncio.get_running_loop()
+        params = optimization_params or {}
+        tracker = ProgressTracker(progress, total=len(prompts))
+        results: List[Optional[OptimizationResult]] = [None] * len(prompts)
+        restored: Dict[str, List[int]] = defaultdict(list)
+
+        async def run(
+            index: int, prompt: str, record_result: Optional[Callable[..., None]]
+        ) -> None:
+            try:
+                result = await loop.run_in_executor(
+                    self.executor, self._optimize_single, prompt, params
+                )
+            except Exception as e:
+                logger.warning(f"Error optimizing prompt {index}: {e}")
+                if record_result is not None:
+                    await loop.run_in_executor(
+                        None, partial(record_result, STATUS_FAILED, error=str(e))
+                    )
+                tracker.advance(failed=True)
+                return
+            results[index] = result
+            if record_result is not None:
+                await loop.run_in_executor(None, record_result, STATUS_OK, result)
+            tracker.advance()
 
-        for prompt in prompts:
-            task = loop.run_in_executor(
-                self.executor, self._optimize_single, prompt, optimization_params or {}
-            )
-            tasks.append(task)
-
-        results = await asyncio.gather(*tasks)
-        self.optimization_history.extend(results)
-
-        return results
+        tasks = []
+        for index, prompt in enumerate(prompts):
+            record_result = None
+            if journal is not None:
+                key = prompt_id(prompt)
+                if journal.is_finished(key):
+                    restored[key].append(index)
+                    tracker.skip()
+                    continue
+                record_result = partial(journal.record, key)
+            tasks.append(run(index, prompt, record_result))
+
+        await asyncio.gather(*tasks)
+        tracker.finish()
+
+        if journal is not None and restored:
+            for key, record in journal.iter_results():
+                for index in restored.pop(key, ()):
+                    results[index] = OptimizationResult(**record)
+
+        completed = [result for result in results if result is not None]
+        self.optimization_history.extend(completed)
+        return completed
 
     def export_results(self, output_path: Path) -> None:
         """Export optimization results to a file.
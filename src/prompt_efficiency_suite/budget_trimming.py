@@ -0,0 +1,210 @@
+"""Budget Trimming - Select the most valuable spans of a text under a token budget."""
+
+import logging
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Mapping, Optional, Pattern, Sequence, Tuple
+
+from .term_matcher import TermMatch
+from .token_counter import DEFAULT_MODEL, TokenCountingEngine, get_token_engine
+
+logger = logging.getLogger(__name__)
+
+# Sentences (up to terminal punctuation) or lines. Whitespace leads a span, as
+# it does a BPE pre-token, so each span encodes the same alone as in context.
+SPAN_PATTERN: Pattern[str] = re.compile(r"\s*[^.!?\n]*[.!?]*")
+
+# Largest spans x budget table solved exactly; larger inputs use greedy selection.
+MAX_KNAPSACK_CELLS = 2_000_000
+
+# Value of a span with no domain terms, so leftover budget keeps context.
+BASE_SPAN_VALUE = 0.01
+
+# Tokens held back, on top of the boundary shift already measured, when spans
+# are dropped to bring an over-budget selection back under the budget.
+BOUNDARY_MARGIN = 2
+
+Span = Tuple[int, int]
+
+
+@dataclass
+class BudgetSelection:
+    """Spans of a text selected to fit a token budget."""
+
+    text: str
+    token_count: int
+    original_tokens: int
+    spans: List[Span] = field(default_factory=list)
+    dropped_spans: List[Span] = field(default_factory=list)
+
+
+def split_spans(text: str, pattern: Pattern[str] = SPAN_PATTERN) -> List[Span]:
+    """Split text into contiguous, non-empty spans covering all of it.
+
+    Args:
+        text: Text to split.
+        pattern: Pattern matching one span.
+
+    Returns:
+        List[Span]: ``(start, end)`` offsets in text order.
+    """
+    return [m.span() for m in pattern.finditer(text) if m.end() > m.start()]
+
+
+def score_spans(
+    spans: Sequence[Span],
+    matches: Iterable[TermMatch],
+    weights: Mapping[str, float],
+    base_value: float = BASE_SPAN_VALUE,
+) -> List[float]:
+    """Sum the weights of the terms found in each span.
+
+    Matches come from a single search over the whole text and are assigned to
+    the span containing their start offset.
+
+    Args:
+        spans: Spans in text order.
+        matches: Term matches in the text.
+        weights: Weight of each term (terms missing from it count as 1.0).
+        base_value: Value given to every span.
+
+    Returns:
+        List[float]: Value of each span.
+    """
+    starts = [start for start, _ in spans]
+    values = [base_value] * len(spans)
+    for match in matches:
+        index = bisect_right(starts, match.start) - 1
+        if index >= 0:
+            values[index] += weights.get(match.term, 1.0)
+    return values
+
+
+def select_spans(
+    values: Sequence[float], costs: Sequence[int], budget: int
+) -> List[int]:
+    """Choose items maximizing total value with total cost within budget.
+
+    Solved exactly as a 0/1 knapsack when the table is small enough, and by
+    value density otherwise.
+
+    Args:
+        values: Value of each item.
+        costs: Cost of each item.
+        budget: Maximum total cost.
+
+    Returns:
+        List[int]: Indices of the chosen items, ascending.
+    """
+    if budget <= 0:
+        return [i for i, cost in enumerate(costs) if cost <= 0]
+    if len(values) * (budget + 1) > MAX_KNAPSACK_CELLS:
+        return _select_greedy(values, costs, budget)
+
+    best = [0.0] * (budget + 1)
+    taken: List[bytearray] = []
+    for value, cost in zip(values, costs):
+        row = bytearray(budget + 1)
+        if cost <= budget and value > 0:
+            for remaining in range(budget, cost - 1, -1):
+                candidate = best[remaining - cost] + value
+                if candidate > best[remaining]:
+                    best[remaining] = candidate
+                    row[remaining] = 1
+        taken.append(row)
+
+    chosen = []
+    remaining = budget
+    for index in range(len(values) - 1, -1, -1):
+        if taken[index][remaining]:
+            chosen.append(index)
+            remaining -= costs[index]
+    return chosen[::-1]
+
+
+def _select_greedy(
+    values: Sequence[float], costs: Sequence[int], budget: int
+) -> List[int]:
+    """Take items by value per token while they fit."""
+    order = sorted(
+        range(len(values)),
+        key=lambda i: values[i] / costs[i] if costs[i] else float("inf"),
+        reverse=True,
+    )
+    chosen = []
+    for index in order:
+        if costs[index] <= budget:
+            chosen.append(index)
+            budget -= costs[index]
+    return sorted(chosen)
+
+
+def fit_to_budget(
+    text: str,
+    max_tokens: int,
+    score: Callable[[Sequence[Span]], List[float]],
+    model: str = DEFAULT_MODEL,
+    engine: Optional[TokenCountingEngine] = None,
+) -> BudgetSelection:
+    """Keep the highest-value spans of a text within a token budget.
+
+    Every span is encoded once, in one batch; selection then works on those
+    counts. The joined result is counted once more to confirm the budget, since
+    token boundaries can shift where dropped spans meet. If it is over, the least
+    valuable spans are dropped by their cached costs until the span total leaves
+    room for the measured shift plus ``BOUNDARY_MARGIN``, and the result is
+    counted once more. A further pass only runs if that estimate fell short.
+
+    Args:
+        text: Text to trim.
+        max_tokens: Token budget for the result.
+        score: Returns the value of each of the text's spans.
+        model: Model whose tokenizer defines the budget.
+        engine: Token counting engine (defaults to the shared one).
+
+    Returns:
+        BudgetSelection: The trimmed text and the kept and dropped spans.
+    """
+    engine = engine or get_token_engine()
+    original_tokens = engine.count(text, model)
+    if original_tokens <= max_tokens:
+        return BudgetSelection(text, original_tokens, original_tokens, [(0, len(text))])
+
+    spans = split_spans(text)
+    costs = engine.count_batch([text[start:end] for start, end in spans], model)
+    values = score(spans)
+    chosen = select_spans(values, costs, max_tokens)
+    by_value = sorted(chosen, key=lambda i: values[i] / max(costs[i], 1))
+
+    kept = bytearray(len(spans))
+    for index in chosen:
+        kept[index] = 1
+    kept_cost = sum(costs[i] for i in chosen)
+    trimmed = _join_kept(text, spans, kept)
+    token_count = engine.count(trimmed, model)
+
+    dropped = 0
+    while token_count > max_tokens and dropped < len(by_value):
+        target = max_tokens - (token_count - kept_cost) - BOUNDARY_MARGIN
+        logger.debug(f"Selection is {token_count} tokens; dropping spans to {target}")
+        while kept_cost > target and dropped < len(by_value):
+            index = by_value[dropped]
+            dropped += 1
+            kept[index] = 0
+            kept_cost -= costs[index]
+        trimmed = _join_kept(text, spans, kept)
+        token_count = engine.count(trimmed, model)
+
+    return BudgetSelection(
+        text=trimmed,
+        token_count=token_count,
+        original_tokens=original_tokens,
+        spans=[span for i, span in enumerate(spans) if kept[i]],
+        dropped_spans=[span for i, span in enumerate(spans) if not kept[i]],
+    )
+
+
+def _join_kept(text: str, spans: Sequence[Span], kept: bytearray) -> str:
+    """Join the kept spans of a text in order."""
+    return "".join(text[start:end] for (start, end), k in zip(spans, kept) if k).strip()
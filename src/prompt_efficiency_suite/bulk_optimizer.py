@@ -1,11 +1,84 @@
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, List, Optional, Union
+import logging
+import multiprocessing
+import time
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from multiprocessing.context import BaseContext
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Sized,
+    Tuple,
+    Union,
+)
 
 from .analyzer import PromptAnalysis, PromptAnalyzer
 from .base_compressor import BaseCompressor, CompressionResult
+from .checkpoint import (
+    STATUS_FAILED,
+    STATUS_OK,
+    STATUS_REJECTED,
+    CheckpointJournal,
+    ProgressCallback,
+    ProgressTracker,
+    prompt_id,
+)
 from .metrics import EfficiencyMetrics, MetricsTracker
 
+logger = logging.getLogger(__name__)
+
+BulkResult = Dict[str, Union[CompressionResult, PromptAnalysis, EfficiencyMetrics]]
+
+# Analyzer settings mapped to the analyzer each worker process builds for them.
+_worker_analyzers: Dict[Tuple[str, Tuple[str, ...], str], PromptAnalyzer] = {}
+
+
+def _analyze_in_worker(
+    settings: Tuple[str, Tuple[str, ...], str], text: str
+) -> PromptAnalysis:
+    """Analyze text in a worker process with an analyzer built from settings.
+
+    Analyzers hold locks and stores that cannot be pickled, so process workers
+    rebuild one per settings tuple and keep it for the life of the process.
+    """
+    analyzer = _worker_analyzers.get(settings)
+    if analyzer is None:
+        model_name, features, analysis_mode = settings
+        analyzer = PromptAnalyzer(
+            model_name, features=features, analysis_mode=analysis_mode
+        )
+        _worker_analyzers[settings] = analyzer
+    return analyzer.analyze(text)
+
+
+def default_quality_score(analysis: PromptAnalysis) -> float:
+    """Score a prompt's quality from its analysis as one minus its redundancy.
+
+    Args:
+        analysis: Analysis of the compressed prompt
+
+    Returns:
+        Quality score between 0 and 1
+    """
+    return min(1.0, max(0.0, 1.0 - analysis.redundancy_score))
+
+
+def _result_from_record(record: Dict[str, Dict[str, Any]]) -> BulkResult:
+    """Rebuild a bulk result from its journal record."""
+    return {
+        "compression": CompressionResult.model_validate(record["compression"]),
+        "analysis": PromptAnalysis.model_validate(record["analysis"]),
+        "metrics": EfficiencyMetrics.model_validate(record["metrics"]),
+    }
+
 
 class BulkOptimizer:
     """Optimizes multiple prompts in bulk with parallel processing."""
@@ -16,6 +89,10 @@ class BulkOptimizer:
         analyzer: PromptAnalyzer,
         metrics_tracker: MetricsTracker,
         max_workers: int = 4,
+        use_processes: bool = False,
+        max_in_flight: Optional[int] = None,
+        quality_scorer: Optional[Callable[[PromptAnalysis], float]] = None,
+        mp_context: Optional[BaseContext] = None,
     ):
         """Initialize the bulk optimizer.
 
@@ -24,43 +101,166 @@ class BulkOptimizer:
             analyzer: The analyzer to use for quality assessment
             metrics_tracker: The metrics tracker to use
             max_workers: Maximum number of parallel workers
+            use_processes: Run analysis in worker processes instead of threads,
+                so CPU-bound parsing uses every core. Workers build their own
+                analyzer from this one's settings.
+            max_in_flight: Maximum number of prompts being optimized at once
+                (defaults to twice max_workers)
+            quality_scorer: Function scoring an analysis between 0 and 1
+                (defaults to default_quality_score)
+            mp_context: Multiprocessing context for worker processes. Defaults
+                to "spawn": the parent already runs threads, so forking it can
+                deadlock, and workers rebuild their analyzer anyway.
         """
         self.compressor = compressor
         self.analyzer = analyzer
         self.metrics_tracker = metrics_tracker
         self.max_workers = max_workers
-        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max_workers)
+        self.use_processes = use_processes
+        self.max_in_flight = max_in_flight or 2 * max_workers
+        self.quality_scorer = quality_scorer or default_quality_score
+        self.executor: Executor = (
+            ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=mp_context or multiprocessing.get_context("spawn"),
+            )
+            if use_processes
+            else ThreadPoolExecutor(max_workers=max_workers)
+        )
 
     async def optimize_batch(
         self,
         prompts: List[str],
         target_ratio: Optional[float] = None,
         min_quality_score: float = 0.7,
-    ) -> List[Dict[str, Union[CompressionResult, PromptAnalysis]]]:
+        journal: Optional[CheckpointJournal] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> List[BulkResult]:
         """Optimize a batch of prompts.
 
         Args:
             prompts: List of prompts to optimize
             target_ratio: Optional target compression ratio
             min_quality_score: Minimum quality score to accept
+            journal: Checkpoint journal; prompts it records as finished are not
+                optimized again and their results are read back from it
+            progress: Callback receiving progress reports
 
         Returns:
-            List of dictionaries containing compression and analysis results
+            List of dictionaries containing compression and analysis results,
+            in input order, for the prompts that met the quality threshold
         """
-        # Process prompts in parallel
-        tasks: List[asyncio.Task] = []
-        for prompt in prompts:
-            task = asyncio.create_task(
-                self._optimize_single(prompt, target_ratio, min_quality_score)
-            )
-            tasks.append(task)
+        results: List[Optional[BulkResult]] = [None] * len(prompts)
+        yielded: Set[int] = set()
+        async for index, result in self.iter_optimized(
+            prompts, target_ratio, min_quality_score, journal, progress
+        ):
+            results[index] = result
+            yielded.add(index)
 
-        results = await asyncio.gather(*tasks)
+        if journal is not None:
+            # Prompts that were skipped, including repeats of a prompt that
+            # finished earlier in this batch, are read back from the journal.
+            restored: Dict[str, List[int]] = defaultdict(list)
+            for index, prompt in enumerate(prompts):
+                if index not in yielded:
+                    restored[prompt_id(prompt)].append(index)
+            if restored:
+                for key, record in journal.iter_results():
+                    for index in restored.pop(key, ()):
+                        results[index] = _result_from_record(record)
         return [r for r in results if r is not None]
 
+    async def iter_optimized(
+        self,
+        prompts: Iterable[str],
+        target_ratio: Optional[float] = None,
+        min_quality_score: float = 0.7,
+        journal: Optional[CheckpointJournal] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> AsyncIterator[Tuple[int, Optional[BulkResult]]]:
+        """Optimize prompts, yielding each result as soon as it completes.
+
+        At most ``max_in_flight`` prompts are in progress at a time; the next
+        prompt is only taken from ``prompts`` when one finishes, so the input
+        can be a lazy iterable of any length. Closing or cancelling the
+        iterator cancels the prompts still in flight.
+
+        With a journal, every outcome is appended to it as soon as the prompt
+        finishes, and prompts it already records as finished are skipped
+        without being yielded. A failure is logged and recorded for that
+        prompt only; the rest of the batch carries on.
+
+        Args:
+            prompts: Prompts to optimize
+            target_ratio: Optional target compression ratio
+            min_quality_score: Minimum quality score to accept
+            journal: Checkpoint journal to record outcomes in and resume from
+            progress: Callback receiving progress reports
+
+        Yields:
+            Tuples of (input index, result or None if rejected or failed)
+        """
+        tracker = ProgressTracker(
+            progress, total=len(prompts) if isinstance(prompts, Sized) else None
+        )
+        pending: Set["asyncio.Task[Tuple[int, Optional[BulkResult]]]"] = set()
+        source = enumerate(prompts)
+        loop = asyncio.get_running_loop()
+
+        async def run(index: int, prompt: str) -> Tuple[int, Optional[BulkResult]]:
+            try:
+                result = await self._optimize_single(
+                    prompt, target_ratio, min_quality_score
+                )
+            except Exception as e:
+                logger.warning(f"Error optimizing prompt {index}: {e}")
+                if journal is not None:
+                    # Journal writes (and their periodic fsync) block, so they
+                    # run on the loop's default executor.
+                    record = partial(journal.record, error=str(e))
+                    await loop.run_in_executor(
+                        None, record, prompt_id(prompt), STATUS_FAILED
+                    )
+                tracker.advance(failed=True)
+                return index, None
+
+            if journal is not None:
+                status = STATUS_REJECTED if result is None else STATUS_OK
+                await loop.run_in_executor(
+                    None, journal.record, prompt_id(prompt), status, result
+                )
+            tracker.advance()
+            return index, result
+
+        def fill() -> None:
+            while len(pending) < self.max_in_flight:
+                item = next(source, None)
+                if item is None:
+                    return
+                if journal is not None and journal.is_finished(prompt_id(item[1])):
+                    tracker.skip()
+                    continue
+                pending.add(asyncio.ensure_future(run(*item)))
+
+        try:
+            fill()
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                pending.difference_update(done)
+                fill()
+                for task in done:
+                    yield task.result()
+            tracker.finish()
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def _optimize_single(
         self, prompt: str, target_ratio: Optional[float], min_quality_score: float
-    ) -> Optional[Dict[str, Union[CompressionResult, PromptAnalysis]]]:
+    ) -> Optional[BulkResult]:
         """Optimize a single prompt.
 
         Args:
@@ -69,41 +269,67 @@ class BulkOptimizer:
             min_quality_score: Minimum quality score to accept
 
         Returns:
-            Dictionary containing compression and analysis results, or None if optimization failed
+            Dictionary containing compression and analysis results, or None if
+            the quality threshold was not met
         """
-        try:
-            # Compress the prompt
-            compression_result = await self.compressor.compress(prompt, target_ratio)
-
-            # Analyze the compressed result
-            analysis = self.analyzer.analyze(compression_result.compressed_text)
-
-            # Track metrics
-            metrics = EfficiencyMetrics(
-                prompt_id=hash(prompt),
-                token_count=compression_result.compressed_tokens,
-                cost=compression_result.compressed_tokens
-                * 0.0001,  # Example cost calculation
-                latency=0.0,  # Would be measured in real implementation
-                success_rate=(
-                    1.0 if analysis.quality_score >= min_quality_score else 0.0
-                ),
-                quality_score=analysis.quality_score,
+        started = time.perf_counter()
+
+        # Compress the prompt
+        compression_result = await self.compressor.compress(prompt, target_ratio)
+
+        # Analyze the compressed result off the event loop
+        analysis = await self._analyze(compression_result.compressed_text)
+        quality_score = self.quality_scorer(analysis)
+
+        # Track metrics
+        metrics = EfficiencyMetrics(
+            prompt_id=prompt_id(prompt),
+            token_count=compression_result.compressed_tokens,
+            cost=compression_result.compressed_tokens
+            * 0.0001,  # Example cost calculation
+            latency=time.perf_counter() - started,
+            success_rate=(1.0 if quality_score >= min_quality_score else 0.0),
+            quality_score=quality_score,
+        )
+        self.metrics_tracker.add_metrics(metrics)
+
+        # Return results if quality threshold is met
+        if quality_score >= min_quality_score:
+            return {
+                "compression": compression_result,
+                "analysis": analysis,
+                "metrics": metrics,
+            }
+        return None
+
+    async def _analyze(self, text: str) -> PromptAnalysis:
+        """Analyze text on the executor.
+
+        Args:
+            text: The text to analyze
+
+        Returns:
+            The analysis of the text
+        """
+        loop = asyncio.get_running_loop()
+        if self.use_processes:
+            settings = (
+                self.analyzer.model_name,
+                self.analyzer.features,
+                self.analyzer.analysis_mode,
             )
-            self.metrics_tracker.add_metrics(metrics)
-
-            # Return results if quality threshold is met
-            if analysis.quality_score >= min_quality_score:
-                return {
-                    "compression": compression_result,
-                    "analysis": analysis,
-                    "metrics": metrics,
-                }
-            return None
-
-        except Exception as e:
-            print(f"Error optimizing prompt: {str(e)}")
-            return None
+            return await loop.run_in_executor(
+                self.executor, _analyze_in_worker, settings, text
+            )
+        return await loop.run_in_executor(self.executor, self.analyzer.analyze, text)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the worker pool.
+
+        Args:
+            wait: Whether to wait for running work to finish
+        """
+        self.executor.shutdown(wait=wait)
 
     def get_optimization_stats(self) -> Dict[str, Union[float, int]]:
         """Get statistics about the optimization process.
@@ -0,0 +1,284 @@
+"""Checkpoint - Resumable result journals and progress reporting for long batch runs."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, Optional, Set, Tuple, Union
+
+from .history import to_record
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_EVERY = 100
+DEFAULT_PROGRESS_INTERVAL = 1.0
+
+STATUS_OK = "ok"
+STATUS_REJECTED = "rejected"
+STATUS_FAILED = "failed"
+
+
+def prompt_id(prompt: str) -> str:
+    """Get a stable identifier for a prompt's content.
+
+    Args:
+        prompt: The prompt text
+
+    Returns:
+        Hex digest of the prompt
+    """
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class CheckpointJournal:
+    """Append-only JSONL journal of finished batch items, keyed by prompt hash.
+
+    Every finished item is appended as one line and flushed immediately, with an
+    fsync every ``sync_every`` records. Opening an existing journal replays it,
+    so a restarted run skips items that already finished ("ok" or "rejected")
+    and retries items whose last record is a failure. A truncated last line left
+    by a crash mid-write is ignored.
+    """
+
+    def __init__(
+        self, path: Union[str, Path], sync_every: int = DEFAULT_SYNC_EVERY
+    ) -> None:
+        """Open a journal, replaying any records already in it.
+
+        Args:
+            path: JSONL file to append to.
+            sync_every: Number of records between fsyncs.
+        """
+        self.path = Path(path)
+        self.sync_every = sync_every
+        self.finished: Set[str] = set()
+        self.failures: Dict[str, str] = {}
+        self._file: Optional[IO[str]] = None
+        self._unsynced = 0
+        self._lock = threading.Lock()
+        for record in self._iter_records():
+            self._apply(record["key"], record["status"], record.get("error"))
+
+    def __enter__(self) -> "CheckpointJournal":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def is_finished(self, key: str) -> bool:
+        """Check whether an item finished in this or an earlier run.
+
+        Args:
+            key: Item key (see prompt_id).
+
+        Returns:
+            True if the item should be skipped.
+        """
+        return key in self.finished
+
+    def record(
+        self,
+        key: str,
+        status: str,
+        result: Any = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Append an item's outcome to the journal.
+
+        Args:
+            key: Item key (see prompt_id).
+            status: STATUS_OK, STATUS_REJECTED or STATUS_FAILED.
+            result: JSON-serializable result. Dataclasses and pydantic models,
+                alone or as the values of a dict, are converted.
+            error: Error message for failed items.
+        """
+        if isinstance(result, dict):
+            result = {name: to_record(value) for name, value in result.items()}
+        line = json.dumps(
+            {
+                "key": key,
+                "status": status,
+                "result": to_record(result),
+                "error": error,
+            },
+            default=str,
+        )
+        with self._lock:
+            if self._file is None:
+                self._file = self._open()
+            self._file.write(line + "\n")
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= self.sync_every:
+                self._sync()
+            self._apply(key, status, error)
+
+    def iter_results(self) -> Iterator[Tuple[str, Any]]:
+        """Iterate over the results of successful items, streaming from disk.
+
+        Yields:
+            Tuples of (key, result record).
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+        for record in self._iter_records():
+            if record["status"] == STATUS_OK:
+                yield record["key"], record.get("result")
+
+    def close(self) -> None:
+        """Sync and close the journal file, if one is open."""
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def _apply(self, key: str, status: str, error: Optional[str]) -> None:
+        """Update the in-memory index with one record."""
+        if status == STATUS_FAILED:
+            self.failures[key] = error or ""
+        else:
+            self.finished.add(key)
+            self.failures.pop(key, None)
+
+    def _open(self) -> IO[str]:
+        """Open the journal for appending, terminating a truncated last line."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        truncated = False
+        if self.path.exists() and self.path.stat().st_size:
+            with open(self.path, "rb") as tail:
+                tail.seek(-1, os.SEEK_END)
+                truncated = tail.read(1) != b"\n"
+        journal = open(self.path, "a", encoding="utf-8")
+        if truncated:
+            journal.write("\n")
+        return journal
+
+    def _sync(self) -> None:
+        """Flush and fsync the journal file."""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def _iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over valid records in the journal file."""
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if not (
+                    isinstance(record, dict) and "key" in record and "status" in record
+                ):
+                    logger.warning(
+                        f"Skipping invalid journal record on line {line_number}"
+                    )
+                    continue
+                yield record
+
+
+@dataclass
+class ProgressReport:
+    """Snapshot of a batch run's progress."""
+
+    completed: int  # items finished in this run, including failures
+    failed: int
+    skipped: int  # items already finished in an earlier run
+    total: Optional[int]
+    elapsed: float  # seconds since the run started
+    throughput: float  # items completed per second in this run
+    eta: Optional[float]  # estimated seconds remaining, if the total is known
+
+
+ProgressCallback = Callable[[ProgressReport], None]
+
+
+class ProgressTracker:
+    """Counts batch items and reports progress at most once per interval."""
+
+    def __init__(
+        self,
+        callback: Optional[ProgressCallback] = None,
+        total: Optional[int] = None,
+        interval: float = DEFAULT_PROGRESS_INTERVAL,
+    ) -> None:
+        """Initialize the tracker.
+
+        Args:
+            callback: Function receiving progress reports.
+            total: Total number of items, if known.
+            interval: Minimum number of seconds between reports.
+        """
+        self.callback = callback
+        self.total = total
+        self.interval = interval
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self._started = time.monotonic()
+        self._last_report = self._started
+
+    def skip(self) -> None:
+        """Count an item finished in an earlier run."""
+        self.skipped += 1
+
+    def advance(self, failed: bool = False) -> None:
+        """Count a completed item and report if the interval has passed.
+
+        Args:
+            failed: Whether the item failed.
+        """
+        self.completed += 1
+        self.failed += failed
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self._emit()
+
+    def finish(self) -> None:
+        """Send a final report."""
+        self._emit()
+
+    def report(self) -> ProgressReport:
+        """Build a progress report for the current counts.
+
+        Returns:
+            ProgressReport: The current progress.
+        """
+        elapsed = time.monotonic() - self._started
+        throughput = self.completed / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if self.total is not None and throughput > 0:
+            remaining = max(0, self.total - self.skipped - self.completed)
+            eta = remaining / throughput
+        return ProgressReport(
+            completed=self.completed,
+            failed=self.failed,
+            skipped=self.skipped,
+            total=self.total,
+            elapsed=elapsed,
+            throughput=throughput,
+            eta=eta,
+        )
+
+    def _emit(self) -> None:
+        """Send a report to the callback, logging rather than raising errors."""
+        if self.callback is None:
+            return
+        try:
+            self.callback(self.report())
+        except Exception as e:
+            logger.warning(f"Progress callback failed: {e}")
@@ -11,7 +11,7 @@ import click
 
 from .analyzer import PromptAnalyzer
 from .models import PromptAnalysis
-from .optimizer import Optimizer
+from .optimizer import DEFAULT_BATCH_CHUNK_SIZE, BatchOptimizer, Optimizer
 from .repository_scanner import RepositoryScanner
 from .utils import load_config, save_config
 
@@ -143,5 +143,24 @@ def scan(repo_path: str, output: Optional[str] = None) -> None:
         click.echo(result.json())
 
 
+@cli.command("optimize-jsonl")
+@click.argument("input_path", default="-")
+@click.option("--output", "-o", default="-", help="Output JSONL path (default stdout)")
+@click.option("--parallel", is_flag=True, help="Optimize chunks on a process pool")
+@click.option("--workers", type=int, default=None, help="Number of worker processes")
+@click.option("--chunk-size", type=int, default=DEFAULT_BATCH_CHUNK_SIZE)
+def optimize_jsonl(
+    input_path: str,
+    output: str,
+    parallel: bool,
+    workers: Optional[int],
+    chunk_size: int,
+) -> None:
+    """Stream prompts from a JSONL file (or stdin) and write results as JSONL."""
+    with BatchOptimizer(max_workers=workers, chunk_size=chunk_size) as optimizer:
+        count = optimizer.optimize_jsonl(input_path, output, parallel=parallel)
+    logger.info(f"Optimized {count} prompts")
+
+
 if __name__ == "__main__":
     sys.exit(main())
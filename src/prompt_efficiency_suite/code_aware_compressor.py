@@ -7,7 +7,22 @@ from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Pattern, Set, Tuple, TypedDict
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+    TypedDict,
+)
+
+from .base_compressor import CompressionResult as TokenCompressionResult
+from .base_compressor import ExecutorCompressor
+from .code_minifier import CodeMinifier
+from .protected_spans import PROTECTED_PATTERNS
 
 logger = logging.getLogger(__name__)
 
@@ -31,16 +46,212 @@ class CodePattern(TypedDict):
     description: str
 
 
-class CodeAwareCompressor:
+# Code forms recognised in prompts, in priority order. The patterns are shared
+# with the protected-span catalog so both agree on what counts as code.
+CODE_PATTERNS: Dict[str, CodePattern] = {
+    "block": {
+        "pattern": PROTECTED_PATTERNS["code_block"],
+        "description": "Code block with language marker",
+    },
+    "inline": {
+        "pattern": PROTECTED_PATTERNS["inline_code"],
+        "description": "Inline code",
+    },
+    "indented": {
+        "pattern": PROTECTED_PATTERNS["indented_code"],
+        "description": "Indented code block",
+    },
+}
+
+# One alternation over every code form, so a prompt is split in a single scan.
+_CODE_SCANNER: Pattern[str] = re.compile(
+    "|".join(f"(?P<{name}>{info['pattern']})" for name, info in CODE_PATTERNS.items())
+)
+
+# Whitespace runs collapse to one space and punctuation runs to their first
+# character, in the same pass.
+_TEXT_NOISE: Pattern[str] = re.compile(r"\s+|(?P<punct>[.,;:!?])[.,;:!?]+")
+
+# Wordy phrases mapped to a shorter phrase with the same meaning.
+FILLER_PHRASES: Dict[str, str] = {
+    "in order to": "to",
+    "due to the fact that": "because",
+    "in the event that": "if",
+    "at this point in time": "now",
+    "for the purpose of": "for",
+    "a large number of": "many",
+}
+
+# Polite request openers, dropped only where they start a sentence
+# ("Could you please explain" -> "Explain"); elsewhere they can carry meaning.
+REQUEST_OPENERS: Tuple[str, ...] = (
+    "i would like you to",
+    "i want you to",
+    "could you please",
+    "can you please",
+    "would you please",
+    "please",
+)
+
+
+def _phrase_alternation(phrases: Iterable[str]) -> str:
+    """Regex alternation over phrases, longest first, matching any spacing."""
+    return "|".join(
+        re.escape(phrase).replace(r"\ ", r"\s+")
+        for phrase in sorted(phrases, key=len, reverse=True)
+    )
+
+
+_FILLER: Pattern[str] = re.compile(
+    rf"\b(?P<phrase>{_phrase_alternation(FILLER_PHRASES)})\b", re.IGNORECASE
+)
+_REQUEST_OPENER: Pattern[str] = re.compile(
+    r"(?:^|(?<=[.!?:;]))(?P<lead>\s*)"
+    rf"(?P<opener>{_phrase_alternation(REQUEST_OPENERS)}),?\s+(?P<next>\w)",
+    re.IGNORECASE | re.MULTILINE,
+)
+# A closing ", please" goes with its comma; without one "please" may be a verb.
+_TRAILING_PLEASE: Pattern[str] = re.compile(
+    r",\s*please\b(?=\s*(?:[.!?]|$))", re.IGNORECASE | re.MULTILINE
+)
+
+# Compression levels from mildest to strongest, and the section kind each one
+# rewrites. Every level also keeps the rewrites of the levels before it.
+COMPRESSION_LEVELS: Tuple[str, ...] = ("whitespace", "punctuation", "filler", "code")
+_LEVEL_KINDS: Dict[str, str] = {
+    "whitespace": "text",
+    "punctuation": "text",
+    "filler": "text",
+    "code": "code",
+}
+
+
+def _collapse_noise(match: "re.Match[str]") -> str:
+    """Replacement for a whitespace or punctuation run."""
+    return match.group("punct") or " "
+
+
+def _collapse_whitespace(match: "re.Match[str]") -> str:
+    """Replacement for a whitespace run, leaving punctuation runs alone."""
+    return match.group() if match.group("punct") else " "
+
+
+def _collapse_punctuation(match: "re.Match[str]") -> str:
+    """Replacement for a punctuation run, leaving whitespace runs alone."""
+    return match.group("punct") or match.group()
+
+
+def _match_case(source: str, text: str) -> str:
+    """Capitalize text if source starts with a capital letter."""
+    return text[:1].upper() + text[1:] if source[:1].isupper() else text
+
+
+def _replace_filler(match: "re.Match[str]") -> str:
+    """Replacement for a wordy phrase, keeping its capitalization."""
+    phrase = match.group("phrase")
+    return _match_case(phrase, FILLER_PHRASES[" ".join(phrase.lower().split())])
+
+
+def _drop_opener(match: "re.Match[str]") -> str:
+    """Replacement for a request opener, capitalizing the word after it."""
+    return match.group("lead") + _match_case(match.group("opener"), match.group("next"))
+
+
+@dataclass
+class _Section:
+    """A prompt section with its current text and token count."""
+
+    kind: str
+    text: str
+    tokens: int
+
+
+class CodeAwareCompressor(ExecutorCompressor):
     """A class for compressing prompts while preserving code blocks."""
 
-    def __init__(self):
-        """Initialize the compressor."""
+    def __init__(
+        self,
+        model_name: str = "gpt-3.5-turbo",
+        code_minifier: Optional[CodeMinifier] = None,
+        **executor_options: Any,
+    ):
+        """Initialize the compressor.
+
+        Args:
+            model_name: Model whose tokenizer measures compression.
+            code_minifier: Minifier applied to fenced code blocks. compress_prompt
+                keeps code blocks verbatim when omitted; the "code" level of
+                compress falls back to a default minifier.
+            **executor_options: ExecutorCompressor options (executor,
+                max_concurrency, chunk_size).
+        """
+        super().__init__(model_name, **executor_options)
         self.logger = logging.getLogger(__name__)
+        self.code_minifier = code_minifier
+        self.code_patterns = self._load_code_patterns()
+        self._level_minifier = code_minifier or CodeMinifier()
+
+    def compress_sync(
+        self, text: str, target_ratio: Optional[float] = None
+    ) -> TokenCompressionResult:
+        """Apply compression levels until the target token ratio is met.
+
+        Levels run from mildest to strongest (see COMPRESSION_LEVELS) and the
+        search stops at the first one whose savings reach ``target_ratio``.
+        Token counts are tracked per section, so a level only re-encodes the
+        sections it actually changed. The result reports exact counts for the
+        original and compressed text, which can differ from the section sums
+        by a token where a section boundary splits one.
+
+        Args:
+            text: The text to compress
+            target_ratio: Fraction of tokens to save (0.0 to 1.0). Every level
+                is applied when omitted.
 
-    def compress(self, prompt: str) -> str:
+        Returns:
+            TokenCompressionResult with token counts and the level used
+        """
+        sections = [
+            _Section(kind, content, self.count_tokens(content))
+            for kind, content in self._split_sections(text)
+        ]
+        section_total = current_total = sum(s.tokens for s in sections)
+
+        level = "none"
+        for candidate in COMPRESSION_LEVELS:
+            ratio = self.calculate_compression_ratio(section_total, current_total)
+            if target_ratio is not None and ratio >= target_ratio:
+                break
+            current_total = self._apply_level(candidate, sections)
+            level = candidate
+
+        compressed_text = "".join(section.text for section in sections)
+        original_tokens = self.count_tokens(text)
+        compressed_tokens = (
+            original_tokens if level == "none" else self.count_tokens(compressed_text)
+        )
+        ratio = self.calculate_compression_ratio(original_tokens, compressed_tokens)
+        return TokenCompressionResult(
+            original_tokens=original_tokens,
+            compressed_tokens=compressed_tokens,
+            compression_ratio=ratio,
+            compressed_text=compressed_text,
+            metadata={
+                "level": level,
+                "target_ratio": target_ratio,
+                "target_met": target_ratio is None or ratio >= target_ratio,
+                "code_sections": sum(s.kind == "code" for s in sections),
+                "model": self.model_name,
+            },
+        )
+
+    def compress_prompt(self, prompt: str) -> str:
         """Compress a prompt while preserving code blocks.
 
+        Fenced, inline and indented code are copied through (fenced blocks are
+        minified when a code minifier is set); only the prose between them is
+        compressed.
+
         Args:
             prompt: The prompt to compress
 
@@ -54,38 +265,94 @@ class CodeAwareCompressor:
         compressed_sections = []
         for section_type, content in sections:
             if section_type == "code":
+                if self.code_minifier is not None:
+                    content = self.code_minifier.minify_block(content)
                 compressed_sections.append(content)
             else:
                 compressed_sections.append(self._compress_text(content))
 
+        # Only the outer edges are trimmed, so prose keeps its separating space
+        # from adjacent inline code.
+        if sections and sections[0][0] == "text":
+            compressed_sections[0] = compressed_sections[0].lstrip()
+        if sections and sections[-1][0] == "text":
+            compressed_sections[-1] = compressed_sections[-1].rstrip()
         return "".join(compressed_sections)
 
-    def _split_sections(self, prompt: str) -> List[Tuple[str, str]]:
-        """Split a prompt into code and non-code sections.
+    def compress_many(self, prompts: Iterable[str]) -> List[str]:
+        """Compress a batch of prompts.
+
+        Repeated prompts in the batch are compressed once.
 
         Args:
-            prompt: The prompt to split
+            prompts: The prompts to compress
 
         Returns:
-            List of (section_type, content) tuples
+            The compressed prompts, in input order
         """
-        sections = []
-        current_pos = 0
+        compressed: Dict[str, str] = {}
+        results = []
+        for prompt in prompts:
+            if prompt not in compressed:
+                compressed[prompt] = self.compress_prompt(prompt)
+            results.append(compressed[prompt])
+        return results
 
-        # Find code blocks
-        for match in re.finditer(r"```.*?```", prompt, re.DOTALL):
-            # Add text before code block
-            if match.start() > current_pos:
-                sections.append(("text", prompt[current_pos : match.start()]))
+    def _apply_level(self, level: str, sections: List[_Section]) -> int:
+        """Apply one compression level to the sections it targets, in place.
 
-            # Add code block
-            sections.append(("code", match.group(0)))
-            current_pos = match.end()
+        Args:
+            level: Name of the level to apply
+            sections: Sections of the prompt being compressed
+
+        Returns:
+            The total token count after the level
+        """
+        kind = _LEVEL_KINDS[level]
+        last = len(sections) - 1
+        for index, section in enumerate(sections):
+            if section.kind != kind:
+                continue
+            if level == "whitespace":
+                text = _TEXT_NOISE.sub(_collapse_whitespace, section.text)
+            elif level == "punctuation":
+                text = _TEXT_NOISE.sub(_collapse_punctuation, section.text)
+            elif level == "filler":
+                text = self._remove_redundant_words(section.text)
+            else:
+                text = self._level_minifier.minify_block(section.text)
+            if kind == "text":
+                # Only the outer edges are trimmed, as in compress_prompt.
+                if index == 0:
+                    text = text.lstrip()
+                if index == last:
+                    text = text.rstrip()
+            if text != section.text:
+                section.text = text
+                section.tokens = self.count_tokens(text)
+        return sum(section.tokens for section in sections)
 
-        # Add remaining text
-        if current_pos < len(prompt):
-            sections.append(("text", prompt[current_pos:]))
+    def _split_sections(self, prompt: str) -> List[Tuple[str, str]]:
+        """Split a prompt into code and non-code sections in a single scan.
 
+        Args:
+            prompt: The prompt to split
+
+        Returns:
+            List of (section_type, content) tuples
+        """
+        sections: List[Tuple[str, str]] = []
+        position = 0
+        for match in _CODE_SCANNER.finditer(prompt):
+            start, end = match.span()
+            if end == start:
+                continue
+            if start > position:
+                sections.append(("text", prompt[position:start]))
+            sections.append(("code", prompt[start:end]))
+            position = end
+        if position < len(prompt):
+            sections.append(("text", prompt[position:]))
         return sections
 
     def _compress_text(self, text: str) -> str:
@@ -97,19 +364,16 @@ class CodeAwareCompressor:
         Returns:
             The compressed text
         """
-        # Remove redundant whitespace
-        text = re.sub(r"\s+", " ", text)
-
-        # Remove redundant punctuation
-        text = re.sub(r"[.,;:!?]{2,}", lambda m: m.group(0)[0], text)
-
-        # Remove redundant words
-        text = self._remove_redundant_words(text)
-
-        return text.strip()
+        # Remove redundant whitespace and punctuation
+        return _TEXT_NOISE.sub(_collapse_noise, text)
 
     def _remove_redundant_words(self, text: str) -> str:
-        """Remove redundant words from text.
+        """Drop polite request openers and shorten wordy phrases.
+
+        Only rewrites that keep the meaning are made: openers are dropped at
+        the start of a sentence, a closing ", please" with its comma, and
+        FILLER_PHRASES are replaced by their shorter equivalents. Intensifiers
+        and hedges such as "very" or "not simply" are kept.
 
         Args:
             text: The text to process
@@ -117,8 +381,9 @@ class CodeAwareCompressor:
         Returns:
             The text with redundant words removed
         """
-        # TODO: Implement word redundancy detection
-        return text
+        text = _REQUEST_OPENER.sub(_drop_opener, text)
+        text = _TRAILING_PLEASE.sub("", text)
+        return _FILLER.sub(_replace_filler, text)
 
     def get_compression_stats(self) -> Dict[str, Any]:
         """Get statistics about compressions.
@@ -150,17 +415,7 @@ class CodeAwareCompressor:
         Returns:
             Dict[str, CodePattern]: Dictionary of code patterns.
         """
-        return {
-            "block": {
-                "pattern": r"```[\s\S]*?```",
-                "description": "Code block with language marker",
-            },
-            "inline": {"pattern": r"`[^`]+`", "description": "Inline code"},
-            "indented": {
-                "pattern": r"(?m)^( {4}|\t).*$",
-                "description": "Indented code block",
-            },
-        }
+        return {name: CodePattern(**info) for name, info in CODE_PATTERNS.items()}
 
     def _extract_code_blocks(self, text: str) -> List[str]:
         """Extract code blocks from text.
@@ -171,16 +426,10 @@ class CodeAwareCompressor:
         Returns:
             List[str]: List of extracted code blocks.
         """
-        code_blocks: List[str] = []
-
         # Extract code blocks in order of appearance
-        for pattern_info in self.code_patterns.values():
-            pattern: Pattern[str] = re.compile(pattern_info["pattern"])
-            matches = pattern.finditer(text)
-            for match in matches:
-                code_blocks.append(match.group())
-
-        return code_blocks
+        return [
+            match.group() for match in _CODE_SCANNER.finditer(text) if match.group()
+        ]
 
     def _get_removed_tokens(self, original: str, compressed: str) -> List[str]:
         """Get list of removed tokens.
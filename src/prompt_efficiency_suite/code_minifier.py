@@ -0,0 +1,472 @@
+"""Code Minifier - Token-level code compression that keeps code valid."""
+
+import ast
+import builtins
+import hashlib
+import io
+import keyword
+import logging
+import re
+import threading
+import tokenize
+from collections import Counter, OrderedDict
+from itertools import count, product
+from string import ascii_letters
+from typing import Dict, Iterator, List, Optional, Pattern, Set, Tuple
+
+from .token_cache import CacheStats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CODE_CACHE_SIZE = 1024
+
+# Fence info strings mapped to the minifier that handles them.
+LANGUAGE_ALIASES: Dict[str, str] = {
+    "python": "python",
+    "python3": "python",
+    "py": "python",
+    "py3": "python",
+    **dict.fromkeys(["c", "h", "cpp", "c++", "cc", "hpp", "objc", "objective-c"], "c"),
+    **dict.fromkeys(["java", "kotlin", "kt", "scala", "swift", "dart"], "java"),
+    **dict.fromkeys(["cs", "csharp", "c#"], "java"),
+    **dict.fromkeys(
+        ["javascript", "js", "jsx", "mjs", "typescript", "ts", "tsx"], "js"
+    ),
+    **dict.fromkeys(["go", "golang"], "go"),
+    **dict.fromkeys(["rust", "rs"], "rust"),
+}
+
+# String literal syntax per C-style family. Rust has no single-quoted strings
+# (only chars, easily confused with lifetimes), so its quotes are left alone.
+_STRING_FORMS = {
+    "c": [r'"(?:[^"\\\n]|\\.)*"', r"'(?:[^'\\\n]|\\.)*'"],
+    "java": [r'"""[\s\S]*?"""', r'"(?:[^"\\\n]|\\.)*"', r"'(?:[^'\\\n]|\\.)*'"],
+    "js": [r'"(?:[^"\\\n]|\\.)*"', r"'(?:[^'\\\n]|\\.)*'", r"`(?:[^`\\]|\\.)*`"],
+    "go": [r'"(?:[^"\\\n]|\\.)*"', r"'(?:[^'\\\n]|\\.)*'", r"`[^`]*`"],
+    "rust": [r'r(?P<hashes>#*)"[\s\S]*?"(?P=hashes)', r'"(?:[^"\\]|\\.)*"'],
+}
+
+_WORD_TOKENS = (tokenize.NAME, tokenize.NUMBER)
+_SPACED_AFTER_WORD = (tokenize.NAME, tokenize.NUMBER, tokenize.STRING)
+# f-strings only tokenize into parts on Python 3.12+.
+_FSTRING_START: Optional[int] = getattr(tokenize, "FSTRING_START", None)
+_FSTRING_END: Optional[int] = getattr(tokenize, "FSTRING_END", None)
+
+_FENCE = re.compile(r"```([^\n`]*)\n([\s\S]*?)\n?```\Z")
+
+_RESERVED = frozenset(keyword.kwlist) | frozenset(keyword.softkwlist)
+_RESERVED |= frozenset(dir(builtins))
+
+# Calls that inspect a function's locals by name, which renaming would break.
+_INTROSPECTION = frozenset(["locals", "vars", "eval", "exec", "dir"])
+
+_NO_RENAME_NODES: Tuple[type, ...] = (
+    ast.FunctionDef,
+    ast.AsyncFunctionDef,
+    ast.Lambda,
+    ast.ClassDef,
+    ast.Global,
+    ast.Nonlocal,
+    ast.JoinedStr,
+    ast.Match,
+)
+
+
+def _c_style_pattern(family: str) -> Pattern[str]:
+    """Tokenizer for a C-style language: strings, comments and whitespace."""
+    strings = "|".join(_STRING_FORMS[family])
+    # Rust raw strings start with "r", so it must not be swallowed as code.
+    code = r"[^\s\"'`/r]+|." if family == "rust" else r"[^\s\"'`/]+|."
+    return re.compile(
+        rf"(?P<string>{strings})"
+        # Comments must follow whitespace, so URLs and regex literals such as
+        # /\/\// are not mistaken for them.
+        r"|(?P<comment>(?<!\S)(?://[^\n]*|/\*[\s\S]*?\*/))"
+        r"|(?P<newline>\n)"
+        r"|(?P<space>[ \t\r\f\v]+)"
+        rf"|(?P<code>{code})"
+    )
+
+
+_C_STYLE_PATTERNS = {family: _c_style_pattern(family) for family in _STRING_FORMS}
+
+
+def minify_c_style(code: str, family: str = "c", strip_comments: bool = True) -> str:
+    """Minify C-style code (C, Java, JavaScript, Go, Rust and relatives).
+
+    Indentation, blank lines and runs of spaces outside string literals are
+    collapsed to a single newline or space. Line breaks are kept, since
+    JavaScript, Go, Kotlin and Swift use them to end statements.
+
+    Args:
+        code: Source code.
+        family: Key of the string syntax to recognize ("c", "java", "js",
+            "go" or "rust").
+        strip_comments: Remove ``//`` and ``/* */`` comments.
+
+    Returns:
+        str: Minified code.
+    """
+    parts: List[str] = []
+    pending = ""
+    for match in _C_STYLE_PATTERNS[family].finditer(code):
+        kind = match.lastgroup
+        text = match.group()
+        if kind == "comment" and strip_comments:
+            pending = "\n" if "\n" in text or pending == "\n" else pending or " "
+        elif kind == "newline":
+            pending = "\n"
+        elif kind == "space":
+            pending = pending or " "
+        else:
+            if pending and parts:
+                parts.append(pending)
+            pending = ""
+            parts.append(text)
+    return "".join(parts)
+
+
+def _char_offset(line: str, byte_offset: int) -> int:
+    """Convert an AST UTF-8 byte column to a character column."""
+    if line.isascii():
+        return byte_offset
+    return len(line.encode("utf-8")[:byte_offset].decode("utf-8", "ignore"))
+
+
+def _short_names() -> Iterator[str]:
+    """Yield identifiers in order of length: a, b, ..., Z, aa, ab, ..."""
+    for length in count(1):
+        for letters in product(ascii_letters, repeat=length):
+            yield "".join(letters)
+
+
+def _docstring_positions(tree: ast.Module) -> Dict[Tuple[int, int], bool]:
+    """Map docstring statement positions to whether they are the whole body."""
+    positions = {}
+    for node in ast.walk(tree):
+        if not isinstance(
+            node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+        ):
+            continue
+        body = node.body
+        if (
+            body
+            and isinstance(body[0], ast.Expr)
+            and isinstance(body[0].value, ast.Constant)
+            and isinstance(body[0].value.value, str)
+        ):
+            sole = len(body) == 1 and not isinstance(node, ast.Module)
+            positions[(body[0].lineno, body[0].col_offset)] = sole
+    return positions
+
+
+def _plan_renames(tree: ast.Module, used: Set[str]) -> Dict[Tuple[int, int], str]:
+    """Choose short names for function locals, keyed by Name node position.
+
+    A function is only considered when renaming its locals uniformly is
+    provably safe: it has no nested scopes other than comprehensions, no
+    global/nonlocal declarations, f-strings or match statements, and does not
+    introspect its locals. Parameters, imports and exception names keep their
+    names, and new names never collide with any identifier in the module.
+    """
+    renames: Dict[Tuple[int, int], str] = {}
+    for func in ast.walk(tree):
+        if not isinstance(func, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        nodes = [node for stmt in func.body for node in ast.walk(stmt)]
+        if any(isinstance(node, _NO_RENAME_NODES) for node in nodes) or any(
+            isinstance(node, ast.Name) and node.id in _INTROSPECTION for node in nodes
+        ):
+            continue
+
+        args = func.args
+        excluded = {
+            arg.arg
+            for arg in args.posonlyargs
+            + args.args
+            + args.kwonlyargs
+            + [args.vararg, args.kwarg]
+            if arg is not None
+        }
+        comprehension_targets: Set[int] = set()
+        for node in nodes:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                excluded.update(
+                    (alias.asname or alias.name).split(".")[0] for alias in node.names
+                )
+            elif isinstance(node, ast.ExceptHandler) and node.name:
+                excluded.add(node.name)
+            elif isinstance(node, ast.comprehension):
+                comprehension_targets.update(map(id, ast.walk(node.target)))
+
+        names = [node for node in nodes if isinstance(node, ast.Name)]
+        local = {
+            node.id
+            for node in names
+            if not isinstance(node.ctx, ast.Load)
+            and id(node) not in comprehension_targets
+        } - excluded
+        if not local:
+            continue
+
+        frequency = Counter(node.id for node in names if node.id in local)
+        fresh = (name for name in _short_names() if name not in used)
+        short = next(fresh)
+        chosen = {}
+        for name in sorted(local, key=lambda n: -frequency[n] * len(n)):
+            if len(short) < len(name):
+                chosen[name] = short
+                short = next(fresh)
+        for node in names:
+            if node.id in chosen:
+                renames[(node.lineno, node.col_offset)] = chosen[node.id]
+    return renames
+
+
+def minify_python(
+    source: str,
+    strip_comments: bool = True,
+    strip_docstrings: bool = False,
+    rename_locals: bool = False,
+) -> str:
+    """Minify Python source while keeping it valid and equivalent.
+
+    The source is parsed to validate it and locate docstrings and locals, then
+    re-emitted from its token stream with one space per indentation level, no
+    blank lines, and spaces only where two tokens would otherwise merge.
+
+    Args:
+        source: Python source code.
+        strip_comments: Remove comments.
+        strip_docstrings: Remove module, class and function docstrings
+            (replaced by ``pass`` when they are the whole body).
+        rename_locals: Shorten local variable names inside functions.
+
+    Returns:
+        str: Minified source.
+
+    Raises:
+        SyntaxError: If the source is not valid Python.
+    """
+    source = source.replace("\r\n", "\n")
+    tree = ast.parse(source)
+    lines = io.StringIO(source).readlines()
+
+    def char_position(lineno: int, col_offset: int) -> Tuple[int, int]:
+        return lineno, _char_offset(lines[lineno - 1], col_offset)
+
+    docstrings = {}
+    if strip_docstrings:
+        docstrings = {
+            char_position(*position): sole
+            for position, sole in _docstring_positions(tree).items()
+        }
+    renames = {}
+    if rename_locals:
+        used = {
+            token.string
+            for token in tokenize.generate_tokens(io.StringIO(source).readline)
+            if token.type == tokenize.NAME
+        }
+        renames = {
+            char_position(*position): name
+            for position, name in _plan_renames(tree, used | _RESERVED).items()
+        }
+
+    out: List[str] = []
+    depth = 0
+    at_line_start = True
+    previous_type: Optional[int] = None
+    previous_text = ""
+    skipping: Optional[bool] = None  # inside a docstring; True if it is the body
+    skip_brackets = 0
+    fstring_start = (0, 0)  # where the outermost open f-string began
+    fstring_depth = 0
+    after_comment = False
+
+    def emit(token_type: int, text: str) -> None:
+        nonlocal at_line_start, previous_type, previous_text
+        if at_line_start:
+            out.append(" " * depth)
+            at_line_start = False
+        elif previous_type in _WORD_TOKENS and (
+            token_type in _SPACED_AFTER_WORD
+            or (previous_type == tokenize.NUMBER and text.startswith("."))
+        ):
+            # Keep "return x", "1 .real" and "r 'x'" from merging.
+            out.append(" ")
+        out.append(text)
+        previous_type, previous_text = token_type, text
+
+    def newline() -> None:
+        nonlocal at_line_start, previous_type
+        out.append("\n")
+        at_line_start, previous_type = True, None
+
+    def source_text(start: Tuple[int, int], end: Tuple[int, int]) -> str:
+        if start[0] == end[0]:
+            return lines[start[0] - 1][start[1] : end[1]]
+        return "".join(
+            [lines[start[0] - 1][start[1] :], *lines[start[0] : end[0] - 1]]
+            + [lines[end[0] - 1][: end[1]]]
+        )
+
+    for token in tokenize.generate_tokens(io.StringIO(source).readline):
+        kind = token.type
+
+        # Copy f-strings verbatim: their tokens do not round-trip (3.12+).
+        if fstring_depth:
+            if kind == _FSTRING_START:
+                fstring_depth += 1
+            elif kind == _FSTRING_END:
+                fstring_depth -= 1
+                if not fstring_depth and skipping is None:
+                    emit(tokenize.STRING, source_text(fstring_start, token.end))
+            continue
+
+        if skipping is not None:
+            if kind == tokenize.OP and token.string in "([{":
+                skip_brackets += 1
+            elif kind == tokenize.OP and token.string in ")]}":
+                skip_brackets -= 1
+            elif skip_brackets == 0 and (
+                kind == tokenize.NEWLINE or token.string == ";"
+            ):
+                if skipping:
+                    emit(tokenize.NAME, "pass")
+                    newline()
+                skipping = None
+            continue
+
+        if kind == tokenize.INDENT:
+            depth += 1
+        elif kind == tokenize.DEDENT:
+            depth -= 1
+        elif kind == tokenize.NEWLINE:
+            if not after_comment:
+                newline()
+        elif kind == tokenize.COMMENT:
+            if not strip_comments:
+                emit(kind, token.string)
+                newline()
+                after_comment = True
+                continue
+        elif kind == _FSTRING_START:
+            fstring_start, fstring_depth = token.start, 1
+        elif kind not in (tokenize.NL, tokenize.ENCODING, tokenize.ENDMARKER):
+            if token.start in docstrings and (
+                at_line_start or (previous_type == tokenize.OP and previous_text == ":")
+            ):
+                skipping = docstrings[token.start]
+                skip_brackets = 0
+                if kind == tokenize.OP and token.string in "([{":
+                    skip_brackets = 1
+                continue
+            emit(kind, renames.get(token.start, token.string))
+        after_comment = False
+
+    return "".join(out).rstrip()
+
+
+class CodeMinifier:
+    """Minifies code blocks, caching results per block hash.
+
+    The same snippets recur across many prompts, so results are kept in a
+    thread-safe LRU cache keyed by language and a hash of the code. Python is
+    compressed from its token stream; C-style languages by a string-aware
+    scanner. Code in other languages, and Python that does not parse, is
+    returned unchanged.
+    """
+
+    def __init__(
+        self,
+        strip_comments: bool = True,
+        strip_docstrings: bool = False,
+        rename_locals: bool = False,
+        cache_size: int = DEFAULT_CODE_CACHE_SIZE,
+    ) -> None:
+        """Initialize the minifier.
+
+        Args:
+            strip_comments: Remove comments.
+            strip_docstrings: Remove Python docstrings.
+            rename_locals: Shorten Python local variable names.
+            cache_size: Maximum number of minified blocks kept.
+        """
+        self.strip_comments = strip_comments
+        self.strip_docstrings = strip_docstrings
+        self.rename_locals = rename_locals
+        self.cache_size = cache_size
+        self.stats = CacheStats()
+        self._cache: "OrderedDict[Tuple[str, bytes], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def minify(self, code: str, language: str = "python") -> str:
+        """Minify code in the given language.
+
+        Args:
+            code: Source code.
+            language: Language name or fence alias (e.g. "py", "ts").
+
+        Returns:
+            str: Minified code, or the input if it cannot be minified safely.
+        """
+        family = LANGUAGE_ALIASES.get(language.strip().lower())
+        if family is None:
+            return code
+
+        key = (family, hashlib.blake2b(code.encode("utf-8"), digest_size=16).digest())
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats.hits += 1
+                return cached
+            self.stats.misses += 1
+
+        minified = self._minify(code, family)
+
+        with self._lock:
+            self._cache[key] = minified
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                self.stats.evictions += 1
+        return minified
+
+    def minify_block(self, block: str) -> str:
+        """Minify a fenced Markdown code block, keeping its fence and language.
+
+        Args:
+            block: Text of the form ```` ```lang\\n...``` ````.
+
+        Returns:
+            str: The block with its code minified.
+        """
+        match = _FENCE.match(block)
+        if match is None:
+            return block
+        info, code = match.groups()
+        language = info.split()[0] if info.split() else ""
+        minified = self.minify(code, language)
+        if minified is code:
+            return block
+        return f"```{info}\n{minified}\n```"
+
+    def clear(self) -> None:
+        """Drop all cached blocks."""
+        with self._lock:
+            self._cache.clear()
+
+    def _minify(self, code: str, family: str) -> str:
+        if family != "python":
+            return minify_c_style(code, family, self.strip_comments)
+        try:
+            return minify_python(
+                code,
+                strip_comments=self.strip_comments,
+                strip_docstrings=self.strip_docstrings,
+                rename_locals=self.rename_locals,
+            )
+        except (SyntaxError, ValueError, tokenize.TokenError) as e:
+            logger.debug(f"Leaving unparsable Python unchanged: {e}")
+            return code
@@ -0,0 +1,314 @@
+"""Columnar - Per-result metrics kept in NumPy arrays for vectorized statistics."""
+
+import logging
+import threading
+from typing import Callable, Dict, Generic, Iterable, List, Optional, Sequence, TypeVar
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INITIAL_CAPACITY = 1024
+DEFAULT_STORE_CAPACITY = 100_000
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0)
+
+T = TypeVar("T")
+
+
+class ColumnarStore(Generic[T]):
+    """A fixed-capacity table of numeric metrics with categorical group keys.
+
+    Each registered column is extracted from results as they arrive and
+    written into a row of a 2-D float array that grows by doubling up to
+    ``capacity`` rows and is then used as a ring buffer, overwriting the
+    oldest rows. Group keys (e.g. model or domain) are dictionary-encoded into
+    integer code arrays. Percentiles, histograms and group-bys are single
+    NumPy calls over the retained rows, instead of one Python pass over result
+    objects per metric. Counts, sums, means, minima and maxima are kept as
+    running vectors over every row ever appended, as in BoundedHistory.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, Callable[[T], float]],
+        groups: Optional[Dict[str, Callable[[T], str]]] = None,
+        initial_capacity: int = DEFAULT_INITIAL_CAPACITY,
+        capacity: Optional[int] = DEFAULT_STORE_CAPACITY,
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            columns: Named extractors for numeric metrics.
+            groups: Named extractors for categorical group keys.
+            initial_capacity: Rows preallocated before the first resize.
+            capacity: Maximum number of rows retained (None for no limit).
+        """
+        self._column_fns = columns
+        self._group_fns = groups or {}
+        self.columns: List[str] = list(columns)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self.capacity = capacity
+        self._initial_capacity = max(1, initial_capacity)
+        if capacity is not None:
+            self._initial_capacity = min(self._initial_capacity, max(1, capacity))
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        """Allocate empty arrays and zero the running totals."""
+        self._size = 0
+        self._start = 0  # Row holding the oldest result once the ring is full
+        self._data = np.empty((self._initial_capacity, len(self.columns)))
+        self._codes: Dict[str, np.ndarray] = {
+            name: np.empty(self._initial_capacity, dtype=np.int32)
+            for name in self._group_fns
+        }
+        self._categories: Dict[str, Dict[str, int]] = {
+            name: {} for name in self._group_fns
+        }
+        self.total = 0
+        self._sums = np.zeros(len(self.columns))
+        self._minima = np.full(len(self.columns), np.inf)
+        self._maxima = np.full(len(self.columns), -np.inf)
+
+    def _reserve(self, rows: int) -> None:
+        """Grow the arrays so that ``rows`` more rows fit, up to the capacity."""
+        needed = self._size + rows
+        capacity = len(self._data)
+        if self.capacity is not None:
+            needed = min(needed, self.capacity)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        if self.capacity is not None:
+            capacity = min(capacity, self.capacity)
+        data = np.empty((capacity, len(self.columns)))
+        data[: self._size] = self._data[: self._size]
+        self._data = data
+        for name, codes in self._codes.items():
+            grown = np.empty(capacity, dtype=np.int32)
+            grown[: self._size] = codes[: self._size]
+            self._codes[name] = grown
+
+    def _encode(self, group: str, key: str) -> int:
+        """Get the integer code for a group key, assigning one if new."""
+        categories = self._categories[group]
+        code = categories.get(key)
+        if code is None:
+            code = categories[key] = len(categories)
+        return code
+
+    def _retained(self, array: np.ndarray) -> np.ndarray:
+        """Copy the retained rows of an array, oldest first.
+
+        Must be called with the lock held.
+        """
+        values: np.ndarray
+        if not self._start:
+            values = array[: self._size].copy()
+        else:
+            values = np.concatenate((array[self._start :], array[: self._start]))
+        values.flags.writeable = False
+        return values
+
+    def append(self, item: T) -> None:
+        """Record one result.
+
+        Args:
+            item: Result to extract metrics and group keys from.
+        """
+        self.extend([item])
+
+    def extend(self, items: Iterable[T]) -> None:
+        """Record several results.
+
+        Args:
+            items: Results to extract metrics and group keys from.
+        """
+        items = list(items)
+        if not items:
+            return
+        rows = np.array(
+            [[fn(item) for fn in self._column_fns.values()] for item in items],
+            dtype=float,
+        ).reshape(len(items), len(self.columns))
+        if self.capacity is not None and len(items) > self.capacity:
+            # Only the newest rows fit; the totals below still count them all.
+            retained_items, retained_rows = (
+                items[-self.capacity :],
+                rows[-self.capacity :],
+            )
+        else:
+            retained_items, retained_rows = items, rows
+        with self._lock:
+            self.total += len(items)
+            self._sums += rows.sum(axis=0)
+            np.minimum(self._minima, rows.min(axis=0), out=self._minima)
+            np.maximum(self._maxima, rows.max(axis=0), out=self._maxima)
+
+            count = len(retained_items)
+            self._reserve(count)
+            length = len(self._data)
+            positions = (self._start + self._size + np.arange(count)) % length
+            self._data[positions] = retained_rows
+            for name, fn in self._group_fns.items():
+                self._codes[name][positions] = [
+                    self._encode(name, str(fn(item))) for item in retained_items
+                ]
+            overwritten = max(0, self._size + count - length)
+            self._size = min(self._size + count, length)
+            self._start = (self._start + overwritten) % length
+
+    def clear(self) -> None:
+        """Drop all recorded rows and running totals."""
+        with self._lock:
+            self._reset()
+
+    def __len__(self) -> int:
+        """Number of retained rows."""
+        return self._size
+
+    def column(self, name: str) -> np.ndarray:
+        """Get a read-only copy of a column over the retained rows, oldest first.
+
+        Args:
+            name: Column name.
+
+        Returns:
+            np.ndarray: Column values.
+        """
+        with self._lock:
+            return self._retained(self._data[:, self._index[name]])
+
+    def means(self) -> Dict[str, float]:
+        """Mean of every column over all rows ever recorded.
+
+        Returns:
+            Dict[str, float]: Column means (empty if no rows are recorded).
+        """
+        with self._lock:
+            if not self.total:
+                return {}
+            values = self._sums / self.total
+        return dict(zip(self.columns, values.tolist()))
+
+    def mean(self, name: str) -> float:
+        """Mean of a column over all rows ever recorded (0.0 if none)."""
+        with self._lock:
+            return (
+                float(self._sums[self._index[name]] / self.total) if self.total else 0.0
+            )
+
+    def sum(self, name: str) -> float:
+        """Sum of a column over all rows ever recorded."""
+        with self._lock:
+            return float(self._sums[self._index[name]])
+
+    def minimum(self, name: str) -> float:
+        """Minimum of a column over all rows ever recorded (0.0 if none)."""
+        with self._lock:
+            return float(self._minima[self._index[name]]) if self.total else 0.0
+
+    def maximum(self, name: str) -> float:
+        """Maximum of a column over all rows ever recorded (0.0 if none)."""
+        with self._lock:
+            return float(self._maxima[self._index[name]]) if self.total else 0.0
+
+    def percentiles(
+        self, name: str, q: Sequence[float] = DEFAULT_PERCENTILES
+    ) -> Dict[float, float]:
+        """Percentiles of a column over the retained rows.
+
+        Args:
+            name: Column name.
+            q: Percentiles to compute, between 0 and 100.
+
+        Returns:
+            Dict[float, float]: Value of each requested percentile.
+        """
+        values = self.column(name)
+        if not len(values):
+            return {}
+        percentiles = np.percentile(values, q)
+        return dict(zip(q, np.atleast_1d(percentiles).tolist()))
+
+    def histogram(self, name: str, bins: int = 10) -> Dict[str, List[float]]:
+        """Histogram of a column over the retained rows.
+
+        Args:
+            name: Column name.
+            bins: Number of equal-width bins.
+
+        Returns:
+            Dict[str, List[float]]: Bin counts and the bins' edges.
+        """
+        counts, edges = np.histogram(self.column(name), bins=bins)
+        return {"counts": counts.tolist(), "edges": edges.tolist()}
+
+    def describe(
+        self, name: str, q: Sequence[float] = DEFAULT_PERCENTILES
+    ) -> Dict[str, float]:
+        """Summary statistics of a column over the retained rows.
+
+        Args:
+            name: Column name.
+            q: Percentiles to include.
+
+        Returns:
+            Dict[str, float]: Count, mean, standard deviation, min, max and the
+            requested percentiles (as ``p50``-style keys).
+        """
+        values = self.column(name)
+        if not len(values):
+            return {"count": 0}
+        summary = {
+            "count": len(values),
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+        }
+        for percentile, value in zip(q, np.atleast_1d(np.percentile(values, q))):
+            summary[f"p{percentile:g}"] = float(value)
+        return summary
+
+    def group_counts(self, by: str) -> Dict[str, int]:
+        """Number of retained rows per group key.
+
+        Args:
+            by: Group name.
+
+        Returns:
+            Dict[str, int]: Row count for each key with retained rows.
+        """
+        with self._lock:
+            codes = self._codes[by][: self._size].copy()
+            categories = dict(self._categories[by])
+        counts = np.bincount(codes, minlength=len(categories))
+        return {
+            key: int(counts[code]) for key, code in categories.items() if counts[code]
+        }
+
+    def group_means(self, name: str, by: str) -> Dict[str, float]:
+        """Mean of a column per group key over the retained rows.
+
+        Args:
+            name: Column name.
+            by: Group name.
+
+        Returns:
+            Dict[str, float]: Column mean for each key.
+        """
+        with self._lock:
+            codes = self._codes[by][: self._size].copy()
+            values = self._data[: self._size, self._index[name]].copy()
+            categories = dict(self._categories[by])
+        size = len(categories)
+        totals = np.bincount(codes, weights=values, minlength=size)
+        counts = np.bincount(codes, minlength=size)
+        return {
+            key: float(totals[code] / counts[code])
+            for key, code in categories.items()
+            if counts[code]
+        }
@@ -0,0 +1,142 @@
+"""Compressor Adapters - Async BaseCompressor front-ends for the synchronous compressors."""
+
+import logging
+import math
+from typing import Any, Dict, Optional
+
+from .base_compressor import CompressionResult, ExecutorCompressor
+from .domain_aware_trimmer import DomainAwareTrimmer
+from .multimodal_compressor import MultimodalCompressor
+
+logger = logging.getLogger(__name__)
+
+
+class MultimodalCompressorAdapter(ExecutorCompressor):
+    """Runs a MultimodalCompressor behind the async BaseCompressor interface.
+
+    Multimodal compression has a single strength, so ``target_ratio`` is only
+    reported against (``target_met`` in the metadata), never searched for.
+    """
+
+    def __init__(
+        self,
+        compressor: Optional[MultimodalCompressor] = None,
+        model_name: str = "gpt-3.5-turbo",
+        compression_params: Optional[Dict[str, Any]] = None,
+        **executor_options: Any,
+    ):
+        """Initialize the adapter.
+
+        Args:
+            compressor: Compressor to run (a default one is created if omitted)
+            model_name: Model whose tokenizer measures compression
+            compression_params: Parameters passed to every compress call
+            **executor_options: ExecutorCompressor options (executor,
+                max_concurrency, chunk_size)
+        """
+        super().__init__(model_name, **executor_options)
+        self.compressor = compressor or MultimodalCompressor()
+        self.compression_params = compression_params
+
+    def compress_sync(
+        self, text: str, target_ratio: Optional[float] = None
+    ) -> CompressionResult:
+        """Compress a multimodal prompt on the calling thread.
+
+        Args:
+            text: The text to compress
+            target_ratio: Optional target compression ratio (0.0 to 1.0)
+
+        Returns:
+            CompressionResult containing compression metrics and results
+        """
+        result = self.compressor.compress(text, self.compression_params)
+        original_tokens = self.count_tokens(text)
+        compressed_tokens = self.count_tokens(result.compressed_text)
+        ratio = self.calculate_compression_ratio(original_tokens, compressed_tokens)
+        return CompressionResult(
+            original_tokens=original_tokens,
+            compressed_tokens=compressed_tokens,
+            compression_ratio=ratio,
+            compressed_text=result.compressed_text,
+            metadata={
+                "media_count": result.metadata["media_count"],
+                "image_tokens_saved": result.metadata["image_tokens_saved"],
+                "target_ratio": target_ratio,
+                "target_met": target_ratio is None or ratio >= target_ratio,
+                "model": self.model_name,
+            },
+        )
+
+
+class DomainAwareCompressorAdapter(ExecutorCompressor):
+    """Runs a DomainAwareTrimmer behind the async BaseCompressor interface.
+
+    With a ``target_ratio`` the text is trimmed to the matching token budget,
+    keeping the most domain-relevant sentences; without one it is trimmed by
+    term preservation at ``preserve_ratio``.
+    """
+
+    def __init__(
+        self,
+        trimmer: DomainAwareTrimmer,
+        domain: str,
+        model_name: str = "gpt-3.5-turbo",
+        preserve_ratio: float = 0.8,
+        **executor_options: Any,
+    ):
+        """Initialize the adapter.
+
+        Args:
+            trimmer: Trimmer with ``domain`` loaded
+            domain: Domain to trim for
+            model_name: Model whose tokenizer measures compression
+            preserve_ratio: Term preservation ratio used without a target
+            **executor_options: ExecutorCompressor options (executor,
+                max_concurrency, chunk_size)
+
+        Raises:
+            ValueError: If the domain is not loaded in the trimmer.
+        """
+        if domain not in trimmer.domains:
+            raise ValueError(f"Domain '{domain}' not loaded")
+        super().__init__(model_name, **executor_options)
+        self.trimmer = trimmer
+        self.domain = domain
+        self.preserve_ratio = preserve_ratio
+
+    def compress_sync(
+        self, text: str, target_ratio: Optional[float] = None
+    ) -> CompressionResult:
+        """Trim a prompt on the calling thread.
+
+        Args:
+            text: The text to compress
+            target_ratio: Optional target compression ratio (0.0 to 1.0)
+
+        Returns:
+            CompressionResult containing compression metrics and results
+        """
+        original_tokens = self.count_tokens(text)
+        if target_ratio is None:
+            result = self.trimmer.trim(text, self.domain, self.preserve_ratio)
+        else:
+            budget = math.floor(original_tokens * (1 - target_ratio))
+            result = self.trimmer.trim_to_budget(
+                text, self.domain, budget, model=self.model_name
+            )
+        compressed_tokens = self.count_tokens(result.trimmed_text)
+        ratio = self.calculate_compression_ratio(original_tokens, compressed_tokens)
+        return CompressionResult(
+            original_tokens=original_tokens,
+            compressed_tokens=compressed_tokens,
+            compression_ratio=ratio,
+            compressed_text=result.trimmed_text,
+            metadata={
+                "domain": self.domain,
+                "preserved_terms": len(result.preserved_terms),
+                "target_ratio": target_ratio,
+                "target_met": target_ratio is None or ratio >= target_ratio,
+                "model": self.model_name,
+            },
+        )
@@ -2,11 +2,13 @@
 
 import json
 import logging
-from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
+
+from .history import DEFAULT_HISTORY_CAPACITY, BoundedHistory
+from .token_counter import get_token_engine
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +27,28 @@ class CostEstimate:
 class CostEstimator:
     """A class for estimating prompt costs."""
 
-    def __init__(self):
-        """Initialize the cost estimator."""
+    def __init__(
+        self,
+        history_size: int = DEFAULT_HISTORY_CAPACITY,
+        history_path: Optional[Path] = None,
+    ):
+        """Initialize the cost estimator.
+
+        Args:
+            history_size: Number of recent estimates kept in memory.
+            history_path: Optional JSONL file receiving every estimate.
+        """
         self.logger = logging.getLogger(__name__)
-        self.estimation_history: List[CostEstimate] = []
+        self.estimation_history: BoundedHistory[CostEstimate] = BoundedHistory(
+            capacity=history_size,
+            metrics={
+                "total_cost": lambda e: e.total_cost,
+                "token_count": lambda e: e.token_count,
+            },
+            tallies={"model_usage": lambda e: [e.model_name]},
+            spill_path=history_path,
+        )
+        self.token_engine = get_token_engine()
         self.model_rates = self._load_model_rates()
 
     def estimate(self, prompt: str, model: str = "gpt-4") -> Dict[str, Any]:
@@ -42,7 +62,7 @@ class CostEstimator:
             Dictionary containing cost estimation
         """
         # Count tokens
-        token_count = self._count_tokens(prompt)
+        token_count = self._count_tokens(prompt, model)
 
         # Get model rates
         rates = self._get_model_rates(model)
@@ -57,17 +77,17 @@ class CostEstimator:
             "rates": rates,
         }
 
-    def _count_tokens(self, text: str) -> int:
+    def _count_tokens(self, text: str, model: str = "gpt-4") -> int:
         """Count the number of tokens in text.
 
         Args:
             text: The text to count tokens in
+            model: The model whose encoding should be used
 
         Returns:
             Number of tokens
         """
-        # TODO: Implement proper token counting
-        return len(text.split())
+        return self.token_engine.count(text, model)
 
     def _get_model_rates(self, model: str) -> Dict[str, float]:
         """Get the rates for a model.
@@ -99,8 +119,8 @@ class CostEstimator:
         Returns:
             float: Estimated cost in USD.
         """
-        # Get token count (simple estimation)
-        token_count = len(prompt.split()) * 1.3  # Rough approximation
+        # Get token count
+        token_count = self._count_tokens(prompt, model_name)
 
         # Get cost per token
         cost_per_token = self.model_rates.get(model_name, 0.0)
@@ -110,7 +130,7 @@ class CostEstimator:
 
         # Create estimate
         estimate = CostEstimate(
-            token_count=int(token_count),
+            token_count=token_count,
             cost_per_token=cost_per_token,
             total_cost=total_cost,
             model_name=model_name,
@@ -129,22 +149,14 @@ class CostEstimator:
         if not self.estimation_history:
             return {}
 
-        total_estimations = len(self.estimation_history)
-        total_cost = sum(e.total_cost for e in self.estimation_history)
-        total_tokens = sum(e.token_count for e in self.estimation_history)
-
-        # Calculate model usage distribution
-        model_usage: Dict[str, int] = defaultdict(int)
-        for estimate in self.estimation_history:
-            model_usage[estimate.model_name] += 1
-
+        history = self.estimation_history
         return {
-            "total_estimations": total_estimations,
-            "total_cost": total_cost,
-            "average_cost": total_cost / total_estimations,
-            "total_tokens": total_tokens,
-            "average_tokens": total_tokens / total_estimations,
-            "model_usage": dict(model_usage),
+            "total_estimations": history.total,
+            "total_cost": history.sum("total_cost"),
+            "average_cost": history.mean("total_cost"),
+            "total_tokens": int(history.sum("token_count")),
+            "average_tokens": history.mean("token_count"),
+            "model_usage": dict(history.tallies["model_usage"]),
         }
 
     def export_estimation_history(self, output_path: Path) -> None:
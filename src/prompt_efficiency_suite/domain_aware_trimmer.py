@@ -3,13 +3,20 @@
 import json
 import logging
 import re
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import compress
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Pattern, Set, TypedDict, Union
 
 import yaml
 
+from .budget_trimming import fit_to_budget, score_spans
+from .domain_bundle import BUNDLE_SUFFIX, DomainBundle
+from .term_matcher import PackedTermMatcher, TermMatch, TermMatcher
+from .token_counter import DEFAULT_MODEL
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +43,7 @@ class DomainConfig(TypedDict):
     remove_patterns: List[str]
     preserve_regex: List[Pattern[str]]
     remove_regex: List[Pattern[str]]
+    weights: Dict[str, float]
 
 
 class DomainAwareTrimmer:
@@ -44,7 +52,7 @@ class DomainAwareTrimmer:
     def __init__(self):
         """Initialize the DomainAwareTrimmer."""
         self.domains: Dict[str, DomainConfig] = {}
-        self.compound_patterns: Dict[str, List[Pattern[str]]] = {}
+        self.term_matchers: Dict[str, Union[TermMatcher, PackedTermMatcher]] = {}
         self.tokenization_rules: Dict[str, Dict[str, Any]] = {}
         self.logger = logging.getLogger(__name__)
 
@@ -53,12 +61,17 @@ class DomainAwareTrimmer:
 
         Args:
             domain (str): Name of the domain (e.g., 'legal', 'medical').
-            dictionary_path (Union[str, Path]): Path to the dictionary file (JSON or YAML).
+            dictionary_path (Union[str, Path]): Path to the dictionary file (JSON,
+                YAML, or a bundle compiled by ``compile_domain_bundle``).
         """
         path = Path(dictionary_path)
         if not path.exists():
             raise FileNotFoundError(f"Dictionary file not found: {dictionary_path}")
 
+        if path.suffix.lower() == BUNDLE_SUFFIX:
+            self._load_bundle(domain, path)
+            return
+
         with open(path, "r", encoding="utf-8") as f:
             if path.suffix.lower() == ".json":
                 data: Dict[str, Any] = json.load(f)
@@ -78,13 +91,46 @@ class DomainAwareTrimmer:
                 re.compile(pattern, re.IGNORECASE)
                 for pattern in data.get("remove_patterns", [])
             ],
+            "weights": data.get("weights", {}),
         }
 
-        # Compile compound term patterns
-        self.compound_patterns[domain] = [
-            re.compile(re.escape(term), re.IGNORECASE)
-            for term in self.domains[domain]["compound_terms"]
-        ]
+        self._build_term_matcher(domain)
+
+    def _load_bundle(self, domain: str, path: Path) -> None:
+        """Load a precompiled domain bundle without rebuilding its automaton.
+
+        Args:
+            domain (str): Name of the domain.
+            path (Path): Path to the bundle file.
+        """
+        bundle = DomainBundle(path)
+        terms, compound_terms = bundle.term_sets()
+        self.domains[domain] = {
+            "terms": terms,
+            "compound_terms": compound_terms,
+            "preserve_patterns": bundle.preserve_patterns,
+            "remove_patterns": bundle.remove_patterns,
+            "preserve_regex": [
+                re.compile(pattern, re.IGNORECASE)
+                for pattern in bundle.preserve_patterns
+            ],
+            "remove_regex": [
+                re.compile(pattern, re.IGNORECASE) for pattern in bundle.remove_patterns
+            ],
+            "weights": bundle.importance(),
+        }
+        self.term_matchers[domain] = bundle.matcher
+
+    def _build_term_matcher(self, domain: str) -> None:
+        """Build the Aho-Corasick automaton over a domain's terms.
+
+        Args:
+            domain (str): Name of the domain.
+        """
+        domain_data = self.domains[domain]
+        self.term_matchers[domain] = TermMatcher(
+            sorted(domain_data["terms"] | domain_data["compound_terms"])
+        )
 
     def add_domain_terms(self, domain: str, terms: List[str]) -> None:
         """Add terms to an existing domain dictionary.
@@ -101,9 +147,11 @@ class DomainAwareTrimmer:
                 "remove_patterns": [],
                 "preserve_regex": [],
                 "remove_regex": [],
+                "weights": {},
             }
 
         self.domains[domain]["terms"].update(terms)
+        self._build_term_matcher(domain)
 
     def set_tokenization_rules(self, domain: str, rules: Dict[str, Any]) -> None:
         """Set tokenization rules for a domain.
@@ -138,9 +186,10 @@ class DomainAwareTrimmer:
         domain_terms: Set[str] = self._identify_domain_terms(text, domain)
 
         # Apply domain-specific rules
-        trimmed_tokens: List[str] = self._apply_domain_rules(
+        mask: bytearray = self._preserved_mask(
             tokens, domain, domain_terms, preserve_ratio
         )
+        trimmed_tokens: List[str] = list(compress(tokens, mask))
 
         # Calculate metrics
         trimmed_text: str = " ".join(trimmed_tokens)
@@ -150,7 +199,7 @@ class DomainAwareTrimmer:
         # Get preserved and removed terms
         preserved_terms: List[str] = list(domain_terms)
         removed_terms: List[str] = [
-            token for token in tokens if token not in trimmed_tokens
+            token for token, keep in zip(tokens, mask) if not keep
         ]
 
         return TrimmingResult(
@@ -164,6 +213,71 @@ class DomainAwareTrimmer:
             metadata={"timestamp": self._get_timestamp()},
         )
 
+    def trim_to_budget(
+        self, text: str, domain: str, max_tokens: int, model: str = DEFAULT_MODEL
+    ) -> TrimmingResult:
+        """Trim text to a token budget, keeping the most domain-relevant spans.
+
+        Sentences are valued by the weights of the domain terms and preserve
+        pattern matches they contain (1.0 for terms without a weight), then the
+        best set that fits the budget is kept in its original order.
+
+        Args:
+            text (str): Text to trim.
+            domain (str): Domain to use for trimming.
+            max_tokens (int): Maximum number of tokens in the trimmed text.
+            model (str): Model whose tokenizer defines the budget.
+
+        Returns:
+            TrimmingResult: Result with token counts measured for ``model``.
+        """
+        if domain not in self.domains:
+            raise ValueError(f"Domain '{domain}' not loaded")
+
+        domain_data: DomainConfig = self.domains[domain]
+        matches: List[TermMatch] = list(self.term_matchers[domain].iter_matches(text))
+        for pattern in domain_data["preserve_regex"]:
+            matches.extend(
+                TermMatch(match.start(), match.end(), match.group())
+                for match in pattern.finditer(text)
+            )
+
+        selection = fit_to_budget(
+            text,
+            max_tokens,
+            lambda spans: score_spans(spans, matches, domain_data["weights"]),
+            model,
+        )
+
+        kept_starts = [start for start, _ in selection.spans]
+        preserved: Set[str] = set()
+        removed: Set[str] = set()
+        for match in matches:
+            index = bisect_right(kept_starts, match.start) - 1
+            if index >= 0 and match.start < selection.spans[index][1]:
+                preserved.add(match.term)
+            else:
+                removed.add(match.term)
+
+        return TrimmingResult(
+            trimmed_text=selection.text,
+            original_tokens=selection.original_tokens,
+            trimmed_tokens=selection.token_count,
+            preserved_terms=sorted(preserved),
+            removed_terms=sorted(removed - preserved),
+            domain=domain,
+            compression_ratio=(
+                selection.token_count / selection.original_tokens
+                if selection.original_tokens
+                else 1.0
+            ),
+            metadata={
+                "timestamp": self._get_timestamp(),
+                "model": model,
+                "max_tokens": max_tokens,
+            },
+        )
+
     def _identify_domain_terms(self, text: str, domain: str) -> Set[str]:
         """Identify domain-specific terms in the text.
 
@@ -177,16 +291,12 @@ class DomainAwareTrimmer:
         domain_data: DomainConfig = self.domains[domain]
         terms: Set[str] = set()
 
-        # Check for exact matches (case-insensitive)
-        for term in domain_data["terms"]:
-            if re.search(re.escape(term), text, re.IGNORECASE):
-                terms.add(term)
-
-        # Check for compound terms
-        for pattern in self.compound_patterns[domain]:
-            matches = pattern.finditer(text)
-            for match in matches:
-                terms.add(match.group())
+        # Find dictionary and compound terms (case-insensitive) in one pass
+        for match in self.term_matchers[domain].iter_matches(text):
+            if match.term in domain_data["terms"]:
+                terms.add(match.term)
+            if match.term in domain_data["compound_terms"]:
+                terms.add(text[match.start : match.end])
 
         # Check for pattern matches
         for pattern in domain_data["preserve_regex"]:
@@ -211,44 +321,57 @@ class DomainAwareTrimmer:
             preserve_ratio (float): Minimum ratio of tokens to preserve.
 
         Returns:
-            List[str]: List of preserved tokens.
+            List[str]: List of preserved tokens, in their original order.
+        """
+        mask = self._preserved_mask(tokens, domain, domain_terms, preserve_ratio)
+        return list(compress(tokens, mask))
+
+    def _preserved_mask(
+        self,
+        tokens: List[str],
+        domain: str,
+        domain_terms: Set[str],
+        preserve_ratio: float,
+    ) -> bytearray:
+        """Decide which token positions to preserve.
+
+        The result is a mask over token positions, so every check is O(1) and
+        trimming is linear in the number of tokens.
+
+        Args:
+            tokens (List[str]): List of tokens to process.
+            domain (str): Domain to use for rules.
+            domain_terms (Set[str]): Set of domain terms to preserve.
+            preserve_ratio (float): Minimum ratio of tokens to preserve.
+
+        Returns:
+            bytearray: 1 at each preserved token position, 0 elsewhere.
         """
         rules: Dict[str, Any] = self.tokenization_rules.get(domain, {})
-        preserved_tokens: List[str] = []
+        mask = bytearray(len(tokens))
+        term_matcher = TermMatcher(domain_terms)
 
         # Calculate minimum tokens to preserve
         min_tokens: int = int(len(tokens) * preserve_ratio)
-        preserved_count: int = 0
 
-        # First pass: preserve domain terms and their context
+        # First pass: preserve domain terms and their immediate context
         for i, token in enumerate(tokens):
-            # Always preserve domain terms and their immediate context
-            if any(term.lower() in token.lower() for term in domain_terms):
-                # Add previous token for context if available
-                if i > 0 and tokens[i - 1] not in preserved_tokens:
-                    preserved_tokens.append(tokens[i - 1])
-                    preserved_count += 1
-
-                # Add the domain term
-                preserved_tokens.append(token)
-                preserved_count += 1
-
-                # Add next token for context if available
-                if i < len(tokens) - 1 and tokens[i + 1] not in preserved_tokens:
-                    preserved_tokens.append(tokens[i + 1])
-                    preserved_count += 1
+            if term_matcher.contains_any(token):
+                start, end = max(i - 1, 0), min(i + 2, len(tokens))
+                mask[start:end] = b"\x01" * (end - start)
+        preserved_count: int = mask.count(1)
 
         # Second pass: apply custom rules
-        for token in tokens:
-            if token not in preserved_tokens and self._apply_custom_rules(token, rules):
-                preserved_tokens.append(token)
+        for i, token in enumerate(tokens):
+            if not mask[i] and self._apply_custom_rules(token, rules):
+                mask[i] = 1
                 preserved_count += 1
 
             # Stop if we've preserved enough tokens
             if preserved_count >= min_tokens:
                 break
 
-        return preserved_tokens
+        return mask
 
     def _apply_custom_rules(self, token: str, rules: Dict[str, Any]) -> bool:
         """Apply custom tokenization rules.
@@ -297,6 +420,8 @@ class DomainAwareTrimmer:
             "remove_patterns": self.domains[domain]["remove_patterns"],
             "metadata": {"timestamp": self._get_timestamp()},
         }
+        if self.domains[domain]["weights"]:
+            data["weights"] = self.domains[domain]["weights"]
 
         if format.lower() == "json":
             return json.dumps(data, indent=2)
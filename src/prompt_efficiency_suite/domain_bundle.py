@@ -0,0 +1,266 @@
+"""Domain Bundle - Precompiled domain dictionaries loaded through mmap.
+
+A bundle is a single binary file holding a domain dictionary in its ready-to-use
+form: the packed term automaton, a weight and kind per term, and the preserve and
+remove pattern sources. Loading one maps the file read-only, so worker processes
+share the same pages and skip parsing and automaton construction entirely.
+
+Layout (native byte order, every array aligned to 8 bytes)::
+
+    magic (4s) | version (H) | reserved (H) | metadata length (I)
+    metadata (UTF-8 JSON: patterns and array offsets)
+    arrays (see ``BUNDLE_ARRAYS``)
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple, Union
+
+import yaml
+
+from .term_matcher import PACKED_ARRAYS, PackedTermMatcher, TermMatcher
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_SUFFIX = ".pesb"
+BUNDLE_MAGIC = b"PESB"
+BUNDLE_VERSION = 1
+
+# Term kinds stored per term.
+TERM = 0
+COMPOUND_TERM = 1
+
+BUNDLE_ARRAYS: Dict[str, str] = {**PACKED_ARRAYS, "weights": "d", "kinds": "B"}
+
+_HEADER = struct.Struct("<4sHHI")
+_ALIGNMENT = 8
+
+
+def read_dictionary(path: Union[str, Path]) -> Dict[str, Any]:
+    """Read a JSON or YAML domain dictionary.
+
+    Args:
+        path: Dictionary file.
+
+    Returns:
+        Dict[str, Any]: Parsed dictionary.
+    """
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix.lower() == ".json":
+            data: Dict[str, Any] = json.load(f)
+        else:
+            data = yaml.safe_load(f) or {}
+    return data
+
+
+def _normalize(data: Mapping[str, Any]) -> Dict[str, Any]:
+    """Bring either dictionary format into one shape.
+
+    Structured dictionaries list ``terms`` and ``compound_terms`` (optionally
+    with a ``weights`` mapping); flat dictionaries map each term to its
+    importance weight.
+    """
+    if isinstance(data.get("terms"), list):
+        weights = data.get("weights", {})
+        terms = {term: float(weights.get(term, 1.0)) for term in data["terms"]}
+        compound_terms = {
+            term: float(weights.get(term, 1.0))
+            for term in data.get("compound_terms", [])
+        }
+        return {
+            "weights": {**compound_terms, **terms},
+            "compound_terms": set(compound_terms) - set(terms),
+            "preserve_patterns": list(data.get("preserve_patterns", [])),
+            "remove_patterns": list(data.get("remove_patterns", [])),
+        }
+    return {
+        "weights": {term: float(weight) for term, weight in data.items()},
+        "compound_terms": set(),
+        "preserve_patterns": [],
+        "remove_patterns": [],
+    }
+
+
+def compile_domain_bundle(
+    source: Union[str, Path, Mapping[str, Any]],
+    destination: Optional[Union[str, Path]] = None,
+) -> Path:
+    """Compile a domain dictionary into a bundle file.
+
+    The bundle is written to a temporary file and renamed into place, so
+    processes loading it concurrently never see a partial file.
+
+    Args:
+        source: Dictionary file (JSON or YAML) or an already parsed dictionary.
+        destination: Bundle path. Defaults to the source path with
+            ``BUNDLE_SUFFIX``; required when ``source`` is a mapping.
+
+    Returns:
+        Path: The written bundle.
+
+    Raises:
+        ValueError: If no destination can be derived.
+    """
+    if isinstance(source, Mapping):
+        if destination is None:
+            raise ValueError("A destination is required for in-memory dictionaries")
+        data = source
+    else:
+        data = read_dictionary(source)
+        if destination is None:
+            destination = Path(source).with_suffix(BUNDLE_SUFFIX)
+    destination = Path(destination)
+
+    dictionary = _normalize(data)
+    matcher = TermMatcher(sorted(dictionary["weights"]))
+    arrays = matcher.pack()
+    arrays["weights"] = array("d", (dictionary["weights"][t] for t in matcher.terms))
+    arrays["kinds"] = array(
+        "B",
+        (
+            COMPOUND_TERM if t in dictionary["compound_terms"] else TERM
+            for t in matcher.terms
+        ),
+    )
+
+    # Lay the arrays out after the metadata; offsets are relative to its end.
+    sections: Dict[str, List[int]] = {}
+    offset = 0
+    for name in BUNDLE_ARRAYS:
+        offset += -offset % _ALIGNMENT
+        sections[name] = [offset, len(arrays[name])]
+        offset += len(arrays[name]) * arrays[name].itemsize
+    metadata = json.dumps(
+        {
+            "byteorder": sys.byteorder,
+            "preserve_patterns": dictionary["preserve_patterns"],
+            "remove_patterns": dictionary["remove_patterns"],
+            "sections": sections,
+        }
+    ).encode("utf-8")
+    metadata += b" " * (-(_HEADER.size + len(metadata)) % _ALIGNMENT)
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=destination.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, 0, len(metadata)))
+            f.write(metadata)
+            written = 0
+            for name in BUNDLE_ARRAYS:
+                start = sections[name][0]
+                f.write(b"\0" * (start - written))
+                f.write(arrays[name].tobytes())
+                written = start + len(arrays[name]) * arrays[name].itemsize
+        os.replace(tmp_path, destination)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    logger.info(f"Compiled {len(matcher)} terms into {destination}")
+    return destination
+
+
+class DomainBundle:
+    """A compiled domain dictionary mapped read-only into memory."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Map a bundle file.
+
+        Args:
+            path: Bundle file written by :func:`compile_domain_bundle`.
+
+        Raises:
+            ValueError: If the file is not a bundle this version can read.
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._views: List[memoryview] = []
+            arrays = self._map_arrays()
+        except Exception:
+            self.close()
+            raise
+
+        self.matcher = PackedTermMatcher(arrays)
+        self.weights: memoryview = arrays["weights"]
+        self.kinds: memoryview = arrays["kinds"]
+
+    def _map_arrays(self) -> Dict[str, memoryview]:
+        """Validate the header and view each array in place."""
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"Not a domain bundle: {self.path}")
+        magic, version, _, metadata_size = _HEADER.unpack_from(self._mmap)
+        if magic != BUNDLE_MAGIC:
+            raise ValueError(f"Not a domain bundle: {self.path}")
+        if version != BUNDLE_VERSION:
+            raise ValueError(f"Unsupported bundle version {version}: {self.path}")
+
+        base = _HEADER.size + metadata_size
+        metadata = json.loads(bytes(self._mmap[_HEADER.size : base]))
+        if metadata["byteorder"] != sys.byteorder:
+            raise ValueError(f"Bundle byte order does not match host: {self.path}")
+        self.preserve_patterns: List[str] = metadata["preserve_patterns"]
+        self.remove_patterns: List[str] = metadata["remove_patterns"]
+
+        buffer = memoryview(self._mmap)
+        self._views.append(buffer)
+        arrays = {}
+        for name, typecode in BUNDLE_ARRAYS.items():
+            offset, length = metadata["sections"][name]
+            size = array(typecode).itemsize
+            section = buffer[base + offset : base + offset + length * size]
+            # Typecodes come from BUNDLE_ARRAYS, so the format is always valid.
+            view = section.cast(typecode)  # type: ignore[call-overload]
+            self._views.append(view)
+            arrays[name] = view
+        return arrays
+
+    @property
+    def terms(self) -> List[str]:
+        """Dictionary terms, in bundle order."""
+        return self.matcher.terms
+
+    def importance(self) -> Dict[str, float]:
+        """Get the weight of every term.
+
+        Returns:
+            Dict[str, float]: Term weights.
+        """
+        return dict(zip(self.terms, self.weights.tolist()))
+
+    def term_sets(self) -> Tuple[Set[str], Set[str]]:
+        """Split the terms by kind.
+
+        Returns:
+            Tuple[Set[str], Set[str]]: Plain terms and compound terms.
+        """
+        terms: Set[str] = set()
+        compound_terms: Set[str] = set()
+        for term, kind in zip(self.terms, self.kinds):
+            (compound_terms if kind == COMPOUND_TERM else terms).add(term)
+        return terms, compound_terms
+
+    def close(self) -> None:
+        """Unmap the file. The bundle's matcher is unusable afterwards."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self) -> "DomainBundle":
+        """Enter a context that unmaps the bundle on exit."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Unmap the bundle."""
+        self.close()
@@ -0,0 +1,250 @@
+"""History - Bounded result histories with streaming aggregates."""
+
+import dataclasses
+import json
+import logging
+import math
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_CAPACITY = 1000
+
+T = TypeVar("T")
+
+
+@dataclass
+class RunningStats:
+    """Streaming count, sum, min, max, mean and variance (Welford's method)."""
+
+    count: int = 0
+    total: float = 0.0
+    mean: float = 0.0
+    m2: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+
+    def add(self, value: float) -> None:
+        """Add a value to the aggregate.
+
+        Args:
+            value (float): Value to add.
+        """
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the values seen so far."""
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def stddev(self) -> float:
+        """Population standard deviation of the values seen so far."""
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> Dict[str, float]:
+        """Convert the aggregate to a dictionary.
+
+        Returns:
+            Dict[str, float]: Aggregate values.
+        """
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "variance": self.variance,
+            "min": self.minimum if self.count else 0.0,
+            "max": self.maximum if self.count else 0.0,
+        }
+
+
+def to_record(item: Any) -> Any:
+    """Convert a result into a JSON-serializable record.
+
+    Dataclasses become dicts and pydantic models are dumped in JSON mode; other
+    values are returned unchanged. Shared by history spill files, streaming
+    output and checkpoint journals.
+
+    Args:
+        item: Result to convert.
+
+    Returns:
+        Any: The record.
+    """
+    if dataclasses.is_dataclass(item) and not isinstance(item, type):
+        return dataclasses.asdict(item)
+    if hasattr(item, "model_dump"):
+        return item.model_dump(mode="json")
+    return item
+
+
+class BoundedHistory(Generic[T]):
+    """A fixed-capacity ring buffer of recent results plus running aggregates.
+
+    Only the most recent ``capacity`` items are kept in memory. Numeric fields
+    registered in ``metrics`` and keys registered in ``tallies`` are aggregated
+    over every item ever appended, so statistics are O(1) regardless of how long
+    the process has been running. Counts registered in ``window_tallies`` cover
+    only the retained items and are decremented as items are evicted. When
+    ``spill_path`` is set, every item is also appended to a JSONL file as a full
+    audit trail.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_HISTORY_CAPACITY,
+        metrics: Optional[Dict[str, Callable[[T], float]]] = None,
+        tallies: Optional[Dict[str, Callable[[T], Iterable[str]]]] = None,
+        window_tallies: Optional[Dict[str, Callable[[T], Mapping[str, int]]]] = None,
+        spill_path: Optional[Union[str, Path]] = None,
+        serializer: Callable[[T], Any] = to_record,
+    ) -> None:
+        """Initialize the history.
+
+        Args:
+            capacity: Number of recent items kept in memory.
+            metrics: Named extractors for numeric fields to aggregate.
+            tallies: Named extractors returning keys to count (e.g. model names).
+            window_tallies: Named extractors returning counts to tally over the
+                retained items only.
+            spill_path: Optional JSONL file every item is appended to.
+            serializer: Converts an item into a JSON-serializable record.
+        """
+        self.capacity = capacity
+        self.items: Deque[T] = deque(maxlen=capacity)
+        self.total = 0
+        self._metric_fns = metrics or {}
+        self._tally_fns = tallies or {}
+        self._window_tally_fns = window_tallies or {}
+        self.metrics: Dict[str, RunningStats] = {
+            name: RunningStats() for name in self._metric_fns
+        }
+        self.tallies: Dict[str, Counter[str]] = {
+            name: Counter() for name in self._tally_fns
+        }
+        self.window_tallies: Dict[str, Counter[str]] = {
+            name: Counter() for name in self._window_tally_fns
+        }
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.serializer = serializer
+        self._spill_file: Optional[IO[str]] = None
+        self._lock = threading.Lock()
+
+    def append(self, item: T, spill_record: Any = None) -> None:
+        """Record an item.
+
+        Args:
+            item: Item to record.
+            spill_record: Record written to the spill file instead of the
+                serialized item, e.g. one carrying data not kept in memory.
+        """
+        with self._lock:
+            if self.items and len(self.items) == self.items.maxlen:
+                self._untally(self.items[0])
+            self.items.append(item)
+            self.total += 1
+            for name, metric_fn in self._metric_fns.items():
+                self.metrics[name].add(metric_fn(item))
+            for name, tally_fn in self._tally_fns.items():
+                self.tallies[name].update(tally_fn(item))
+            for name, window_fn in self._window_tally_fns.items():
+                self.window_tallies[name].update(window_fn(item))
+            if self.spill_path is not None:
+                self._spill(item, spill_record)
+
+    def extend(self, items: Iterable[T]) -> None:
+        """Record several items.
+
+        Args:
+            items: Items to record.
+        """
+        for item in items:
+            self.append(item)
+
+    def mean(self, name: str) -> float:
+        """Mean of a registered metric over all recorded items."""
+        return self.metrics[name].mean
+
+    def sum(self, name: str) -> float:
+        """Sum of a registered metric over all recorded items."""
+        return self.metrics[name].total
+
+    def clear(self) -> None:
+        """Drop retained items and reset all aggregates."""
+        with self._lock:
+            self.items.clear()
+            self.total = 0
+            self.metrics = {name: RunningStats() for name in self._metric_fns}
+            self.tallies = {name: Counter() for name in self._tally_fns}
+            self.window_tallies = {name: Counter() for name in self._window_tally_fns}
+
+    def close(self) -> None:
+        """Close the spill file, if one is open."""
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+
+    def _untally(self, item: T) -> None:
+        """Remove an item that is about to be evicted from the window tallies."""
+        for name, window_fn in self._window_tally_fns.items():
+            tally = self.window_tallies[name]
+            for key, count in window_fn(item).items():
+                remaining = tally[key] - count
+                if remaining > 0:
+                    tally[key] = remaining
+                else:
+                    del tally[key]
+
+    def _spill(self, item: T, record: Any = None) -> None:
+        """Append an item, or the record standing in for it, to the spill file."""
+        spill_path = self.spill_path
+        assert spill_path is not None
+        try:
+            if record is None:
+                record = self.serializer(item)
+            if self._spill_file is None:
+                spill_path.parent.mkdir(parents=True, exist_ok=True)
+                self._spill_file = open(spill_path, "a", encoding="utf-8", buffering=1)
+            self._spill_file.write(json.dumps(record, default=str) + "\n")
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to spill history item to {spill_path}: {e}")
+
+    def __len__(self) -> int:
+        """Number of items retained in memory."""
+        return len(self.items)
+
+    def __bool__(self) -> bool:
+        """Whether anything has been recorded since the last clear."""
+        return self.total > 0
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate over retained items, oldest first."""
+        return iter(self.items)
+
+    def __getitem__(self, index: int) -> T:
+        """Get a retained item by position."""
+        return self.items[index]
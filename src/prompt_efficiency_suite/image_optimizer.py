@@ -0,0 +1,378 @@
+"""Image Optimizer - Downscale and re-encode images to cut multimodal token costs."""
+
+import io
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMAGE_MODEL = "gpt-4o"
+DEFAULT_QUALITY = 80
+MIN_QUALITY = 30
+MAX_QUALITY = 95
+
+# Fraction of a dimension that may be given up to avoid starting another tile.
+DEFAULT_TILE_SNAP = 0.1
+
+# How far each retry shrinks an image that misses its byte budget at MIN_QUALITY.
+_BUDGET_SHRINK = 0.75
+
+
+@dataclass(frozen=True)
+class ImageTokenModel:
+    """How a model resizes images and prices them in tokens.
+
+    Tiled models fit the image in ``max_box``, shrink its short side to
+    ``max_short_side``, and charge ``base_tokens`` plus ``tile_tokens`` per
+    ``tile_size`` tile. Area-priced models (``tile_size`` of 0) cap the long
+    edge and total pixels, and charge one token per ``pixels_per_token``.
+    """
+
+    tile_size: int = 0
+    base_tokens: int = 0
+    tile_tokens: int = 0
+    max_box: int = 0
+    max_short_side: int = 0
+    pixels_per_token: int = 0
+    max_long_edge: int = 0
+    max_pixels: int = 0
+
+
+# Model name prefixes mapped to their image pricing. Longer prefixes win.
+IMAGE_TOKEN_MODELS: Dict[str, ImageTokenModel] = {
+    "gpt-4o-mini": ImageTokenModel(
+        tile_size=512,
+        base_tokens=2833,
+        tile_tokens=5667,
+        max_box=2048,
+        max_short_side=768,
+    ),
+    "gpt-4o": ImageTokenModel(
+        tile_size=512, base_tokens=85, tile_tokens=170, max_box=2048, max_short_side=768
+    ),
+    "gpt-4": ImageTokenModel(
+        tile_size=512, base_tokens=85, tile_tokens=170, max_box=2048, max_short_side=768
+    ),
+    "o1": ImageTokenModel(
+        tile_size=512, base_tokens=75, tile_tokens=150, max_box=2048, max_short_side=768
+    ),
+    "claude": ImageTokenModel(
+        pixels_per_token=750, max_long_edge=1568, max_pixels=1_150_000
+    ),
+}
+
+
+def get_image_token_model(model: str) -> ImageTokenModel:
+    """Look up a model's image pricing, defaulting to ``DEFAULT_IMAGE_MODEL``.
+
+    Args:
+        model: Model name.
+
+    Returns:
+        ImageTokenModel: The model's image pricing.
+    """
+    for prefix in sorted(IMAGE_TOKEN_MODELS, key=len, reverse=True):
+        if model.startswith(prefix):
+            return IMAGE_TOKEN_MODELS[prefix]
+    return IMAGE_TOKEN_MODELS[DEFAULT_IMAGE_MODEL]
+
+
+def model_dimensions(width: int, height: int, model: str) -> Tuple[int, int]:
+    """Get the size a model scales an image to before tokenizing it.
+
+    Args:
+        width: Image width in pixels.
+        height: Image height in pixels.
+        model: Model name.
+
+    Returns:
+        Tuple[int, int]: Width and height as seen by the model.
+    """
+    pricing = get_image_token_model(model)
+    scale = 1.0
+    if pricing.tile_size:
+        scale = min(scale, pricing.max_box / max(width, height))
+        short_side = min(width, height) * scale
+        if short_side > pricing.max_short_side:
+            scale *= pricing.max_short_side / short_side
+    else:
+        scale = min(scale, pricing.max_long_edge / max(width, height))
+        scale = min(scale, math.sqrt(pricing.max_pixels / (width * height)))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def estimate_image_tokens(width: int, height: int, model: str) -> int:
+    """Estimate the tokens a model charges for an image.
+
+    Args:
+        width: Image width in pixels.
+        height: Image height in pixels.
+        model: Model name.
+
+    Returns:
+        int: Estimated image tokens.
+    """
+    pricing = get_image_token_model(model)
+    width, height = model_dimensions(width, height, model)
+    if pricing.tile_size:
+        tiles = math.ceil(width / pricing.tile_size) * math.ceil(
+            height / pricing.tile_size
+        )
+        return pricing.base_tokens + pricing.tile_tokens * tiles
+    return math.ceil(width * height / pricing.pixels_per_token)
+
+
+@dataclass
+class OptimizedImage:
+    """Result of optimizing one image."""
+
+    data: bytes
+    format: str
+    width: int
+    height: int
+    original_format: str
+    original_size: int
+    original_dimensions: Tuple[int, int]
+    original_tokens: int
+    tokens: int
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        """Encoded size in bytes."""
+        return len(self.data)
+
+    @property
+    def tokens_saved(self) -> int:
+        """Estimated image tokens saved."""
+        return self.original_tokens - self.tokens
+
+    @property
+    def mime_type(self) -> str:
+        """MIME type of the encoded image."""
+        return Image.MIME.get(self.format.upper(), f"image/{self.format}")
+
+
+class ImageOptimizer:
+    """Resizes and re-encodes images for a target model's image pricing.
+
+    Images are first shrunk to the size the model would scale them to anyway
+    (which saves bytes but not tokens), then snapped down onto the model's
+    tile grid when only a sliver of a tile would otherwise be paid for, and
+    optionally shrunk further to meet a token budget. They are re-encoded
+    without EXIF, lossy unless ``lossless`` is set, at the highest quality that
+    fits ``max_bytes``. Pillow releases the GIL while resizing and encoding,
+    so ``optimize_many`` runs images on a thread pool.
+    """
+
+    def __init__(
+        self,
+        model: str = DEFAULT_IMAGE_MODEL,
+        max_bytes: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        lossless: bool = False,
+        formats: Sequence[str] = ("webp", "jpeg"),
+        quality: int = DEFAULT_QUALITY,
+        tile_snap: float = DEFAULT_TILE_SNAP,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        """Initialize the optimizer.
+
+        Args:
+            model: Model whose image pricing guides resizing.
+            max_bytes: Byte budget per encoded image.
+            max_tokens: Image token budget per image.
+            lossless: Keep images lossless (PNG) instead of converting them.
+            formats: Lossy output formats, in order of preference. JPEG is
+                skipped for images with transparency.
+            quality: Encoder quality used when there is no byte budget.
+            tile_snap: Largest fraction of width or height dropped to avoid
+                paying for a partially used tile.
+            max_workers: Threads used by ``optimize_many``.
+        """
+        self.model = model
+        self.max_bytes = max_bytes
+        self.max_tokens = max_tokens
+        self.lossless = lossless
+        self.formats = tuple(f.lower() for f in formats)
+        self.quality = quality
+        self.tile_snap = tile_snap
+        self.max_workers = max_workers
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ImageOptimizer":
+        """Create an optimizer from an ``image_optimization`` config block.
+
+        Args:
+            config: Mapping of constructor arguments.
+
+        Returns:
+            ImageOptimizer: The configured optimizer.
+        """
+        return cls(**config)
+
+    def optimize(self, data: bytes) -> OptimizedImage:
+        """Optimize one encoded image.
+
+        Args:
+            data: Encoded image bytes.
+
+        Returns:
+            OptimizedImage: The smaller encoding, or the original bytes when
+            re-encoding would not make the image smaller or cheaper.
+
+        Raises:
+            ValueError: If the data is not an image Pillow can read.
+        """
+        image: Image.Image
+        try:
+            image = Image.open(io.BytesIO(data))
+            image.load()
+        except (OSError, Image.DecompressionBombError) as e:
+            raise ValueError(f"Unreadable image: {e}") from e
+
+        original_format = (image.format or "unknown").lower()
+        original_dimensions = image.size
+        original_tokens = estimate_image_tokens(*image.size, self.model)
+
+        image = ImageOps.exif_transpose(image)
+        image = image.resize(self._target_size(*image.size), Image.Resampling.LANCZOS)
+        encoded, fmt, image = self._encode(image)
+
+        result = OptimizedImage(
+            data=encoded,
+            format=fmt,
+            width=image.width,
+            height=image.height,
+            original_format=original_format,
+            original_size=len(data),
+            original_dimensions=original_dimensions,
+            original_tokens=original_tokens,
+            tokens=estimate_image_tokens(image.width, image.height, self.model),
+        )
+        if result.size >= len(data) and result.tokens >= original_tokens:
+            # Re-encoding did not help; keep the original untouched.
+            result.data = data
+            result.format = original_format
+            result.width, result.height = original_dimensions
+            result.tokens = original_tokens
+            result.metadata["unchanged"] = True
+        return result
+
+    def optimize_many(self, images: Iterable[bytes]) -> List[Optional[OptimizedImage]]:
+        """Optimize several images concurrently.
+
+        Args:
+            images: Encoded images.
+
+        Returns:
+            List[Optional[OptimizedImage]]: Results in input order, with None for
+            images that could not be read.
+        """
+        images = list(images)
+        if len(images) <= 1:
+            return [self._try_optimize(data) for data in images]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self._try_optimize, images))
+
+    def _try_optimize(self, data: bytes) -> Optional[OptimizedImage]:
+        """Optimize one image, logging instead of raising if it is unreadable."""
+        try:
+            return self.optimize(data)
+        except ValueError as e:
+            logger.warning(f"Skipping image optimization: {e}")
+            return None
+
+    def _target_size(self, width: int, height: int) -> Tuple[int, int]:
+        """Choose output dimensions for the model's pricing and token budget."""
+        pricing = get_image_token_model(self.model)
+        width, height = model_dimensions(width, height, self.model)
+
+        if pricing.tile_size:
+            width, height = self._snap_to_tiles(width, height, pricing.tile_size)
+
+        if self.max_tokens is not None:
+            while (
+                estimate_image_tokens(width, height, self.model) > self.max_tokens
+                and min(width, height) > 1
+            ):
+                if pricing.tile_size:
+                    # Drop one row or column of tiles along the longer side.
+                    long_side = max(width, height)
+                    tiles = math.ceil(long_side / pricing.tile_size)
+                    if tiles <= 1:
+                        break
+                    scale = (tiles - 1) * pricing.tile_size / long_side
+                else:
+                    scale = math.sqrt(
+                        self.max_tokens * pricing.pixels_per_token / (width * height)
+                    )
+                width = max(1, int(width * scale))
+                height = max(1, int(height * scale))
+        return width, height
+
+    def _snap_to_tiles(self, width: int, height: int, tile: int) -> Tuple[int, int]:
+        """Shrink slightly so neither side just spills into another tile."""
+        scale = 1.0
+        for side in (width, height):
+            snapped = side // tile * tile
+            if snapped and snapped < side and 1 - snapped / side <= self.tile_snap:
+                scale = min(scale, snapped / side)
+        return max(1, int(width * scale)), max(1, int(height * scale))
+
+    def _encode(self, image: Image.Image) -> Tuple[bytes, str, Image.Image]:
+        """Encode an image, meeting the byte budget if one is set."""
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or (
+            image.mode == "P" and "transparency" in image.info
+        )
+        if self.lossless:
+            fmt = "png"
+        else:
+            fmt = next(
+                (f for f in self.formats if not (f == "jpeg" and has_alpha)), "png"
+            )
+        if fmt == "jpeg":
+            image = image.convert("RGB")
+        elif has_alpha and image.mode != "RGBA":
+            image = image.convert("RGBA")
+        elif image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGB")
+
+        if fmt == "png" or self.max_bytes is None:
+            return self._save(image, fmt, self.quality), fmt, image
+
+        # Highest quality that fits, shrinking the image if none does.
+        while True:
+            low, high, best = MIN_QUALITY, MAX_QUALITY, None
+            while low <= high:
+                quality = (low + high) // 2
+                data = self._save(image, fmt, quality)
+                if len(data) <= self.max_bytes:
+                    best, low = data, quality + 1
+                else:
+                    high = quality - 1
+            if best is not None or min(image.size) <= 1:
+                return best or data, fmt, image
+            size = (
+                max(1, int(image.width * _BUDGET_SHRINK)),
+                max(1, int(image.height * _BUDGET_SHRINK)),
+            )
+            image = image.resize(size, Image.Resampling.LANCZOS)
+
+    def _save(self, image: Image.Image, fmt: str, quality: int) -> bytes:
+        """Encode an image without metadata."""
+        buffer = io.BytesIO()
+        if fmt == "png":
+            image.save(buffer, format="PNG", optimize=True)
+        elif fmt == "jpeg":
+            image.save(
+                buffer, format="JPEG", quality=quality, optimize=True, progressive=True
+            )
+        else:
+            image.save(buffer, format=fmt.upper(), quality=quality, method=4)
+        return buffer.getvalue()
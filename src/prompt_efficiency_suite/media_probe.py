@@ -0,0 +1,169 @@
+"""Media Probe - Size and header metadata for base64 media without decoding it all."""
+
+import base64
+import binascii
+import logging
+import struct
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Base64 characters decoded first when sniffing a header (384 bytes).
+HEADER_PREFIX_CHARS = 512
+
+# Upper bound on decoded header bytes, for JPEGs with large EXIF/ICC segments.
+MAX_HEADER_BYTES = 64 * 1024
+
+# JPEG start-of-frame markers (SOF0-SOF15 minus DHT, JPG and DAC).
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+@dataclass(frozen=True)
+class ImageHeader:
+    """Format and pixel dimensions read from the start of an image file."""
+
+    format: str
+    width: int
+    height: int
+
+    @property
+    def dimensions(self) -> Tuple[int, int]:
+        """Width and height in pixels."""
+        return self.width, self.height
+
+
+def base64_decoded_size(text: str, start: int, end: int) -> Optional[int]:
+    """Compute the decoded size of a base64 payload from its length and padding.
+
+    Args:
+        text: Text containing the payload.
+        start: Offset of the first payload character.
+        end: Offset just past the last payload character.
+
+    Returns:
+        Optional[int]: Decoded size in bytes, or None if the payload is not
+        correctly padded base64.
+    """
+    length = end - start
+    if length % 4:
+        return None
+    padding = 0
+    while padding < 2 and length > padding and text[end - 1 - padding] == "=":
+        padding += 1
+    if text.find("=", start, end - padding) != -1:
+        return None
+    return length // 4 * 3 - padding
+
+
+def decode_base64_prefix(text: str, start: int, end: int, size: int) -> bytes:
+    """Decode roughly the first ``size`` bytes of a base64 payload.
+
+    Args:
+        text: Text containing the payload.
+        start: Offset of the first payload character.
+        end: Offset just past the last payload character.
+        size: Number of decoded bytes wanted.
+
+    Returns:
+        bytes: Up to ``size`` decoded bytes (empty if the prefix is invalid).
+    """
+    chars = min(end - start, -(-size // 3) * 4)
+    chars -= chars % 4
+    try:
+        return base64.b64decode(text[start : start + chars])
+    except (binascii.Error, ValueError):
+        return b""
+
+
+def probe_image_header(data: bytes) -> Optional[ImageHeader]:
+    """Read the format and dimensions from the leading bytes of an image.
+
+    Supports PNG, GIF, JPEG, WebP and BMP.
+
+    Args:
+        data: Leading bytes of the file.
+
+    Returns:
+        Optional[ImageHeader]: The header, or None if the format is unknown or
+        ``data`` ends before the dimensions.
+    """
+    if data.startswith(b"\x89PNG\r\n\x1a\n") and len(data) >= 24:
+        width, height = struct.unpack(">II", data[16:24])
+        return ImageHeader("png", width, height)
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        width, height = struct.unpack("<HH", data[6:10])
+        return ImageHeader("gif", width, height)
+    if data.startswith(b"\xff\xd8"):
+        return _probe_jpeg(data)
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return _probe_webp(data)
+    if data.startswith(b"BM") and len(data) >= 26:
+        width, height = struct.unpack("<ii", data[18:26])
+        return ImageHeader("bmp", width, abs(height))
+    return None
+
+
+def _probe_jpeg(data: bytes) -> Optional[ImageHeader]:
+    """Walk JPEG segments up to the start-of-frame marker."""
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:  # fill byte
+            offset += 1
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            if offset + 9 > len(data):
+                return None
+            height, width = struct.unpack(">HH", data[offset + 5 : offset + 9])
+            return ImageHeader("jpeg", width, height)
+        (length,) = struct.unpack(">H", data[offset + 2 : offset + 4])
+        offset += 2 + length
+    return None
+
+
+def _probe_webp(data: bytes) -> Optional[ImageHeader]:
+    """Read dimensions from the first WebP chunk."""
+    chunk = data[12:16]
+    if chunk == b"VP8 " and len(data) >= 30:
+        width, height = struct.unpack("<HH", data[26:30])
+        return ImageHeader("webp", width & 0x3FFF, height & 0x3FFF)
+    if chunk == b"VP8L" and len(data) >= 25:
+        bits = int.from_bytes(data[21:25], "little")
+        return ImageHeader("webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+    if chunk == b"VP8X" and len(data) >= 30:
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+        return ImageHeader("webp", width, height)
+    return None
+
+
+def probe_base64_image(text: str, start: int, end: int) -> Optional[ImageHeader]:
+    """Read an image header from a base64 payload, decoding only a prefix.
+
+    The prefix starts at ``HEADER_PREFIX_CHARS`` and doubles (up to
+    ``MAX_HEADER_BYTES`` decoded bytes) while the header is incomplete, which
+    only happens for JPEGs carrying large metadata segments.
+
+    Args:
+        text: Text containing the payload.
+        start: Offset of the first payload character.
+        end: Offset just past the last payload character.
+
+    Returns:
+        Optional[ImageHeader]: The header, or None if it cannot be read.
+    """
+    size = HEADER_PREFIX_CHARS // 4 * 3
+    while True:
+        data = decode_base64_prefix(text, start, end, size)
+        header = probe_image_header(data)
+        if (
+            header is not None
+            or not data.startswith(b"\xff\xd8")
+            or size >= MAX_HEADER_BYTES
+            or len(data) < size
+        ):
+            return header
+        size *= 2
@@ -2,10 +2,14 @@
 
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 from pydantic import BaseModel, Field
 
+from .columnar import DEFAULT_PERCENTILES, DEFAULT_STORE_CAPACITY, ColumnarStore
+from .history import DEFAULT_HISTORY_CAPACITY, BoundedHistory
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,9 +31,37 @@ class EfficiencyMetrics(BaseModel):
 class MetricsTracker:
     """Tracks and stores efficiency metrics for prompts."""
 
-    def __init__(self) -> None:
-        """Initialize the metrics tracker."""
-        self.metrics_history: List[EfficiencyMetrics] = []
+    def __init__(
+        self,
+        history_size: int = DEFAULT_HISTORY_CAPACITY,
+        history_path: Optional[Path] = None,
+        store_size: Optional[int] = DEFAULT_STORE_CAPACITY,
+    ) -> None:
+        """Initialize the metrics tracker.
+
+        Args:
+            history_size: Number of recent metrics kept in memory
+            history_path: Optional JSONL file receiving every metrics record
+            store_size: Number of recent rows kept for distributions and
+                group-bys (None for no limit)
+        """
+        self.metrics_history: BoundedHistory[EfficiencyMetrics] = BoundedHistory(
+            capacity=history_size, spill_path=history_path
+        )
+        self.metrics_store: ColumnarStore[EfficiencyMetrics] = ColumnarStore(
+            columns={
+                "token_count": lambda m: m.token_count,
+                "cost": lambda m: m.cost,
+                "latency": lambda m: m.latency,
+                "success_rate": lambda m: m.success_rate,
+                "quality_score": lambda m: m.quality_score,
+            },
+            groups={
+                "model": lambda m: str(m.metadata.get("model") or "unknown"),
+                "domain": lambda m: str(m.metadata.get("domain") or "unknown"),
+            },
+            capacity=store_size,
+        )
 
     def add_metrics(self, metrics: EfficiencyMetrics) -> None:
         """Add new metrics to the history.
@@ -38,9 +70,10 @@ class MetricsTracker:
             metrics: The efficiency metrics to add
         """
         self.metrics_history.append(metrics)
+        self.metrics_store.append(metrics)
 
     def get_metrics_by_id(self, prompt_id: str) -> List[EfficiencyMetrics]:
-        """Get all metrics for a specific prompt ID.
+        """Get the retained metrics for a specific prompt ID.
 
         Args:
             prompt_id: The ID of the prompt to get metrics for
@@ -56,19 +89,8 @@ class MetricsTracker:
         Returns:
             Dictionary containing average values for each metric
         """
-        if not self.metrics_history:
-            return {}
-
-        total_metrics = len(self.metrics_history)
         return {
-            "avg_token_count": sum(m.token_count for m in self.metrics_history)
-            / total_metrics,
-            "avg_cost": sum(m.cost for m in self.metrics_history) / total_metrics,
-            "avg_latency": sum(m.latency for m in self.metrics_history) / total_metrics,
-            "avg_success_rate": sum(m.success_rate for m in self.metrics_history)
-            / total_metrics,
-            "avg_quality_score": sum(m.quality_score for m in self.metrics_history)
-            / total_metrics,
+            f"avg_{name}": value for name, value in self.metrics_store.means().items()
         }
 
     def get_metrics_summary(self) -> Dict[str, Union[float, int]]:
@@ -77,18 +99,64 @@ class MetricsTracker:
         Returns:
             Dictionary containing summary statistics
         """
-        if not self.metrics_history:
+        store = self.metrics_store
+        if not store.total:
             return {}
 
         return {
-            "total_prompts": len(self.metrics_history),
-            "total_tokens": sum(m.token_count for m in self.metrics_history),
-            "total_cost": sum(m.cost for m in self.metrics_history),
-            "min_latency": min(m.latency for m in self.metrics_history),
-            "max_latency": max(m.latency for m in self.metrics_history),
-            "avg_success_rate": sum(m.success_rate for m in self.metrics_history)
-            / len(self.metrics_history),
+            "total_prompts": store.total,
+            "total_tokens": int(store.sum("token_count")),
+            "total_cost": store.sum("cost"),
+            "min_latency": store.minimum("latency"),
+            "max_latency": store.maximum("latency"),
+            "avg_success_rate": store.mean("success_rate"),
+        }
+
+    def get_metric_distribution(
+        self,
+        metric: str,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        bins: int = 10,
+    ) -> Dict[str, Any]:
+        """Get the distribution of a metric across the most recent data.
+
+        Args:
+            metric: Metric name (e.g. "latency")
+            percentiles: Percentiles to include in the summary
+            bins: Number of histogram bins
+
+        Returns:
+            Dictionary containing summary statistics and a histogram
+        """
+        if not len(self.metrics_store):
+            return {}
+
+        return {
+            "summary": self.metrics_store.describe(metric, percentiles),
+            "histogram": self.metrics_store.histogram(metric, bins),
+        }
+
+    def get_metrics_by_group(self, by: str = "model") -> Dict[str, Dict[str, float]]:
+        """Get average metrics per model or domain.
+
+        Groups are read from the "model" and "domain" metadata keys, over the
+        store's most recent rows.
+
+        Args:
+            by: Group name ("model" or "domain")
+
+        Returns:
+            Dictionary mapping each group key to its average metrics
+        """
+        store = self.metrics_store
+        counts = store.group_counts(by)
+        grouped: Dict[str, Dict[str, float]] = {
+            key: {"count": count} for key, count in counts.items()
         }
+        for name in store.columns:
+            for key, value in store.group_means(name, by).items():
+                grouped[key][f"avg_{name}"] = value
+        return grouped
 
 
 class Metrics:
@@ -9,6 +9,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, TypedDict, Union
 
+from .protected_spans import CODE_KINDS, ProtectedSpanIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -367,18 +369,32 @@ class ModelTranslator:
                 adapted_message = message
 
                 if style_patterns.get("remove_redundant", False):
-                    # Remove redundant words and phrases
-                    for pattern, replacement in style_patterns.get(
-                        "replace_with", {}
-                    ).items():
-                        adapted_message = re.sub(
-                            pattern, replacement, adapted_message, flags=re.IGNORECASE
-                        )
+                    # Remove redundant words and phrases outside of code
+                    replacements = style_patterns.get("replace_with", {})
+                    adapted_message = ProtectedSpanIndex(
+                        message, kinds=CODE_KINDS
+                    ).transform_gaps(
+                        lambda text: self._apply_replacements(text, replacements)
+                    )
 
                 adapted_components[role].append(adapted_message)
 
         return adapted_components
 
+    def _apply_replacements(self, text: str, replacements: Dict[str, str]) -> str:
+        """Apply style replacement patterns to text.
+
+        Args:
+            text (str): Text to adapt.
+            replacements (Dict[str, str]): Mapping of patterns to replacements.
+
+        Returns:
+            str: Adapted text.
+        """
+        for pattern, replacement in replacements.items():
+            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        return text
+
     def _generate_prompt(
         self, components: Dict[str, List[str]], template: FormatTemplate
     ) -> str:
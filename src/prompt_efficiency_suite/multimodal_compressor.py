@@ -1,16 +1,26 @@
 """Multimodal Compressor - A module for compressing multimodal prompts while preserving media content."""
 
 import base64
+import binascii
 import json
 import logging
 import re
-from collections import defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .history import DEFAULT_HISTORY_CAPACITY, BoundedHistory
+from .image_optimizer import ImageOptimizer
+from .media_probe import base64_decoded_size, probe_base64_image
+from .protected_spans import ProtectedSpan, ProtectedSpanIndex
 
 logger = logging.getLogger(__name__)
 
+_DATA_URI_PREFIX = re.compile(r"data:image/([^;]+);base64,")
+_IMAGE_URL_EXTENSION = re.compile(
+    r"\.(png|jpg|jpeg|gif|webp)(?:[?#][^)\s]*)?\)$", re.IGNORECASE
+)
+
 
 @dataclass
 class MediaInfo:
@@ -36,6 +46,41 @@ class CompressionResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class CompressionRecord:
+    """History entry for one compression, without the prompt texts.
+
+    Multimodal prompts can carry megabytes of inline image data, so the history
+    keeps text lengths rather than the texts themselves.
+    """
+
+    original_length: int
+    compressed_length: int
+    compression_ratio: float
+    preserved_media: List[MediaInfo]
+    removed_tokens: List[str]
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_result(cls, result: CompressionResult) -> "CompressionRecord":
+        """Summarize a compression result.
+
+        Args:
+            result (CompressionResult): Result to summarize.
+
+        Returns:
+            CompressionRecord: The result without its texts.
+        """
+        return cls(
+            original_length=len(result.original_text),
+            compressed_length=len(result.compressed_text),
+            compression_ratio=result.compression_ratio,
+            preserved_media=result.preserved_media,
+            removed_tokens=result.removed_tokens,
+            metadata=result.metadata,
+        )
+
+
 class MultimodalCompressor:
     """A class for compressing multimodal prompts."""
 
@@ -43,11 +88,28 @@ class MultimodalCompressor:
         """Initialize the MultimodalCompressor.
 
         Args:
-            config (Optional[Dict[str, Any]]): Configuration parameters.
+            config (Optional[Dict[str, Any]]): Configuration parameters. Supports
+                'history_size' and 'history_path' to bound and spill the history,
+                and 'image_optimization' (ImageOptimizer arguments) to resize
+                and re-encode base64 images.
         """
         self.config = config or {}
         self.media_patterns = self._load_media_patterns()
-        self.compression_history: List[CompressionResult] = []
+        self.image_optimizer = self._make_image_optimizer(
+            self.config.get("image_optimization")
+        )
+        self.compression_history: BoundedHistory[CompressionRecord] = BoundedHistory(
+            capacity=self.config.get("history_size", DEFAULT_HISTORY_CAPACITY),
+            metrics={
+                "compression_ratio": lambda r: r.compression_ratio,
+                "media_count": lambda r: len(r.preserved_media),
+                "image_tokens_saved": lambda r: r.metadata.get("image_tokens_saved", 0),
+            },
+            tallies={
+                "media_types": lambda r: [m.media_type for m in r.preserved_media]
+            },
+            spill_path=self.config.get("history_path"),
+        )
 
     def compress(
         self, text: str, compression_params: Optional[Dict[str, Any]] = None
@@ -56,46 +118,59 @@ class MultimodalCompressor:
 
         Args:
             text (str): Text to compress.
-            compression_params (Optional[Dict[str, Any]]): Additional compression parameters.
+            compression_params (Optional[Dict[str, Any]]): Additional compression
+                parameters. 'image_optimization' overrides the configured image
+                optimizer for this call (False disables it).
 
         Returns:
             CompressionResult: Result of compression.
         """
         params = compression_params or {}
 
-        # Extract media elements
-        media_elements = self._extract_media_elements(text)
-
-        # Replace media elements with placeholders
-        text_with_placeholders = text
-        for i, (media_text, media_info) in enumerate(media_elements):
-            placeholder = f"MEDIA_{i}"
-            text_with_placeholders = text_with_placeholders.replace(
-                media_text, placeholder
+        # Index media spans in one scan and compress only the text between
+        # them; media is never copied out of the input except into the output.
+        index = self._index_media(text)
+        media = list(self._iter_media(index))
+        preserved_media = [info for _, info in media]
+
+        optimizer = self.image_optimizer
+        if "image_optimization" in params:
+            optimizer = self._make_image_optimizer(params["image_optimization"])
+        replacements: Dict[ProtectedSpan, str] = {}
+        image_tokens_saved = 0
+        if optimizer is not None:
+            replacements, image_tokens_saved = self._optimize_images(
+                text, media, optimizer
             )
+        original_tokens: Set[str] = set()
+        compressed_tokens: Set[str] = set()
 
-        # Compress non-media text
-        compressed_text = self._compress_text(text_with_placeholders)
+        def compress_gap(gap: str) -> str:
+            compressed = self._compress_text(gap, strip=False)
+            original_tokens.update(gap.split())
+            compressed_tokens.update(compressed.split())
+            return compressed
 
-        # Restore media elements
-        for i, (media_text, _) in enumerate(media_elements):
-            placeholder = f"MEDIA_{i}"
-            compressed_text = compressed_text.replace(placeholder, media_text)
+        compressed_text = index.transform_gaps(compress_gap, replacements).strip()
 
         # Calculate metrics
-        compression_ratio = len(compressed_text) / len(text)
-        removed_tokens = self._get_removed_tokens(text, compressed_text)
+        compression_ratio = len(compressed_text) / len(text) if text else 1.0
+        removed_tokens = list(original_tokens - compressed_tokens)
 
         result = CompressionResult(
             original_text=text,
             compressed_text=compressed_text,
             compression_ratio=compression_ratio,
-            preserved_media=[info for _, info in media_elements],
+            preserved_media=preserved_media,
             removed_tokens=removed_tokens,
-            metadata={"compression_params": params, "media_count": len(media_elements)},
+            metadata={
+                "compression_params": params,
+                "media_count": len(preserved_media),
+                "image_tokens_saved": image_tokens_saved,
+            },
         )
 
-        self.compression_history.append(result)
+        self.compression_history.append(CompressionRecord.from_result(result))
         return result
 
     def get_compression_stats(self) -> Dict[str, Any]:
@@ -107,27 +182,80 @@ class MultimodalCompressor:
         if not self.compression_history:
             return {}
 
-        total_compressions = len(self.compression_history)
-        avg_ratio = (
-            sum(r.compression_ratio for r in self.compression_history)
-            / total_compressions
-        )
-
-        # Calculate media type distribution
-        media_types: Dict[str, int] = defaultdict(int)
-        for result in self.compression_history:
-            for media in result.preserved_media:
-                media_types[media.media_type] += 1
-
+        history = self.compression_history
         return {
-            "total_compressions": total_compressions,
-            "average_compression_ratio": avg_ratio,
-            "media_type_distribution": dict(media_types),
-            "total_media_preserved": sum(
-                len(r.preserved_media) for r in self.compression_history
-            ),
+            "total_compressions": history.total,
+            "average_compression_ratio": history.mean("compression_ratio"),
+            "media_type_distribution": dict(history.tallies["media_types"]),
+            "total_media_preserved": int(history.sum("media_count")),
+            "total_image_tokens_saved": int(history.sum("image_tokens_saved")),
         }
 
+    @staticmethod
+    def _make_image_optimizer(setting: Any) -> Optional[ImageOptimizer]:
+        """Build an image optimizer from a config value (dict, True or falsy)."""
+        if not setting:
+            return None
+        if isinstance(setting, ImageOptimizer):
+            return setting
+        return ImageOptimizer.from_config(setting if isinstance(setting, dict) else {})
+
+    def _optimize_images(
+        self,
+        text: str,
+        media: List[Tuple[ProtectedSpan, MediaInfo]],
+        optimizer: ImageOptimizer,
+    ) -> Tuple[Dict[ProtectedSpan, str], int]:
+        """Resize and re-encode base64 images in a thread pool.
+
+        Only base64 images with a valid payload are decoded; their MediaInfo is
+        updated in place to describe the optimized image.
+
+        Args:
+            text (str): Text containing the media elements.
+            media (List[Tuple[ProtectedSpan, MediaInfo]]): Indexed media elements.
+            optimizer (ImageOptimizer): Optimizer to run.
+
+        Returns:
+            Tuple[Dict[ProtectedSpan, str], int]: Replacement data URIs keyed by
+            span, and the estimated image tokens saved.
+        """
+        targets = []
+        payloads = []
+        for span, info in media:
+            if span.kind != "base64_image" or not info.size:
+                continue
+            start = span.start + info.metadata["payload_offset"]
+            try:
+                payloads.append(base64.b64decode(text[start : span.end]))
+            except (binascii.Error, ValueError):
+                continue
+            targets.append((span, info))
+
+        replacements: Dict[ProtectedSpan, str] = {}
+        tokens_saved = 0
+        for (span, info), optimized in zip(targets, optimizer.optimize_many(payloads)):
+            if optimized is None:
+                continue
+            info.metadata["optimization"] = {
+                "original_format": optimized.original_format,
+                "original_size": optimized.original_size,
+                "original_dimensions": optimized.original_dimensions,
+                "original_tokens": optimized.original_tokens,
+                "tokens": optimized.tokens,
+                "tokens_saved": optimized.tokens_saved,
+            }
+            if optimized.metadata.get("unchanged"):
+                continue
+            prefix = f"data:{optimized.mime_type};base64,"
+            replacements[span] = prefix + base64.b64encode(optimized.data).decode()
+            info.format = optimized.format
+            info.size = optimized.size
+            info.dimensions = (optimized.width, optimized.height)
+            info.metadata["payload_offset"] = len(prefix)
+            tokens_saved += optimized.tokens_saved
+        return replacements, tokens_saved
+
     def _load_media_patterns(self) -> Dict[str, Dict[str, Any]]:
         """Load media pattern configurations."""
         return {
@@ -153,53 +281,75 @@ class MultimodalCompressor:
             },
         }
 
-    def _extract_media_elements(self, text: str) -> List[Tuple[str, MediaInfo]]:
-        """Extract media elements from text."""
-        media_elements = []
-
-        for pattern_name, pattern_info in self.media_patterns.items():
-            matches = re.finditer(pattern_info["pattern"], text)
-            for match in matches:
-                media_text = match.group(0)
-                media_info = self._get_media_info(
-                    media_text, pattern_info["type"], pattern_name
-                )
-                media_elements.append((media_text, media_info))
-
-        return media_elements
-
-    def _get_media_info(
-        self, media_text: str, media_type: str, pattern_name: str
-    ) -> MediaInfo:
-        """Get information about a media element."""
-        info = MediaInfo(media_type=media_type, format="unknown", size=len(media_text))
-
-        if pattern_name == "base64_image":
-            # Extract base64 data
-            match = re.search(
-                r"data:image/([^;]+);base64,([a-zA-Z0-9+/=]+)", media_text
-            )
+    def _index_media(self, text: str) -> ProtectedSpanIndex:
+        """Index media elements in a single scan of the text."""
+        return ProtectedSpanIndex(
+            text,
+            patterns={
+                name: info["pattern"] for name, info in self.media_patterns.items()
+            },
+        )
+
+    def _iter_media(
+        self, index: ProtectedSpanIndex
+    ) -> Iterator[Tuple[ProtectedSpan, MediaInfo]]:
+        """Describe each indexed media span without keeping a copy of it."""
+        for span in index:
+            yield span, self._get_media_info(index.text, span)
+
+    def _get_media_info(self, text: str, span: ProtectedSpan) -> MediaInfo:
+        """Get information about a media element.
+
+        Base64 payloads are never decoded in full: their size follows from the
+        payload length and padding, and format and dimensions come from the
+        first few hundred decoded bytes.
+
+        Args:
+            text (str): Text containing the media element.
+            span (ProtectedSpan): Location and pattern name of the element.
+
+        Returns:
+            MediaInfo: Media type, format, size and (for images) dimensions.
+        """
+        media_type = self.media_patterns[span.kind]["type"]
+        info = MediaInfo(
+            media_type=media_type, format="unknown", size=span.end - span.start
+        )
+
+        if span.kind == "base64_image":
+            match = _DATA_URI_PREFIX.match(text, span.start, span.end)
             if match:
                 info.format = match.group(1)
-                try:
-                    decoded = base64.b64decode(match.group(2))
-                    info.size = len(decoded)
-                except base64.binascii.Error as e:
-                    logger.warning(f"Failed to decode base64 image data: {e}")
+                payload_start = match.end()
+                size = base64_decoded_size(text, payload_start, span.end)
+                if size is None:
+                    logger.warning("Failed to size base64 image data: bad padding")
                     info.size = 0  # Set size to 0 for invalid data
+                else:
+                    info.size = size
+                    header = probe_base64_image(text, payload_start, span.end)
+                    if header is not None:
+                        info.format = header.format
+                        info.dimensions = header.dimensions
+                info.metadata["payload_offset"] = payload_start - span.start
         elif media_type == "image":
             # Extract image URL and try to get format
-            match = re.search(r"\.(png|jpg|jpeg|gif|webp)$", media_text.lower())
+            match = _IMAGE_URL_EXTENSION.search(text, span.start, span.end)
             if match:
-                info.format = match.group(1)
+                info.format = match.group(1).lower()
 
         return info
 
-    def _compress_text(self, text: str) -> str:
-        """Compress non-media text."""
+    def _compress_text(self, text: str, strip: bool = True) -> str:
+        """Compress non-media text.
+
+        Args:
+            text (str): Text to compress.
+            strip (bool): Whether to strip leading and trailing whitespace. Gaps
+                between media spans keep a single separating space instead.
+        """
         # Remove redundant whitespace
         text = re.sub(r"\s+", " ", text)
-        text = text.strip()
 
         # Remove common filler words
         filler_words = [
@@ -218,15 +368,8 @@ class MultimodalCompressor:
 
         # Clean up whitespace again
         text = re.sub(r"\s+", " ", text)
-        text = text.strip()
-
-        return text
 
-    def _get_removed_tokens(self, original: str, compressed: str) -> List[str]:
-        """Get list of removed tokens."""
-        original_tokens = set(original.split())
-        compressed_tokens = set(compressed.split())
-        return list(original_tokens - compressed_tokens)
+        return text.strip() if strip else text
 
     def export_compression_history(self, output_path: Path) -> None:
         """Export compression history to a file.
@@ -238,15 +381,15 @@ class MultimodalCompressor:
             "statistics": self.get_compression_stats(),
             "compressions": [
                 {
-                    "original_length": len(result.original_text),
-                    "compressed_length": len(result.compressed_text),
-                    "compression_ratio": result.compression_ratio,
-                    "media_count": len(result.preserved_media),
-                    "media_types": [m.media_type for m in result.preserved_media],
-                    "removed_tokens": result.removed_tokens,
-                    "metadata": result.metadata,
+                    "original_length": record.original_length,
+                    "compressed_length": record.compressed_length,
+                    "compression_ratio": record.compression_ratio,
+                    "media_count": len(record.preserved_media),
+                    "media_types": [m.media_type for m in record.preserved_media],
+                    "removed_tokens": record.removed_tokens,
+                    "metadata": record.metadata,
                 }
-                for result in self.compression_history
+                for record in self.compression_history
             ],
         }
 
@@ -0,0 +1,93 @@
+"""NLP Pool - Process-wide, lazily loaded spaCy pipelines."""
+
+import logging
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, List, Set, Tuple
+
+try:
+    import spacy
+except ImportError:  # pragma: no cover - exercised only without spaCy
+    spacy = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SPACY_MODEL = "en_core_web_sm"
+
+# Components none of the analysis features read; they are never loaded.
+DEFAULT_EXCLUDED_COMPONENTS: Tuple[str, ...] = ("ner", "lemmatizer")
+
+# Pipeline components each analysis feature depends on. Components outside the
+# union for the enabled features are disabled when documents are processed.
+FEATURE_COMPONENTS: Dict[str, Tuple[str, ...]] = {
+    "tokens": (),
+    "sentences": ("tok2vec", "parser", "senter", "sentencizer"),
+    "key_phrases": ("tok2vec", "tagger", "attribute_ruler", "parser"),
+}
+
+_pipelines: Dict[Tuple[str, Tuple[str, ...]], "Language"] = {}
+_pipelines_lock = threading.Lock()
+
+
+def get_nlp(
+    model_name: str = DEFAULT_SPACY_MODEL,
+    exclude: Iterable[str] = DEFAULT_EXCLUDED_COMPONENTS,
+) -> "Language":
+    """Get a shared spaCy pipeline, loading it on first use.
+
+    Pipelines are cached for the lifetime of the process, so constructing
+    analyzers (e.g. once per API request) never reloads the model.
+
+    Args:
+        model_name: spaCy package name or path to a saved pipeline.
+        exclude: Components not to load at all.
+
+    Returns:
+        Language: The loaded pipeline.
+
+    Raises:
+        ImportError: If spaCy is not installed.
+    """
+    if spacy is None:
+        raise ImportError(
+            "spaCy is required for this analysis; use analysis_mode='fast' without it"
+        )
+    key = (model_name, tuple(sorted(exclude)))
+    nlp = _pipelines.get(key)
+    if nlp is None:
+        with _pipelines_lock:
+            nlp = _pipelines.get(key)
+            if nlp is None:
+                logger.info(f"Loading spaCy pipeline {model_name!r}")
+                nlp = spacy.load(model_name, exclude=list(key[1]))
+                _pipelines[key] = nlp
+    return nlp
+
+
+def clear_nlp_cache() -> None:
+    """Drop all cached pipelines."""
+    with _pipelines_lock:
+        _pipelines.clear()
+
+
+def components_to_disable(nlp: "Language", features: Iterable[str]) -> List[str]:
+    """Get the pipeline components not needed by a set of features.
+
+    Args:
+        nlp: Loaded pipeline.
+        features: Enabled analysis features (keys of FEATURE_COMPONENTS).
+
+    Returns:
+        List[str]: Names of components to disable.
+
+    Raises:
+        ValueError: If a feature is unknown.
+    """
+    required: Set[str] = set()
+    for feature in features:
+        if feature not in FEATURE_COMPONENTS:
+            raise ValueError(f"Unknown analysis feature: {feature}")
+        required.update(FEATURE_COMPONENTS[feature])
+    return [name for name in nlp.pipe_names if name not in required]
@@ -2,16 +2,30 @@
 
 import json
 import logging
+import os
 import re
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
+from multiprocessing.context import BaseContext
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Pattern
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Tuple
 
 from .analyzer import PromptAnalyzer
 from .code_aware_compressor import CodeAwareCompressor
+from .columnar import ColumnarStore
+from .history import DEFAULT_HISTORY_CAPACITY, BoundedHistory
 from .macro_suggester import MacroSuggester
+from .protected_spans import CODE_KINDS, PROTECTED_PATTERNS
+from .rewrite_engine import RewriteEngine
+from .streaming import (
+    StreamSource,
+    iter_chunks,
+    ordered_window,
+    read_jsonl,
+    write_jsonl,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -49,15 +63,34 @@ class OptimizationResult:
 class PromptOptimizer:
     """Class for optimizing prompts."""
 
-    def __init__(self, config: Optional[OptimizationConfig] = None):
+    def __init__(
+        self,
+        config: Optional[OptimizationConfig] = None,
+        history_size: int = DEFAULT_HISTORY_CAPACITY,
+        history_path: Optional[Path] = None,
+    ):
         """Initialize the optimizer.
 
         Args:
             config (Optional[OptimizationConfig]): Configuration for optimization.
+            history_size (int): Number of recent results kept in memory.
+            history_path (Optional[Path]): Optional JSONL file receiving every result.
         """
         self.config = config or OptimizationConfig()
-        self.optimization_history: List[OptimizationResult] = []
+        self.optimization_history: BoundedHistory[OptimizationResult] = BoundedHistory(
+            capacity=history_size,
+            metrics={
+                "length_reduction": lambda r: r.length_reduction,
+                "clarity": lambda r: r.clarity_score,
+                "completeness": lambda r: r.completeness_score,
+                "consistency": lambda r: r.consistency_score,
+                "efficiency": lambda r: r.efficiency_score,
+            },
+            spill_path=history_path,
+        )
         self.patterns: Dict[str, List[Pattern[str]]] = {}
+        self.pattern_strings: Dict[str, List[str]] = {}
+        self._rewriters: Dict[Tuple[bool, bool], RewriteEngine] = {}
         self._load_optimization_patterns()
 
     def optimize(
@@ -109,24 +142,14 @@ class PromptOptimizer:
         if not self.optimization_history:
             return {}
 
+        history = self.optimization_history
         return {
-            "total_optimizations": len(self.optimization_history),
-            "avg_length_reduction": sum(
-                r.length_reduction for r in self.optimization_history
-            )
-            / len(self.optimization_history),
-            "avg_clarity": sum(r.clarity_score for r in self.optimization_history)
-            / len(self.optimization_history),
-            "avg_completeness": sum(
-                r.completeness_score for r in self.optimization_history
-            )
-            / len(self.optimization_history),
-            "avg_consistency": sum(
-                r.consistency_score for r in self.optimization_history
-            )
-            / len(self.optimization_history),
-            "avg_efficiency": sum(r.efficiency_score for r in self.optimization_history)
-            / len(self.optimization_history),
+            "total_optimizations": history.total,
+            "avg_length_reduction": history.mean("length_reduction"),
+            "avg_clarity": history.mean("clarity"),
+            "avg_completeness": history.mean("completeness"),
+            "avg_consistency": history.mean("consistency"),
+            "avg_efficiency": history.mean("efficiency"),
         }
 
     def _load_optimization_patterns(self) -> None:
@@ -151,20 +174,14 @@ class PromptOptimizer:
                 r"\bsimply\b",
                 r"\bactually\b",
             ],
-            "code_blocks": [
-                r"```[\s\S]*?```",
-                r"`[^`]+`",
-            ],
-            "examples": [
-                r"Example:[\s\S]*?(?=\n\n|\Z)",
-                r"For example:[\s\S]*?(?=\n\n|\Z)",
-            ],
         }
 
+        self.pattern_strings = pattern_strings
         self.patterns = {
             category: [re.compile(pattern) for pattern in patterns]
             for category, patterns in pattern_strings.items()
         }
+        self._rewriters = {}
 
     def _calculate_clarity(self, prompt: str) -> float:
         """Calculate clarity score.
@@ -224,36 +241,45 @@ class PromptOptimizer:
         Returns:
             str: Optimized prompt.
         """
-        optimized = prompt
-
-        # Preserve code blocks and examples if configured
-        preserved_sections: List[Pattern[str]] = []
-        if config.preserve_code:
-            preserved_sections.extend(self.patterns["code_blocks"])
-        if config.preserve_examples:
-            preserved_sections.extend(self.patterns["examples"])
-
-        # Extract preserved sections
-        preserved: Dict[str, str] = {}
-        for i, pattern in enumerate(preserved_sections):
-            for match in re.finditer(pattern, optimized):
-                key = f"PRESERVED_{i}_{len(preserved)}"
-                preserved[key] = match.group(0)
-                optimized = optimized.replace(match.group(0), key)
-
-        # Remove redundant phrases
-        for pattern in self.patterns["redundant_phrases"]:
-            optimized = pattern.sub("", optimized)
-
-        # Remove filler words
-        for pattern in self.patterns["filler_words"]:
-            optimized = pattern.sub("", optimized)
-
-        # Restore preserved sections
-        for key, value in preserved.items():
-            optimized = optimized.replace(key, value)
+        return self._get_rewriter(
+            config.preserve_code, config.preserve_examples
+        ).rewrite(prompt)
 
-        return optimized
+    def _get_rewriter(
+        self, preserve_code: bool, preserve_examples: bool
+    ) -> RewriteEngine:
+        """Get the compiled rewrite engine for a preservation setting.
+
+        Redundant phrases and filler words are merged into one alternation with
+        the preserved sections, so a prompt is rewritten in a single pass that
+        copies the shared protected spans (code and examples) through by offset.
+
+        Args:
+            preserve_code (bool): Whether code blocks are protected.
+            preserve_examples (bool): Whether examples are protected.
+
+        Returns:
+            RewriteEngine: Engine for this combination of settings.
+        """
+        key = (preserve_code, preserve_examples)
+        rewriter = self._rewriters.get(key)
+        if rewriter is None:
+            kinds: List[str] = []
+            if preserve_code:
+                kinds.extend(CODE_KINDS)
+            if preserve_examples:
+                kinds.append("example")
+            protected = [PROTECTED_PATTERNS[kind] for kind in kinds]
+
+            rewriter = RewriteEngine(
+                removals={
+                    "redundant_phrases": self.pattern_strings["redundant_phrases"],
+                    "filler_words": self.pattern_strings["filler_words"],
+                },
+                protected=protected,
+            )
+            self._rewriters[key] = rewriter
+        return rewriter
 
     def _get_timestamp(self) -> str:
         """Get current timestamp.
@@ -491,39 +517,233 @@ class Optimizer:
         return dict(stats)
 
 
+DEFAULT_BATCH_CHUNK_SIZE = 1000
+
+# Per-process optimizer used by BatchOptimizer pool workers.
+_worker_optimizer: Optional[PromptOptimizer] = None
+
+
+def _init_batch_worker(config: OptimizationConfig) -> None:
+    """Build the worker's optimizer once, with its patterns compiled.
+
+    Args:
+        config (OptimizationConfig): Configuration shared by all workers.
+    """
+    global _worker_optimizer
+    # Results are merged into the parent's history, so workers keep none.
+    _worker_optimizer = PromptOptimizer(config, history_size=0)
+    _worker_optimizer._get_rewriter(config.preserve_code, config.preserve_examples)
+
+
+def _optimize_chunk(
+    prompts: List[str], optimization_params: Optional[Dict[str, Any]]
+) -> List[OptimizationResult]:
+    """Optimize a slice of prompts inside a pool worker.
+
+    Args:
+        prompts (List[str]): Prompts to optimize.
+        optimization_params (Optional[Dict[str, Any]]): Additional optimization parameters.
+
+    Returns:
+        List[OptimizationResult]: Results in input order.
+
+    Raises:
+        RuntimeError: If the worker was not started with _init_batch_worker.
+    """
+    if _worker_optimizer is None:
+        raise RuntimeError("Batch worker was not initialized")
+    return [
+        _worker_optimizer.optimize(prompt, optimization_params) for prompt in prompts
+    ]
+
+
 class BatchOptimizer:
     """Class for optimizing multiple prompts in batch."""
 
-    def __init__(self, config: Optional[OptimizationConfig] = None):
+    def __init__(
+        self,
+        config: Optional[OptimizationConfig] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE,
+        mp_context: Optional[BaseContext] = None,
+        history_size: int = DEFAULT_HISTORY_CAPACITY,
+    ):
         """Initialize the batch optimizer.
 
         Args:
             config (Optional[OptimizationConfig]): Configuration for optimization.
+            max_workers (Optional[int]): Worker processes for parallel batches
+                (defaults to the number of CPUs).
+            chunk_size (int): Number of prompts sent to a worker per task.
+            mp_context (Optional[BaseContext]): Multiprocessing context for the pool.
+            history_size (int): Number of recent batches kept in memory.
         """
         self.config = config or OptimizationConfig()
         self.optimizer = PromptOptimizer(config)
-        self.batch_history: List[List[OptimizationResult]] = []
+        self.batch_history: BoundedHistory[List[OptimizationResult]] = BoundedHistory(
+            capacity=history_size
+        )
+        self.batch_store: ColumnarStore[OptimizationResult] = ColumnarStore(
+            columns={
+                "length_reduction": lambda r: r.length_reduction,
+                "clarity": lambda r: r.clarity_score,
+                "completeness": lambda r: r.completeness_score,
+                "consistency": lambda r: r.consistency_score,
+                "efficiency": lambda r: r.efficiency_score,
+            }
+        )
+        self.max_workers = max_workers
+        self.chunk_size = max(1, chunk_size)
+        self.mp_context = mp_context
+        self._executor: Optional[ProcessPoolExecutor] = None
 
     def optimize_batch(
-        self, prompts: List[str], optimization_params: Optional[Dict[str, Any]] = None
+        self,
+        prompts: List[str],
+        optimization_params: Optional[Dict[str, Any]] = None,
+        parallel: bool = False,
     ) -> List[OptimizationResult]:
         """Optimize a batch of prompts.
 
         Args:
             prompts (List[str]): List of prompts to optimize.
             optimization_params (Optional[Dict[str, Any]]): Additional optimization parameters.
+            parallel (bool): Whether to spread chunks of the batch over a process
+                pool. Batches that fit in one chunk always run in-process.
 
         Returns:
-            List[OptimizationResult]: List of optimization results.
+            List[OptimizationResult]: List of optimization results, in input order.
         """
-        results = []
-        for prompt in prompts:
-            result = self.optimizer.optimize(prompt, optimization_params)
-            results.append(result)
+        if parallel and len(prompts) > self.chunk_size:
+            results = self._optimize_parallel(prompts, optimization_params)
+            self.optimizer.optimization_history.extend(results)
+        else:
+            results = [
+                self.optimizer.optimize(prompt, optimization_params)
+                for prompt in prompts
+            ]
 
         self.batch_history.append(results)
+        self.batch_store.extend(results)
         return results
 
+    def optimize_stream(
+        self,
+        prompts: Iterable[str],
+        optimization_params: Optional[Dict[str, Any]] = None,
+        parallel: bool = False,
+        max_in_flight: Optional[int] = None,
+    ) -> Iterator[OptimizationResult]:
+        """Optimize prompts from an iterable, yielding results as they are ready.
+
+        Unlike optimize_batch, the input is consumed lazily and results are not
+        kept in batch_history, so memory stays flat for corpora of any size.
+        Aggregates are still recorded in the optimizer's bounded history.
+
+        Args:
+            prompts (Iterable[str]): Prompts to optimize, e.g. from read_jsonl.
+            optimization_params (Optional[Dict[str, Any]]): Additional optimization parameters.
+            parallel (bool): Whether to optimize chunks on the process pool.
+            max_in_flight (Optional[int]): Maximum chunks submitted to the pool
+                but not yet yielded (defaults to twice the worker count).
+
+        Yields:
+            OptimizationResult: Results in input order.
+        """
+        if not parallel:
+            for prompt in prompts:
+                yield self.optimizer.optimize(prompt, optimization_params)
+            return
+
+        executor = self._get_executor()
+        window = max_in_flight or 2 * (self.max_workers or os.cpu_count() or 1)
+        for chunk_results in ordered_window(
+            lambda chunk: executor.submit(_optimize_chunk, chunk, optimization_params),
+            iter_chunks(prompts, self.chunk_size),
+            window,
+        ):
+            self.optimizer.optimization_history.extend(chunk_results)
+            yield from chunk_results
+
+    def optimize_jsonl(
+        self,
+        source: StreamSource,
+        sink: StreamSource,
+        optimization_params: Optional[Dict[str, Any]] = None,
+        parallel: bool = False,
+        max_in_flight: Optional[int] = None,
+    ) -> int:
+        """Stream prompts from JSONL and write results to JSONL incrementally.
+
+        Args:
+            source (StreamSource): Input path, file object or "-" for stdin.
+            sink (StreamSource): Output path, file object or "-" for stdout.
+            optimization_params (Optional[Dict[str, Any]]): Additional optimization parameters.
+            parallel (bool): Whether to optimize chunks on the process pool.
+            max_in_flight (Optional[int]): Maximum chunks in flight on the pool.
+
+        Returns:
+            int: Number of results written.
+        """
+        return write_jsonl(
+            self.optimize_stream(
+                read_jsonl(source), optimization_params, parallel, max_in_flight
+            ),
+            sink,
+        )
+
+    def _optimize_parallel(
+        self, prompts: List[str], optimization_params: Optional[Dict[str, Any]]
+    ) -> List[OptimizationResult]:
+        """Optimize prompts in chunks on the process pool.
+
+        Args:
+            prompts (List[str]): Prompts to optimize.
+            optimization_params (Optional[Dict[str, Any]]): Additional optimization parameters.
+
+        Returns:
+            List[OptimizationResult]: Results in input order.
+        """
+        chunks = [
+            prompts[i : i + self.chunk_size]
+            for i in range(0, len(prompts), self.chunk_size)
+        ]
+        results: List[OptimizationResult] = []
+        for chunk_results in self._get_executor().map(
+            _optimize_chunk, chunks, [optimization_params] * len(chunks)
+        ):
+            results.extend(chunk_results)
+        return results
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get the process pool, starting it on first use.
+
+        Returns:
+            ProcessPoolExecutor: Pool whose workers hold a ready optimizer.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self.mp_context,
+                initializer=_init_batch_worker,
+                initargs=(self.config,),
+            )
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the process pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "BatchOptimizer":
+        """Enter a context that closes the process pool on exit."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close the process pool."""
+        self.close()
+
     def get_batch_stats(self) -> Dict[str, Any]:
         """Get statistics about batch optimizations.
 
@@ -533,32 +753,15 @@ class BatchOptimizer:
         if not self.batch_history:
             return {}
 
-        total_batches = len(self.batch_history)
-        total_prompts = sum(len(batch) for batch in self.batch_history)
-        avg_batch_size = total_prompts / total_batches
-
-        all_results = [result for batch in self.batch_history for result in batch]
-        avg_length_reduction = sum(r.length_reduction for r in all_results) / len(
-            all_results
-        )
-        avg_clarity = sum(r.clarity_score for r in all_results) / len(all_results)
-        avg_completeness = sum(r.completeness_score for r in all_results) / len(
-            all_results
-        )
-        avg_consistency = sum(r.consistency_score for r in all_results) / len(
-            all_results
-        )
-        avg_efficiency = sum(r.efficiency_score for r in all_results) / len(all_results)
+        total_batches = self.batch_history.total
+        total_prompts = self.batch_store.total
+        means = self.batch_store.means()
 
         return {
             "total_batches": total_batches,
             "total_prompts": total_prompts,
-            "avg_batch_size": avg_batch_size,
-            "avg_length_reduction": avg_length_reduction,
-            "avg_clarity": avg_clarity,
-            "avg_completeness": avg_completeness,
-            "avg_consistency": avg_consistency,
-            "avg_efficiency": avg_efficiency,
+            "avg_batch_size": total_prompts / total_batches,
+            **{f"avg_{name}": value for name, value in means.items()},
         }
 
     def export_batch_results(self, output_path: Path) -> None:
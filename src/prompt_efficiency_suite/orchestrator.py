@@ -5,14 +5,17 @@ import logging
 from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
 
 from .analyzer import PromptAnalyzer
 from .code_aware_compressor import CodeAwareCompressor
+from .history import DEFAULT_HISTORY_CAPACITY, BoundedHistory
 from .macro_suggester import MacroSuggester
 from .model_translator import ModelTranslator, ModelType
 from .optimizer import PromptOptimizer
+from .streaming import ordered_window
 
 logger = logging.getLogger(__name__)
 
@@ -68,17 +71,42 @@ class OrchestrationResult:
 class Orchestrator:
     """A class for orchestrating prompt optimization workflows."""
 
-    def __init__(self) -> None:
-        """Initialize the orchestrator."""
+    def __init__(
+        self,
+        history_size: int = DEFAULT_HISTORY_CAPACITY,
+        history_path: Optional[Path] = None,
+    ) -> None:
+        """Initialize the orchestrator.
+
+        Args:
+            history_size (int): Number of recent results kept in memory.
+            history_path (Optional[Path]): Optional JSONL file receiving every result.
+        """
         self.logger = logging.getLogger(__name__)
         self.analyzer = PromptAnalyzer()
         self.optimizer = PromptOptimizer()
         self.translator = ModelTranslator()
         self.compressor = CodeAwareCompressor()
         self.macro_suggester = MacroSuggester()
-        self.optimization_history: List[OrchestrationResult] = []
+        self.optimization_history: BoundedHistory[OrchestrationResult] = BoundedHistory(
+            capacity=history_size,
+            metrics={
+                name: attrgetter(f"performance_metrics.{name}")
+                for name in (
+                    "clarity_improvement",
+                    "completeness_improvement",
+                    "consistency_improvement",
+                    "efficiency_improvement",
+                    "length_reduction",
+                    "execution_time",
+                )
+            },
+            spill_path=history_path,
+        )
         self.metadata: Dict[str, Any] = {}
-        self.performance_history: List[Dict[str, Any]] = []
+        self.performance_history: BoundedHistory[Dict[str, Any]] = BoundedHistory(
+            capacity=history_size
+        )
 
     def orchestrate(self, prompt: str, workflow: str) -> str:
         """Orchestrate a prompt optimization workflow.
@@ -203,6 +231,36 @@ class Orchestrator:
             ]
             return [future.result() for future in futures]
 
+    def optimize_stream(
+        self,
+        prompts: Iterable[str],
+        target_model: Optional[Union[str, ModelType]] = None,
+        optimization_params: Optional[Dict[str, Any]] = None,
+        max_workers: int = 4,
+        max_in_flight: Optional[int] = None,
+    ) -> Iterator[OrchestrationResult]:
+        """Optimize prompts from an iterable with a bounded in-flight window.
+
+        Args:
+            prompts (Iterable[str]): Prompts to optimize; consumed lazily.
+            target_model (Optional[Union[str, ModelType]]): Target model for optimization.
+            optimization_params (Optional[Dict[str, Any]]): Additional optimization parameters.
+            max_workers (int): Maximum number of worker threads.
+            max_in_flight (Optional[int]): Maximum prompts submitted but not yet
+                yielded (defaults to twice max_workers).
+
+        Yields:
+            OrchestrationResult: Results in input order.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            yield from ordered_window(
+                lambda prompt: executor.submit(
+                    self.optimize_prompt, prompt, target_model, optimization_params
+                ),
+                prompts,
+                max_in_flight or 2 * max_workers,
+            )
+
     def get_optimization_stats(self) -> Dict[str, Any]:
         """Get statistics about optimizations.
 
@@ -212,42 +270,20 @@ class Orchestrator:
         if not self.optimization_history:
             return {}
 
+        history = self.optimization_history
         return {
-            "total_optimizations": len(self.optimization_history),
-            "avg_clarity_improvement": sum(
-                r.performance_metrics.clarity_improvement
-                for r in self.optimization_history
-            )
-            / len(self.optimization_history),
-            "avg_completeness_improvement": sum(
-                r.performance_metrics.completeness_improvement
-                for r in self.optimization_history
-            )
-            / len(self.optimization_history),
-            "avg_consistency_improvement": sum(
-                r.performance_metrics.consistency_improvement
-                for r in self.optimization_history
-            )
-            / len(self.optimization_history),
-            "avg_efficiency_improvement": sum(
-                r.performance_metrics.efficiency_improvement
-                for r in self.optimization_history
-            )
-            / len(self.optimization_history),
-            "avg_length_reduction": sum(
-                r.performance_metrics.length_reduction
-                for r in self.optimization_history
-            )
-            / len(self.optimization_history),
-            "avg_execution_time": sum(
-                r.performance_metrics.execution_time for r in self.optimization_history
-            )
-            / len(self.optimization_history),
+            "total_optimizations": history.total,
+            "avg_clarity_improvement": history.mean("clarity_improvement"),
+            "avg_completeness_improvement": history.mean("completeness_improvement"),
+            "avg_consistency_improvement": history.mean("consistency_improvement"),
+            "avg_efficiency_improvement": history.mean("efficiency_improvement"),
+            "avg_length_reduction": history.mean("length_reduction"),
+            "avg_execution_time": history.mean("execution_time"),
         }
 
     def clear_history(self) -> None:
         """Clear optimization history."""
-        self.optimization_history = []
+        self.optimization_history.clear()
 
     def export_results(self, output_path: Path) -> None:
         """Export optimization results to a file.
@@ -302,7 +338,7 @@ class Orchestrator:
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get statistics about model performance."""
         return {
-            "total_translations": len(self.performance_history),
+            "total_translations": self.performance_history.total,
             "average_latency": 0.0,
             "success_rate": 0.0,
         }
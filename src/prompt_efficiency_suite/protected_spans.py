@@ -0,0 +1,164 @@
+"""Protected Spans - A single-scan index of regions that transformers must not edit."""
+
+import bisect
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Pattern,
+    Tuple,
+    cast,
+)
+
+logger = logging.getLogger(__name__)
+
+# Default catalog of protected region patterns. Earlier entries win when two
+# kinds could start at the same offset.
+PROTECTED_PATTERNS: Dict[str, str] = {
+    "code_block": r"```[\s\S]*?```",
+    "inline_code": r"`[^`]+`",
+    "indented_code": r"(?m:^(?: {4}|\t).*(?:\n(?: {4}|\t).*)*)",
+    "example": r"(?:For example|Example):[\s\S]*?(?=\n\n|\Z)",
+    "image": r"!\[[^\]]*\]\([^)]+\)",
+    "base64_image": r"data:image/[^;]+;base64,[a-zA-Z0-9+/=]+",
+    "audio": r"<audio[^>]*src=[\"'].*?[\"'][^>]*>",
+    "video": r"<video[^>]*src=[\"'].*?[\"'][^>]*>",
+}
+
+CODE_KINDS = ("code_block", "inline_code", "indented_code")
+MEDIA_KINDS = ("image", "base64_image", "audio", "video")
+
+
+@dataclass(frozen=True)
+class ProtectedSpan:
+    """A protected region of text, as a half-open ``[start, end)`` interval."""
+
+    start: int
+    end: int
+    kind: str
+
+
+@lru_cache(maxsize=64)
+def _compile(patterns: Tuple[Tuple[str, str], ...]) -> Pattern[str]:
+    """Compile a tuple of (kind, pattern) pairs into one alternation."""
+    return re.compile("|".join(f"(?P<{kind}>{pattern})" for kind, pattern in patterns))
+
+
+class ProtectedSpanIndex:
+    """A sorted interval list of protected regions found in one scan.
+
+    All requested kinds are merged into one compiled alternation, so the text is
+    scanned exactly once. Transformers then walk the editable gaps between spans
+    by offset instead of swapping protected regions out for placeholders.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        kinds: Optional[Iterable[str]] = None,
+        patterns: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Build the index.
+
+        Args:
+            text: Text to index.
+            kinds: Kinds to protect, in priority order (defaults to every kind).
+            patterns: Pattern catalog to use instead of PROTECTED_PATTERNS.
+        """
+        catalog = patterns if patterns is not None else PROTECTED_PATTERNS
+        selected = tuple(kinds) if kinds is not None else tuple(catalog)
+        self.text = text
+        self.spans: List[ProtectedSpan] = []
+        if selected:
+            pattern = _compile(tuple((kind, catalog[kind]) for kind in selected))
+            # Every alternative is a named group, so lastgroup is always set.
+            self.spans = [
+                ProtectedSpan(match.start(), match.end(), cast(str, match.lastgroup))
+                for match in pattern.finditer(text)
+                if match.end() > match.start()
+            ]
+        self._starts: List[int] = [span.start for span in self.spans]
+
+    def __len__(self) -> int:
+        """Number of protected spans."""
+        return len(self.spans)
+
+    def __iter__(self) -> Iterator[ProtectedSpan]:
+        """Iterate over protected spans in text order."""
+        return iter(self.spans)
+
+    def is_protected(self, offset: int) -> bool:
+        """Check whether an offset falls inside a protected span.
+
+        Args:
+            offset: Character offset into the text.
+
+        Returns:
+            True if the offset is protected.
+        """
+        i = bisect.bisect_right(self._starts, offset) - 1
+        return i >= 0 and offset < self.spans[i].end
+
+    def gaps(self) -> Iterator[Tuple[int, int]]:
+        """Iterate over the editable ``[start, end)`` gaps between spans."""
+        position = 0
+        for span in self.spans:
+            if span.start > position:
+                yield position, span.start
+            position = span.end
+        if position < len(self.text):
+            yield position, len(self.text)
+
+    def segments(self) -> Iterator[Tuple[Optional[ProtectedSpan], int, int]]:
+        """Iterate over gaps and spans in text order.
+
+        Yields:
+            Tuples of (span or None for a gap, start, end).
+        """
+        position = 0
+        for span in self.spans:
+            if span.start > position:
+                yield None, position, span.start
+            yield span, span.start, span.end
+            position = span.end
+        if position < len(self.text):
+            yield None, position, len(self.text)
+
+    def transform_gaps(
+        self,
+        transform: Callable[[str], str],
+        replacements: Optional[Mapping[ProtectedSpan, str]] = None,
+    ) -> str:
+        """Apply a transform to every editable gap and reassemble the text.
+
+        Protected spans are copied through unchanged (unless replaced) and the
+        output is built with a single join.
+
+        Args:
+            transform: Function applied to the text of each gap.
+            replacements: New text for specific protected spans.
+
+        Returns:
+            The transformed text.
+        """
+        if not self.spans:
+            return transform(self.text)
+
+        text = self.text
+        replacements = replacements or {}
+        return "".join(
+            (
+                transform(text[start:end])
+                if span is None
+                else replacements[span] if span in replacements else text[start:end]
+            )
+            for span, start, end in self.segments()
+        )
@@ -0,0 +1,94 @@
+"""Rewrite Engine - Single-pass multi-pattern text rewriting."""
+
+import logging
+import re
+from collections import Counter
+from typing import Dict, List, Match, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROTECTED_GROUP = "protected"
+
+
+class RewriteEngine:
+    """Applies many removal rules and protected regions in one left-to-right pass.
+
+    Every rule category is merged into one compiled alternation of named groups.
+    Protected patterns come first, so at any position where a protected region
+    starts it is copied through verbatim and scanning resumes after it; removal
+    matches are dropped. Output is assembled by a single ``re.sub`` call, so the
+    cost is linear in the input size instead of one pass per pattern.
+    """
+
+    def __init__(
+        self,
+        removals: Dict[str, List[str]],
+        protected: Optional[List[str]] = None,
+        flags: int = 0,
+    ) -> None:
+        """Initialize the engine.
+
+        Args:
+            removals: Removal patterns grouped by category name. Earlier categories
+                and patterns win when several match at the same position.
+            protected: Patterns whose matches must be left untouched.
+            flags: Regex flags applied to the combined pattern.
+        """
+        self.categories: List[str] = [name for name in removals if removals[name]]
+        alternatives: List[str] = []
+        if protected:
+            alternatives.append(self._group(PROTECTED_GROUP, protected))
+        for name in self.categories:
+            alternatives.append(self._group(name, removals[name]))
+
+        self.pattern: Optional[Pattern[str]] = (
+            re.compile("|".join(alternatives), flags) if alternatives else None
+        )
+
+    @staticmethod
+    def _group(name: str, patterns: List[str]) -> str:
+        """Build a named group matching any of the given patterns."""
+        return f"(?P<{name}>" + "|".join(f"(?:{p})" for p in patterns) + ")"
+
+    def rewrite(self, text: str) -> str:
+        """Rewrite text in a single pass.
+
+        Args:
+            text: Text to rewrite.
+
+        Returns:
+            The rewritten text.
+        """
+        if self.pattern is None:
+            return text
+        return self.pattern.sub(self._replace, text)
+
+    def rewrite_with_stats(self, text: str) -> Tuple[str, Dict[str, int]]:
+        """Rewrite text and count how many matches each category removed.
+
+        Args:
+            text: Text to rewrite.
+
+        Returns:
+            Tuple of the rewritten text and per-category removal counts.
+        """
+        if self.pattern is None:
+            return text, {}
+
+        counts: Counter[str] = Counter()
+
+        def replace(match: Match[str]) -> str:
+            if match.lastgroup is not None:
+                counts[match.lastgroup] += 1
+            return self._replace(match)
+
+        rewritten = self.pattern.sub(replace, text)
+        counts.pop(PROTECTED_GROUP, None)
+        return rewritten, dict(counts)
+
+    @staticmethod
+    def _replace(match: Match[str]) -> str:
+        """Keep protected matches and drop everything else."""
+        if match.lastgroup == PROTECTED_GROUP:
+            return match.group(0)
+        return ""
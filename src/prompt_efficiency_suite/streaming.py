@@ -0,0 +1,144 @@
+"""Streaming - Bounded-memory JSONL input, output and in-flight windows."""
+
+import json
+import logging
+import sys
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Callable, Deque, Iterable, Iterator, List, TypeVar, Union
+
+from .history import to_record
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROMPT_FIELD = "prompt"
+DEFAULT_FLUSH_EVERY = 100
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+StreamSource = Union[str, Path, IO[str]]
+
+
+@contextmanager
+def _open_stream(target: StreamSource, mode: str) -> Iterator[IO[str]]:
+    """Open a path, or pass through a file object or "-" (stdin/stdout)."""
+    if target == "-":
+        yield sys.stdin if "r" in mode else sys.stdout
+    elif isinstance(target, (str, Path)):
+        with open(target, mode, encoding="utf-8") as f:
+            yield f
+    else:
+        yield target
+
+
+def read_jsonl(
+    source: StreamSource, field: str = DEFAULT_PROMPT_FIELD
+) -> Iterator[str]:
+    """Lazily read prompts from a JSONL file, file object or stdin ("-").
+
+    Each line is either a JSON object holding the prompt under ``field`` or a
+    bare JSON string. Blank lines are skipped and malformed lines are logged
+    and skipped, so one bad record does not abort a long batch job.
+
+    Args:
+        source: Path, open text file, or "-" for stdin.
+        field: Key holding the prompt in object records.
+
+    Yields:
+        Prompts, one at a time.
+    """
+    with _open_stream(source, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                prompt = record if isinstance(record, str) else record[field]
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(
+                    f"Skipping invalid JSONL record on line {line_number}: {e}"
+                )
+                continue
+            yield prompt
+
+
+def write_jsonl(
+    records: Iterable[Any],
+    sink: StreamSource,
+    flush_every: int = DEFAULT_FLUSH_EVERY,
+) -> int:
+    """Write records to JSONL as they are produced.
+
+    Records may be dataclasses, pydantic models or plain JSON values. Output is
+    flushed after the first record and then every ``flush_every`` records, so
+    downstream consumers see results early.
+
+    Args:
+        records: Records to write; consumed lazily.
+        sink: Path, open text file, or "-" for stdout.
+        flush_every: Number of records between flushes.
+
+    Returns:
+        Number of records written.
+    """
+    count = 0
+    with _open_stream(sink, "w") as f:
+        for record in records:
+            f.write(json.dumps(to_record(record), default=str) + "\n")
+            count += 1
+            if count == 1 or count % flush_every == 0:
+                f.flush()
+        f.flush()
+    return count
+
+
+def iter_chunks(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Split an iterable into lists of at most ``size`` items, lazily.
+
+    Args:
+        items: Items to split.
+        size: Maximum chunk size.
+
+    Yields:
+        Consecutive chunks.
+    """
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def ordered_window(
+    submit: Callable[[T], "Future[R]"], items: Iterable[T], window: int
+) -> Iterator[R]:
+    """Run tasks with at most ``window`` in flight and yield results in order.
+
+    Items are pulled from the input only as earlier results are consumed, so
+    memory stays bounded by the window no matter how long the input is.
+
+    Args:
+        submit: Schedules one item and returns its future.
+        items: Items to process; consumed lazily.
+        window: Maximum number of submitted but unconsumed tasks.
+
+    Yields:
+        Results in input order.
+    """
+    pending: Deque["Future[R]"] = deque()
+    try:
+        for item in items:
+            pending.append(submit(item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
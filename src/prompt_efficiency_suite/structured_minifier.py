@@ -0,0 +1,737 @@
+"""Structured Minifier - Stream JSON and YAML into compact JSON in bounded memory."""
+
+import copy
+import io
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    Union,
+)
+
+import yaml
+
+from .streaming import StreamSource, _open_stream
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+_STRING_BODY = r'[^"\\]*(?:\\.[^"\\]*)*'
+_JSON_TOKEN = re.compile(
+    r"[ \t\r\n]*(?:"
+    r"([{}\[\],:])"
+    rf'|("{_STRING_BODY}")'
+    r"|(-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|true|false|null)"
+    r")"
+)
+# Rest of a string whose opening quote has already been consumed. Incomplete
+# escapes, and high surrogates without their low half, are left unmatched so
+# that every piece decodes on its own.
+_STRING_REST = re.compile(
+    r'((?:[^"\\]+'
+    r"|\\u[dD][89abAB][0-9a-fA-F]{2}\\u[dD][c-fC-F][0-9a-fA-F]{2}"
+    r"|\\u(?![dD][89abAB])[0-9a-fA-F]{4}"
+    r'|\\[^u])*)(")?'
+)
+
+# Whitespace outside strings, for minifying containers already validated whole.
+_INSIGNIFICANT_WHITESPACE = re.compile(rf'("{_STRING_BODY}")|[ \t\r\n]+')
+
+# Parser states: what the JSON scanner expects next.
+_VALUE, _KEY, _COLON, _COMMA, _DONE = range(5)
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+
+# YAML scalars may also be dates or timestamps, which are written as strings.
+_YAML_SCALAR_ENCODER = json.JSONEncoder(
+    ensure_ascii=False, allow_nan=False, default=str
+)
+
+
+def _reject_constant(name: str) -> None:
+    raise ValueError(f"{name} is not valid JSON")
+
+
+def _normalize_string(raw: str) -> str:
+    """Re-encode a JSON string token the way the compact encoder writes it."""
+    return _ENCODER.encode(json.loads(raw)) if "\\" in raw else raw
+
+
+_YamlLoader: Union[Type[yaml.CSafeLoader], Type[yaml.SafeLoader]]
+try:  # pragma: no cover - depends on how PyYAML was built
+    _YamlLoader = yaml.CSafeLoader
+except AttributeError:  # pragma: no cover
+    _YamlLoader = yaml.SafeLoader
+
+
+@dataclass
+class MinifyStats:
+    """Character counts for one minified document."""
+
+    input_chars: int = 0
+    output_chars: int = 0
+
+    @property
+    def ratio(self) -> float:
+        """Output size as a fraction of input size."""
+        return self.output_chars / self.input_chars if self.input_chars else 1.0
+
+
+@dataclass
+class _Frame:
+    """An open container whose opening text may still be withheld."""
+
+    is_object: bool
+    prefix: str
+    flushed: bool = False
+    count: int = 0
+
+
+class _CompactWriter:
+    """Writes compact JSON from parse events, dropping members on request.
+
+    Output of a container is deferred until its first member is written, so an
+    empty container can be dropped without buffering anything larger than the
+    open containers' keys. Nulls, empty containers and dropped keys are only
+    removed as object members; array elements keep their positions.
+    """
+
+    def __init__(
+        self,
+        sink: IO[str],
+        stats: MinifyStats,
+        drop_nulls: bool,
+        drop_empty: bool,
+        drop_keys: Iterable[str],
+        chunk_size: int,
+    ) -> None:
+        self.sink = sink
+        self.stats = stats
+        self.drop_nulls = drop_nulls
+        self.drop_empty = drop_empty
+        self.drop_keys = frozenset(drop_keys)
+        self.chunk_size = chunk_size
+        self._stack: List[_Frame] = []
+        self._key: Optional[str] = None
+        self._skip_depth = 0
+        self._skipping = False
+        self._parts: List[str] = []
+        self._buffered = 0
+
+    def begin(self, is_object: bool) -> None:
+        """Open an object or array."""
+        if self._skipping:
+            self._skip_depth += 1
+            return
+        prefix = self._member_prefix() + ("{" if is_object else "[")
+        self._stack.append(_Frame(is_object, prefix))
+        if not self.drop_empty:
+            self._flush_frames()
+
+    def end(self) -> None:
+        """Close the innermost object or array."""
+        if self._skipping:
+            self._skip_depth -= 1
+            self._skipping = self._skip_depth > 0
+            return
+        frame = self._stack.pop()
+        close = "}" if frame.is_object else "]"
+        if frame.flushed:
+            self._write(close)
+        elif not (self._stack and self._stack[-1].is_object):
+            # Array elements and the root are kept even when empty.
+            self._flush_frames()
+            self._write(frame.prefix + close)
+            if self._stack:
+                self._stack[-1].count += 1
+        else:
+            self._key = None
+
+    def key(self, raw: str) -> None:
+        """Start an object member with an encoded key."""
+        if self._skipping:
+            return
+        if self.drop_keys and json.loads(raw) in self.drop_keys:
+            self._skipping = True
+            self._skip_depth = 0
+            return
+        self._key = raw
+
+    def value(self, raw: str, is_null: bool = False) -> None:
+        """Write a complete encoded scalar."""
+        if self._skipping:
+            self._skipping = self._skip_depth > 0
+            return
+        if is_null and self.drop_nulls and self._stack and self._stack[-1].is_object:
+            self._key = None
+            return
+        self._flush_frames()
+        self._write(self._member_prefix() + raw)
+        if self._stack:
+            self._stack[-1].count += 1
+
+    def container(self, text: str, value: Any, exact: bool) -> bool:
+        """Write a complete, already decoded object or array.
+
+        The value is re-serialized by the C encoder when that reproduces the
+        source exactly (less whitespace and escapes), i.e. when every number
+        is in canonical form. Otherwise the source text itself is minified. A
+        container with members to drop is refused, so the caller walks it
+        token by token and every number keeps its text.
+
+        Args:
+            text: Source text of the container.
+            value: Decoded container.
+            exact: Whether re-serializing preserves the source text.
+
+        Returns:
+            False if the container must be walked token by token instead.
+        """
+        if self._skipping:
+            self._skipping = self._skip_depth > 0
+            return True
+        if self.drop_empty and not value and self._stack and self._stack[-1].is_object:
+            self._key = None
+            return True
+        if (self.drop_nulls or self.drop_empty or self.drop_keys) and self._prunes(
+            value
+        ):
+            return False
+        if exact:
+            raw = _ENCODER.encode(value)
+        else:
+            raw = _INSIGNIFICANT_WHITESPACE.sub(
+                lambda match: _normalize_string(match.group(1) or ""), text
+            )
+        self.value(raw)
+        return True
+
+    def _prunes(self, value: Any) -> bool:
+        """Check whether any member of a decoded value would be dropped."""
+        if isinstance(value, dict):
+            for key, member in value.items():
+                if (
+                    key in self.drop_keys
+                    or (member is None and self.drop_nulls)
+                    or (
+                        self.drop_empty
+                        and isinstance(member, (dict, list))
+                        and not member
+                    )
+                    or self._prunes(member)
+                ):
+                    return True
+            return False
+        if isinstance(value, list):
+            return any(self._prunes(item) for item in value)
+        return False
+
+    def value_part(self, raw: str, first: bool, last: bool) -> None:
+        """Write part of a string scalar too large to buffer whole."""
+        if self._skipping:
+            if last:
+                self._skipping = self._skip_depth > 0
+            return
+        if first:
+            self._flush_frames()
+            raw = self._member_prefix() + raw
+            if self._stack:
+                self._stack[-1].count += 1
+        self._write(raw)
+
+    def separate(self) -> None:
+        """Start the next top-level document on a new line."""
+        self._write("\n")
+
+    def close(self) -> None:
+        """Flush buffered output to the sink."""
+        if self._parts:
+            self.sink.write("".join(self._parts))
+            self._parts.clear()
+            self._buffered = 0
+
+    def _member_prefix(self) -> str:
+        """Separator and key to write before the next member."""
+        if not self._stack:
+            return ""
+        frame = self._stack[-1]
+        prefix = "," if frame.count else ""
+        if frame.is_object:
+            prefix += f"{self._key}:"
+            self._key = None
+        return prefix
+
+    def _flush_frames(self) -> None:
+        """Write the withheld openings of all enclosing containers."""
+        for depth, frame in enumerate(self._stack):
+            if not frame.flushed:
+                self._write(frame.prefix)
+                frame.flushed = True
+                if depth:
+                    self._stack[depth - 1].count += 1
+
+    def _write(self, text: str) -> None:
+        self._parts.append(text)
+        self._buffered += len(text)
+        self.stats.output_chars += len(text)
+        if self._buffered >= self.chunk_size:
+            self.close()
+
+
+def _scan_json(
+    read: Callable[[int], str],
+    writer: _CompactWriter,
+    stats: MinifyStats,
+    chunk_size: int,
+) -> None:
+    """Tokenize JSON chunk by chunk and feed the writer.
+
+    Objects and arrays that fit in the buffer are validated in one call to the
+    C decoder and minified with a single regex pass; larger ones are walked
+    token by token so that memory stays bounded, as are ones with members to
+    drop, so the output does not depend on ``chunk_size``.
+
+    Raises:
+        ValueError: If the input is not a single valid JSON document.
+    """
+    buffer, pos, base, eof = "", 0, 0, False
+    stack: List[bool] = []  # True for objects
+    state, just_opened, in_string = _VALUE, False, False
+
+    def refill() -> bool:
+        nonlocal buffer, pos, base, eof
+        chunk = read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        stats.input_chars += len(chunk)
+        base += pos
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def error(message: str) -> ValueError:
+        return ValueError(f"Invalid JSON at offset {base + pos}: {message}")
+
+    exact = True
+    tokenize_until = 0  # Offset up to which containers are walked token by token
+
+    def parse_float(text: str) -> float:
+        nonlocal exact
+        number = float(text)
+        if exact and repr(number) != text:
+            exact = False
+        return number
+
+    def parse_int(text: str) -> int:
+        nonlocal exact
+        number = int(text)
+        if exact and str(number) != text:
+            exact = False
+        return number
+
+    decoder = json.JSONDecoder(
+        parse_float=parse_float, parse_int=parse_int, parse_constant=_reject_constant
+    )
+
+    while True:
+        if in_string:
+            match = _STRING_REST.match(buffer, pos)
+            assert match is not None  # every part of the pattern is optional
+            closed = match.group(2) is not None
+            if match.end() > pos or closed:
+                piece = _normalize_string(f'"{match.group(1)}"')[1:-1]
+                writer.value_part(piece + (match.group(2) or ""), False, closed)
+            pos = match.end()
+            if closed:
+                in_string = False
+                state = _COMMA if stack else _DONE
+            elif not refill():
+                raise error("unterminated string")
+            continue
+
+        blank = _WHITESPACE.match(buffer, pos)
+        assert blank is not None  # the pattern matches the empty string
+        start = blank.end()
+        if (
+            state == _VALUE
+            and base + start >= tokenize_until
+            and buffer.startswith(("{", "["), start)
+        ):
+            try:
+                exact = True
+                value, end = decoder.raw_decode(buffer, start)
+            except ValueError:
+                # Incomplete or invalid: buffer at least a chunk before
+                # falling back to the tokenizer, which reports errors precisely.
+                if len(buffer) - start < chunk_size and refill():
+                    continue
+            else:
+                text = buffer[start:end]
+                if writer.container(text, value, exact):
+                    pos = end
+                    state, just_opened = (_COMMA if stack else _DONE), False
+                    continue
+                # Members must be dropped: walk the container's tokens.
+                tokenize_until = base + end
+
+        match = _JSON_TOKEN.match(buffer, pos)
+        if match is None or (
+            # A number may continue past the buffer (e.g. "1." or "1e+").
+            not eof
+            and match.lastindex == 3
+            and len(buffer) - match.end() <= 2
+        ):
+            # The next token is incomplete, or only whitespace is buffered.
+            if match is None and state == _VALUE and buffer.startswith('"', start):
+                # A string value longer than the buffer: stream it through.
+                pos = start + 1
+                writer.value_part('"', first=True, last=False)
+                in_string, just_opened = True, False
+                continue
+            if refill():
+                continue
+            if match is None:
+                if start == len(buffer) and state == _DONE:
+                    return
+                pos = start
+                raise error("unexpected end of input" if start == len(buffer) else "")
+
+        punctuation, string, scalar = match.groups()
+        if state == _DONE:
+            raise error("extra data after document")
+        if punctuation in ("{", "["):
+            if state != _VALUE:
+                raise error(f"unexpected {punctuation!r}")
+            is_object = punctuation == "{"
+            stack.append(is_object)
+            writer.begin(is_object)
+            state, just_opened = (_KEY if is_object else _VALUE), True
+        elif punctuation in ("}", "]"):
+            is_object = punctuation == "}"
+            if not stack or stack[-1] != is_object:
+                raise error(f"unexpected {punctuation!r}")
+            if not (state == _COMMA or (just_opened and state != _COLON)):
+                raise error(f"unexpected {punctuation!r}")
+            stack.pop()
+            writer.end()
+            state, just_opened = (_COMMA if stack else _DONE), False
+        elif punctuation == ",":
+            if state != _COMMA:
+                raise error("unexpected ','")
+            state = _KEY if stack[-1] else _VALUE
+        elif punctuation == ":":
+            if state != _COLON:
+                raise error("unexpected ':'")
+            state = _VALUE
+        elif state == _KEY:
+            if string is None:
+                raise error("expected a key")
+            writer.key(_normalize_string(string))
+            state, just_opened = _COLON, False
+        elif state == _VALUE:
+            writer.value(
+                _normalize_string(string) if string else scalar,
+                is_null=scalar == "null",
+            )
+            state, just_opened = (_COMMA if stack else _DONE), False
+        else:
+            raise error("expected ',' or ':'")
+        pos = match.end()
+
+
+def minify_json_stream(
+    source: StreamSource,
+    sink: StreamSource,
+    drop_nulls: bool = False,
+    drop_empty: bool = False,
+    drop_keys: Iterable[str] = (),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> MinifyStats:
+    """Minify a JSON document from one stream to another.
+
+    Input is read and output written in ``chunk_size`` pieces without building
+    an object tree, so memory stays bounded by nesting depth (and by the
+    length of object keys) rather than document size. Long string values are
+    streamed through in pieces.
+
+    Args:
+        source: Path, open text file, or "-" for stdin.
+        sink: Path, open text file, or "-" for stdout.
+        drop_nulls: Remove object members whose value is null.
+        drop_empty: Remove object members whose value is an empty object or
+            array (including ones emptied by the other options).
+        drop_keys: Object keys to remove at any depth, with their values.
+        chunk_size: Characters read and written at a time.
+
+    Returns:
+        MinifyStats: Input and output sizes.
+
+    Raises:
+        ValueError: If the input is not valid JSON.
+    """
+    stats = MinifyStats()
+    with _open_stream(source, "r") as src, _open_stream(sink, "w") as dst:
+        writer = _CompactWriter(
+            dst, stats, drop_nulls, drop_empty, drop_keys, chunk_size
+        )
+        _scan_json(src.read, writer, stats, chunk_size)
+        writer.close()
+    return stats
+
+
+class _CountingReader:
+    """Wraps a text stream to count the characters PyYAML reads from it."""
+
+    def __init__(self, stream: IO[str], stats: MinifyStats) -> None:
+        self.stream = stream
+        self.stats = stats
+
+    def read(self, size: int = -1) -> str:
+        data = self.stream.read(size)
+        self.stats.input_chars += len(data)
+        return data
+
+
+def _resolve_aliases(events: Iterable[yaml.Event]) -> Iterator[yaml.Event]:
+    """Replace YAML aliases with the events of the node they refer to.
+
+    Only anchored nodes are recorded, so memory grows with anchored content
+    rather than with the document.
+
+    Raises:
+        ValueError: If an alias refers to an unknown anchor.
+    """
+    anchors: Dict[str, List[yaml.Event]] = {}
+    recorders: List[List[Any]] = []  # [anchor, events, depth]
+    for event in events:
+        if isinstance(event, yaml.AliasEvent):
+            if event.anchor not in anchors:
+                raise ValueError(f"Unknown YAML alias: {event.anchor}")
+            replay, delta = anchors[event.anchor], 0
+        else:
+            replay = [event]
+            delta = (
+                1
+                if isinstance(event, yaml.CollectionStartEvent)
+                else -1 if isinstance(event, yaml.CollectionEndEvent) else 0
+            )
+            if isinstance(event, yaml.NodeEvent) and event.anchor is not None:
+                recorders.append([event.anchor, [], 0])
+        for recorder in list(recorders):
+            recorder[1].extend(replay)
+            recorder[2] += delta
+            if recorder[2] == 0:
+                anchors[recorder[0]] = recorder[1]
+                recorders.remove(recorder)
+        yield from replay
+
+
+def _yaml_scalar(
+    event: yaml.ScalarEvent,
+    resolver: yaml.resolver.Resolver,
+    constructor: yaml.constructor.SafeConstructor,
+) -> Any:
+    """Convert a scalar event to the value ``yaml.safe_load`` would produce."""
+    tag = event.tag
+    if tag is None or tag == "!":
+        tag = resolver.resolve(yaml.ScalarNode, event.value, event.implicit)
+    construct = constructor.yaml_constructors.get(tag)
+    if construct is None:
+        raise ValueError(f"Unsupported YAML tag: {tag}")
+    return construct(constructor, yaml.ScalarNode(tag, event.value, style=event.style))
+
+
+def _json_key(key: Any) -> str:
+    """Encode a decoded YAML mapping key as a JSON object key."""
+    if not isinstance(key, str):
+        key = json.dumps(key, default=str).strip('"')
+    return json.dumps(key, ensure_ascii=False)
+
+
+def _write_value(writer: _CompactWriter, value: Any) -> None:
+    """Feed a decoded YAML value to the writer.
+
+    Raises:
+        ValueError: If the value is a non-finite float (``.inf``, ``.nan``),
+            which JSON cannot represent.
+    """
+    if isinstance(value, dict):
+        writer.begin(True)
+        for key, member in value.items():
+            writer.key(_json_key(key))
+            _write_value(writer, member)
+        writer.end()
+    elif isinstance(value, list):
+        writer.begin(False)
+        for item in value:
+            _write_value(writer, item)
+        writer.end()
+    else:
+        writer.value(_YAML_SCALAR_ENCODER.encode(value), is_null=value is None)
+
+
+def _load_merge(events: List[yaml.Event]) -> Dict[Any, Any]:
+    """Build the mapping that a merge key's value (``<<: ...``) contributes.
+
+    The value's events come from anchored content, so they are already held in
+    memory; they are wrapped in a one-key document and loaded by PyYAML, which
+    applies the merge precedence rules.
+    """
+    unanchored = []
+    for event in events:
+        if isinstance(event, yaml.NodeEvent) and event.anchor is not None:
+            event = copy.copy(event)
+            event.anchor = None
+        unanchored.append(event)
+    document = [
+        yaml.StreamStartEvent(),
+        yaml.DocumentStartEvent(),
+        yaml.MappingStartEvent(None, None, True),
+        yaml.ScalarEvent(None, None, (True, False), "<<"),
+        *unanchored,
+        yaml.MappingEndEvent(),
+        yaml.DocumentEndEvent(),
+        yaml.StreamEndEvent(),
+    ]
+    merged: Dict[Any, Any] = yaml.load(yaml.emit(document), Loader=_YamlLoader)
+    return merged
+
+
+def _drive_yaml(events: Iterable[yaml.Event], writer: _CompactWriter) -> None:
+    """Feed YAML parse events to the writer as JSON.
+
+    Merge keys (``<<``) are resolved when their value ends and the merged
+    members are written when the mapping closes, skipping any key the mapping
+    sets explicitly, so the output has no duplicate keys.
+
+    Raises:
+        ValueError: If a mapping key is not a scalar, or a merge is invalid.
+    """
+    resolver = yaml.resolver.Resolver()
+    constructor = yaml.constructor.SafeConstructor()
+    # Open nodes: [is_map, expect_key, explicit keys, merged members].
+    stack: List[List[Any]] = []
+    merge_events: Optional[List[yaml.Event]] = None
+    merge_depth = 0
+    documents = 0
+
+    def value_written() -> None:
+        if stack and stack[-1][0]:
+            stack[-1][1] = True
+
+    for event in events:
+        if merge_events is not None:
+            merge_events.append(event)
+            if isinstance(event, yaml.CollectionStartEvent):
+                merge_depth += 1
+            elif isinstance(event, yaml.CollectionEndEvent):
+                merge_depth -= 1
+            if merge_depth == 0:
+                stack[-1][3].update(_load_merge(merge_events))
+                merge_events = None
+                value_written()
+            continue
+        expects_key = bool(stack) and stack[-1][0] and stack[-1][1]
+        if isinstance(event, yaml.DocumentStartEvent):
+            if documents:
+                writer.separate()
+            documents += 1
+        elif isinstance(event, yaml.CollectionStartEvent):
+            if expects_key:
+                raise ValueError("YAML mapping keys must be scalars")
+            is_map = isinstance(event, yaml.MappingStartEvent)
+            writer.begin(is_map)
+            stack.append([is_map, is_map, set(), {}])
+        elif isinstance(event, yaml.CollectionEndEvent):
+            _, _, explicit, merged = stack.pop()
+            for key, member in merged.items():
+                encoded = _json_key(key)
+                if encoded not in explicit:
+                    writer.key(encoded)
+                    _write_value(writer, member)
+            writer.end()
+            value_written()
+        elif isinstance(event, yaml.ScalarEvent):
+            if expects_key:
+                stack[-1][1] = False
+                if event.value == "<<" and event.implicit[0]:
+                    merge_events = []
+                    continue
+                key = _json_key(_yaml_scalar(event, resolver, constructor))
+                stack[-1][2].add(key)
+                writer.key(key)
+            else:
+                _write_value(writer, _yaml_scalar(event, resolver, constructor))
+                value_written()
+    if not documents:
+        writer.value("null")
+
+
+def minify_yaml_stream(
+    source: StreamSource,
+    sink: StreamSource,
+    drop_nulls: bool = False,
+    drop_empty: bool = False,
+    drop_keys: Iterable[str] = (),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> MinifyStats:
+    """Convert YAML to compact JSON from one stream to another.
+
+    Works from PyYAML's event stream rather than ``safe_load``, so no document
+    tree is built. Multiple documents are written one per line.
+
+    Args:
+        source: Path, open text file, or "-" for stdin.
+        sink: Path, open text file, or "-" for stdout.
+        drop_nulls: Remove object members whose value is null.
+        drop_empty: Remove object members whose value is an empty object or
+            array.
+        drop_keys: Mapping keys to remove at any depth, with their values.
+        chunk_size: Characters written at a time.
+
+    Returns:
+        MinifyStats: Input and output sizes.
+
+    Raises:
+        ValueError: If the input is not valid YAML, or holds a non-finite
+            float (``.inf``, ``.nan``) that JSON cannot represent.
+    """
+    stats = MinifyStats()
+    with _open_stream(source, "r") as src, _open_stream(sink, "w") as dst:
+        writer = _CompactWriter(
+            dst, stats, drop_nulls, drop_empty, drop_keys, chunk_size
+        )
+        events = yaml.parse(_CountingReader(src, stats), Loader=_YamlLoader)
+        try:
+            _drive_yaml(_resolve_aliases(events), writer)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML: {e}") from e
+        writer.close()
+    return stats
+
+
+def minify_json(text: str, **options: Any) -> str:
+    """Minify a JSON string. Accepts the options of ``minify_json_stream``."""
+    output = io.StringIO()
+    minify_json_stream(io.StringIO(text), output, **options)
+    return output.getvalue()
+
+
+def minify_yaml(text: str, **options: Any) -> str:
+    """Convert a YAML string to compact JSON. See ``minify_yaml_stream``."""
+    output = io.StringIO()
+    minify_yaml_stream(io.StringIO(text), output, **options)
+    return output.getvalue()
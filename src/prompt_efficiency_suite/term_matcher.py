@@ -0,0 +1,289 @@
+"""Term Matcher - Case-insensitive multi-term search with an Aho-Corasick automaton."""
+
+import logging
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    cast,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TermMatch:
+    """A dictionary term found in text, as a half-open ``[start, end)`` interval."""
+
+    start: int
+    end: int
+    term: str
+
+
+def _lower(text: str) -> str:
+    """Lowercase text without changing its length, so offsets stay valid."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters (e.g. "İ") expand when lowercased; keep those as-is.
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+class _BaseTermMatcher(ABC):
+    """Search helpers shared by the in-memory and packed automata."""
+
+    terms: List[str]
+
+    def __len__(self) -> int:
+        """Number of distinct terms."""
+        return len(self.terms)
+
+    @abstractmethod
+    def iter_matches(self, text: str) -> Iterator[TermMatch]:
+        """Iterate over every term occurrence, including overlapping ones."""
+        pass
+
+    def find_all(self, text: str) -> List[TermMatch]:
+        """Get every term occurrence sorted by position.
+
+        Args:
+            text: Text to search.
+
+        Returns:
+            List[TermMatch]: Hits sorted by start, then end offset.
+        """
+        return sorted(self.iter_matches(text), key=lambda m: (m.start, m.end))
+
+    def find_terms(self, text: str) -> Set[str]:
+        """Get the distinct dictionary terms occurring in the text.
+
+        Args:
+            text: Text to search.
+
+        Returns:
+            Set[str]: Matched terms, as spelled in the dictionary.
+        """
+        return {match.term for match in self.iter_matches(text)}
+
+    def contains_any(self, text: str) -> bool:
+        """Check whether any term occurs in the text.
+
+        Args:
+            text: Text to search.
+
+        Returns:
+            bool: True on the first hit.
+        """
+        return next(self.iter_matches(text), None) is not None
+
+
+class TermMatcher(_BaseTermMatcher):
+    """Finds every occurrence of every dictionary term in one pass over the text.
+
+    The automaton is built once from the terms, after which a search costs
+    O(len(text) + hits) regardless of how many terms the dictionary holds.
+    Matching is case-insensitive and substring-based: a term matches anywhere
+    it occurs, including inside longer words.
+    """
+
+    def __init__(self, terms: Iterable[str] = ()) -> None:
+        """Build the automaton.
+
+        Args:
+            terms: Dictionary terms. Empty terms are ignored; terms differing only
+                in case are reported under the first spelling seen.
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Term ending at each state, and the nearest proper suffix state that
+        # also ends a term (so overlapping hits are found without copying).
+        self._term: List[Optional[str]] = [None]
+        self._dict_link: List[int] = [0]
+        self.terms: List[str] = []
+
+        for term in terms:
+            self._insert(term)
+        self._link()
+
+    def _insert(self, term: str) -> None:
+        """Add a term to the trie."""
+        if not term:
+            return
+        state = 0
+        for char in _lower(term):
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._term.append(None)
+                self._dict_link.append(0)
+            state = next_state
+        if self._term[state] is None:
+            self._term[state] = term
+            self.terms.append(term)
+
+    def _link(self) -> None:
+        """Compute failure and dictionary-suffix links breadth-first."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                failed = self._fail[child]
+                self._dict_link[child] = (
+                    failed
+                    if self._term[failed] is not None
+                    else self._dict_link[failed]
+                )
+
+    def iter_matches(self, text: str) -> Iterator[TermMatch]:
+        """Iterate over every term occurrence, including overlapping ones.
+
+        Args:
+            text: Text to search.
+
+        Yields:
+            TermMatch: Hits ordered by end offset (longest term first on ties).
+        """
+        goto, fail, term_at, dict_link = (
+            self._goto,
+            self._fail,
+            self._term,
+            self._dict_link,
+        )
+        state = 0
+        for i, char in enumerate(_lower(text)):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            hit = state if term_at[state] is not None else dict_link[state]
+            while hit:
+                # Dictionary links only ever point at states that end a term.
+                term = cast(str, term_at[hit])
+                yield TermMatch(i + 1 - len(term), i + 1, term)
+                hit = dict_link[hit]
+
+    def pack(self) -> Dict[str, "array[int]"]:
+        """Flatten the automaton into typed arrays.
+
+        Each state's outgoing edges are stored contiguously, sorted by code
+        point, so the arrays can be written to disk and searched in place by
+        :class:`PackedTermMatcher`.
+
+        Returns:
+            Dict[str, array]: The arrays listed in ``PACKED_ARRAYS``.
+        """
+        term_ids = {term: i for i, term in enumerate(self.terms)}
+        packed = {name: array(typecode) for name, typecode in PACKED_ARRAYS.items()}
+        packed["edge_offsets"].append(0)
+        for state, edges in enumerate(self._goto):
+            for char, target in sorted(edges.items()):
+                packed["edge_chars"].append(ord(char))
+                packed["edge_targets"].append(target)
+            packed["edge_offsets"].append(len(packed["edge_chars"]))
+            term = self._term[state]
+            packed["state_terms"].append(-1 if term is None else term_ids[term])
+        packed["fail"].extend(self._fail)
+        packed["dict_link"].extend(self._dict_link)
+
+        packed["term_offsets"].append(0)
+        for term in self.terms:
+            packed["term_blob"].frombytes(term.encode("utf-8"))
+            packed["term_offsets"].append(len(packed["term_blob"]))
+        return packed
+
+
+# Arrays making up a packed automaton, with their ``array`` typecodes.
+PACKED_ARRAYS: Dict[str, str] = {
+    "edge_offsets": "I",
+    "edge_chars": "I",
+    "edge_targets": "I",
+    "fail": "I",
+    "dict_link": "I",
+    "state_terms": "i",
+    "term_offsets": "I",
+    "term_blob": "B",
+}
+
+
+class PackedTermMatcher(_BaseTermMatcher):
+    """A :class:`TermMatcher` automaton searched directly from flat arrays.
+
+    The arrays may be memoryviews over a memory-mapped file, in which case
+    every process mapping the file shares one copy of the automaton and
+    loading it costs only the decoding of the term strings.
+    """
+
+    def __init__(self, arrays: Mapping[str, Sequence[int]]) -> None:
+        """Wrap packed arrays.
+
+        Args:
+            arrays: The arrays produced by :meth:`TermMatcher.pack`.
+        """
+        self._edge_offsets = arrays["edge_offsets"]
+        self._edge_chars = arrays["edge_chars"]
+        self._edge_targets = arrays["edge_targets"]
+        self._fail = arrays["fail"]
+        self._dict_link = arrays["dict_link"]
+        self._state_terms = arrays["state_terms"]
+
+        offsets, blob = arrays["term_offsets"], bytes(arrays["term_blob"])
+        self.terms: List[str] = [
+            blob[offsets[i] : offsets[i + 1]].decode("utf-8")
+            for i in range(len(offsets) - 1)
+        ]
+
+    def iter_matches(self, text: str) -> Iterator[TermMatch]:
+        """Iterate over every term occurrence, including overlapping ones.
+
+        Args:
+            text: Text to search.
+
+        Yields:
+            TermMatch: Hits ordered by end offset (longest term first on ties).
+        """
+        offsets, chars, targets = (
+            self._edge_offsets,
+            self._edge_chars,
+            self._edge_targets,
+        )
+        fail, dict_link, state_terms, terms = (
+            self._fail,
+            self._dict_link,
+            self._state_terms,
+            self.terms,
+        )
+        state = 0
+        for i, char in enumerate(_lower(text)):
+            code = ord(char)
+            while True:
+                end = offsets[state + 1]
+                edge = bisect_left(chars, code, offsets[state], end)
+                if edge < end and chars[edge] == code:
+                    state = targets[edge]
+                    break
+                if not state:
+                    break
+                state = fail[state]
+            hit = state if state_terms[state] >= 0 else dict_link[state]
+            while hit:
+                term = terms[state_terms[hit]]
+                yield TermMatch(i + 1 - len(term), i + 1, term)
+                hit = dict_link[hit]
@@ -0,0 +1,163 @@
+"""Token Cache - A bounded LRU cache for token counts keyed by content hash."""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, bytes]
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TokenCountCache:
+    """A thread-safe LRU cache of token counts with TTL-based expiry.
+
+    Entries are keyed by ``(encoding name, content hash)`` so repeated prompt
+    fragments cost a hash lookup instead of a full BPE pass, and the cache never
+    holds on to the prompt text itself.
+    """
+
+    def __init__(
+        self, max_size: int = 1000, ttl: Optional[float] = 3600, enabled: bool = True
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries kept before LRU eviction.
+            ttl: Seconds an entry stays valid, or None to never expire.
+            enabled: Whether lookups and stores are performed at all.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[CacheKey, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "TokenCountCache":
+        """Create a cache from a ``cache:`` configuration block.
+
+        Args:
+            config: Mapping with optional 'enabled', 'ttl' and 'max_size' keys.
+
+        Returns:
+            TokenCountCache: Configured cache.
+        """
+        return cls(
+            max_size=int(config.get("max_size", 1000)),
+            ttl=config.get("ttl", 3600),
+            enabled=bool(config.get("enabled", True)),
+        )
+
+    @staticmethod
+    def make_key(encoding_name: str, text: str) -> CacheKey:
+        """Build the cache key for a text.
+
+        Args:
+            encoding_name: Name of the encoding the count belongs to.
+            text: Text being counted.
+
+        Returns:
+            CacheKey: Tuple of encoding name and content digest.
+        """
+        digest = hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        return encoding_name, digest
+
+    def get(self, key: CacheKey) -> Optional[int]:
+        """Look up a cached token count.
+
+        Args:
+            key: Key built with make_key.
+
+        Returns:
+            The cached count, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            count, expires_at = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return count
+
+    def put(self, key: CacheKey, count: int) -> None:
+        """Store a token count.
+
+        Args:
+            key: Key built with make_key.
+            count: Token count to store.
+        """
+        if not self.enabled or self.max_size <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            self._entries[key] = (count, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.stats = CacheStats()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics about cache usage.
+
+        Returns:
+            Dict[str, Any]: Cache statistics.
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.stats.hits,
+                "misses": self.stats.misses,
+                "evictions": self.stats.evictions,
+                "expirations": self.stats.expirations,
+                "hit_rate": self.stats.hit_rate,
+            }
+
+    def __len__(self) -> int:
+        """Number of entries currently cached."""
+        return len(self._entries)
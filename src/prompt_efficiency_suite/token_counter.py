@@ -2,43 +2,372 @@
 
 import json
 import logging
-from collections import defaultdict
+import re
+import threading
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Union
+
+from .history import DEFAULT_HISTORY_CAPACITY, BoundedHistory, to_record
+from .token_cache import TokenCountCache
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - exercised only without tiktoken
+    tiktoken = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL = "gpt-4"
+DEFAULT_ENCODING = "cl100k_base"
+
+# Model name prefixes mapped to their BPE encodings. Longer prefixes win, so
+# "gpt-4o" resolves before "gpt-4".
+MODEL_ENCODINGS: Dict[str, str] = {
+    "gpt-4o": "o200k_base",
+    "o1": "o200k_base",
+    "o3": "o200k_base",
+    "gpt-4": "cl100k_base",
+    "gpt-3.5-turbo": "cl100k_base",
+    "text-embedding-3": "cl100k_base",
+    "text-embedding-ada-002": "cl100k_base",
+    "text-davinci-003": "p50k_base",
+    "text-davinci-002": "p50k_base",
+    "code-davinci": "p50k_base",
+    "text-davinci-001": "r50k_base",
+    "text-curie-001": "r50k_base",
+    "text-babbage-001": "r50k_base",
+    "text-ada-001": "r50k_base",
+}
+
+MODEL_CONTEXT_WINDOWS: Dict[str, int] = {
+    "gpt-4o": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4-32k": 32768,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo-16k": 16384,
+    "gpt-3.5-turbo": 4096,
+}
+
 
 @dataclass
 class TokenCount:
-    """Result of token counting."""
+    """Result of token counting, without the counted text."""
 
-    text: str
+    text_length: int
     total_tokens: int
-    token_distribution: Dict[str, int]
+    token_distribution: Dict[str, int] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+def _match_prefix(model: str, table: Dict[str, Any]) -> Optional[Any]:
+    """Look up a model in a prefix table, preferring the longest prefix."""
+    for prefix in sorted(table, key=len, reverse=True):
+        if model.startswith(prefix):
+            return table[prefix]
+    return None
+
+
+class ApproximateEncoding:
+    """Regex pre-tokenizer used when a BPE encoding cannot be loaded.
+
+    The pattern mirrors the GPT pre-tokenizer split, so counts track real BPE
+    counts closely for English prose while never requiring network access.
+    """
+
+    _PATTERN: Pattern[str] = re.compile(
+        r"'(?:[sdmt]|ll|ve|re)| ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\s+(?!\S)|\s+"
+    )
+
+    def __init__(self, name: str) -> None:
+        """Initialize the approximate encoding.
+
+        Args:
+            name: Name of the encoding this approximation stands in for.
+        """
+        self.name = name
+
+    def count(self, text: str) -> int:
+        """Count approximate tokens without building a token list."""
+        return sum(1 for _ in self._PATTERN.finditer(text))
+
+
+Encoding = Union["tiktoken.Encoding", ApproximateEncoding]
+
+
+class TokenCountingEngine:
+    """Process-wide registry of lazily loaded encodings keyed by model name.
+
+    Encodings are expensive to construct, so each one is built at most once per
+    process and shared by every component that counts tokens. Counts are
+    memoized in a TokenCountCache keyed by encoding and content hash.
+    """
+
+    def __init__(
+        self, batch_chunk_size: int = 1024, cache: Optional[TokenCountCache] = None
+    ) -> None:
+        """Initialize the engine.
+
+        Args:
+            batch_chunk_size: Number of texts encoded together by count_batch.
+            cache: Token count cache (defaults to 1000 entries with a 1 hour TTL).
+        """
+        self.batch_chunk_size = batch_chunk_size
+        self.cache = cache or TokenCountCache()
+        self._encodings: Dict[str, Encoding] = {}
+        self._model_encodings: Dict[str, Encoding] = {}
+        self._lock = threading.Lock()
+
+    def encoding_name_for_model(self, model: str) -> str:
+        """Resolve the encoding name used by a model.
+
+        Args:
+            model: Model name (e.g. 'gpt-4', 'gpt-4o-mini').
+
+        Returns:
+            Name of the BPE encoding for the model.
+        """
+        name = _match_prefix(model, MODEL_ENCODINGS)
+        if name is None and tiktoken is not None:
+            try:
+                name = tiktoken.encoding_name_for_model(model)
+            except (AttributeError, KeyError):
+                name = None
+        return name or DEFAULT_ENCODING
+
+    def get_encoding(self, model: str = DEFAULT_MODEL) -> Encoding:
+        """Get the shared encoding for a model, loading it on first use.
+
+        Args:
+            model: Model name.
+
+        Returns:
+            The tiktoken encoding, or an ApproximateEncoding if it cannot be loaded.
+        """
+        encoding = self._model_encodings.get(model)
+        if encoding is not None:
+            return encoding
+
+        with self._lock:
+            encoding = self._model_encodings.get(model)
+            if encoding is None:
+                name = self.encoding_name_for_model(model)
+                encoding = self._encodings.get(name)
+                if encoding is None:
+                    encoding = self._load_encoding(name)
+                    self._encodings[name] = encoding
+                self._model_encodings[model] = encoding
+        return encoding
+
+    def configure_cache(self, config: Dict[str, Any]) -> None:
+        """Replace the token count cache from a ``cache:`` configuration block.
+
+        Args:
+            config: Mapping with optional 'enabled', 'ttl' and 'max_size' keys.
+        """
+        self.cache = TokenCountCache.from_config(config)
+
+    def count(self, text: str, model: str = DEFAULT_MODEL) -> int:
+        """Count tokens in a text.
+
+        tiktoken has no count-only entry point, so a cache miss still builds the
+        token list; it is discarded as soon as its length is taken, and no
+        distribution is computed. Repeated texts are served from the cache.
+
+        Args:
+            text: Text to count tokens in.
+            model: Model whose encoding should be used.
+
+        Returns:
+            Number of tokens.
+        """
+        if not text:
+            return 0
+        encoding = self.get_encoding(model)
+        if not self.cache.enabled:
+            return self._count_uncached(encoding, text)
+
+        key = self.cache.make_key(encoding.name, text)
+        count = self.cache.get(key)
+        if count is None:
+            count = self._count_uncached(encoding, text)
+            self.cache.put(key, count)
+        return count
+
+    def count_batch(
+        self, texts: Iterable[str], model: str = DEFAULT_MODEL, num_threads: int = 8
+    ) -> List[int]:
+        """Count tokens for many texts in one call.
+
+        Cached texts are answered from the cache; the remaining texts are encoded
+        in chunks of ``batch_chunk_size`` on tiktoken's native thread pool, so
+        only one chunk of token lists is alive at a time.
+
+        Args:
+            texts: Texts to count tokens in.
+            model: Model whose encoding should be used.
+            num_threads: Number of native threads used per chunk.
+
+        Returns:
+            Token counts in the same order as the input texts.
+        """
+        encoding = self.get_encoding(model)
+        counts: List[int] = []
+        pending: List[int] = []
+        chunk: List[str] = []
+        keys: Dict[int, Any] = {}
+
+        for index, text in enumerate(texts):
+            counts.append(0)
+            if not text:
+                continue
+            if self.cache.enabled:
+                key = self.cache.make_key(encoding.name, text)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    counts[index] = cached
+                    continue
+                keys[index] = key
+
+            pending.append(index)
+            chunk.append(text)
+            if len(chunk) >= self.batch_chunk_size:
+                self._fill_chunk(encoding, chunk, pending, counts, keys, num_threads)
+                pending, chunk = [], []
+
+        if chunk:
+            self._fill_chunk(encoding, chunk, pending, counts, keys, num_threads)
+        return counts
+
+    def _fill_chunk(
+        self,
+        encoding: Encoding,
+        chunk: List[str],
+        indices: List[int],
+        counts: List[int],
+        keys: Dict[int, Any],
+        num_threads: int,
+    ) -> None:
+        """Count one chunk of cache misses and record the results."""
+        if isinstance(encoding, ApproximateEncoding):
+            chunk_counts = [encoding.count(text) for text in chunk]
+        else:
+            chunk_counts = [
+                len(tokens)
+                for tokens in encoding.encode_ordinary_batch(
+                    chunk, num_threads=num_threads
+                )
+            ]
+
+        for index, count in zip(indices, chunk_counts):
+            counts[index] = count
+            if index in keys:
+                self.cache.put(keys[index], count)
+
+    def _count_uncached(self, encoding: Encoding, text: str) -> int:
+        """Count tokens with an encoding, bypassing the cache.
+
+        The approximate encoding counts matches without building a list; tiktoken
+        can only encode, so its token list is built and dropped here.
+        """
+        if isinstance(encoding, ApproximateEncoding):
+            return encoding.count(text)
+        return len(encoding.encode_ordinary(text))
+
+    def _load_encoding(self, name: str) -> Encoding:
+        """Load an encoding by name, falling back to an approximation.
+
+        Args:
+            name: Encoding name.
+
+        Returns:
+            The loaded encoding.
+        """
+        if tiktoken is None:
+            logger.warning(  # type: ignore[unreachable]
+                "tiktoken is not installed; using approximate token counts"
+            )
+            return ApproximateEncoding(name)
+        try:
+            return tiktoken.get_encoding(name)
+        except Exception as e:
+            logger.warning(
+                f"Failed to load encoding '{name}', using approximate token counts: {e}"
+            )
+            return ApproximateEncoding(name)
+
+
+_engine = TokenCountingEngine()
+
+
+def get_token_engine() -> TokenCountingEngine:
+    """Get the process-wide token counting engine.
+
+    Returns:
+        TokenCountingEngine: The shared engine.
+    """
+    return _engine
+
+
 class TokenCounter:
     """A class for counting tokens in prompts."""
 
-    def __init__(self):
-        """Initialize the token counter."""
+    def __init__(
+        self,
+        model: str = DEFAULT_MODEL,
+        history_size: int = DEFAULT_HISTORY_CAPACITY,
+        history_path: Optional[Path] = None,
+        track_words: bool = False,
+    ):
+        """Initialize the token counter.
+
+        Args:
+            model: Default model used for token counting.
+            history_size: Number of recent counts kept in memory.
+            history_path: Optional JSONL file receiving every count record,
+                including the counted text.
+            track_words: Whether to keep word frequencies over the retained counts.
+        """
         self.logger = logging.getLogger(__name__)
+        self.model = model
+        self.engine = get_token_engine()
+        self.track_words = track_words
+        self.count_history: BoundedHistory[TokenCount] = BoundedHistory(
+            capacity=history_size,
+            metrics={"total_tokens": lambda r: r.total_tokens},
+            window_tallies=(
+                {"words": lambda r: r.token_distribution} if track_words else None
+            ),
+            spill_path=history_path,
+        )
 
-    def count(self, prompt: str) -> int:
+    def count(self, prompt: str, model: Optional[str] = None) -> int:
         """Count tokens in a prompt.
 
         Args:
             prompt: The prompt to count tokens in
+            model: Optional model to count for (defaults to the counter's model)
 
         Returns:
             Number of tokens
         """
-        # TODO: Implement token counting
-        return len(prompt.split())
+        return self.engine.count(prompt, model or self.model)
+
+    def count_batch(
+        self, prompts: Iterable[str], model: Optional[str] = None
+    ) -> List[int]:
+        """Count tokens in many prompts at once.
+
+        Args:
+            prompts: The prompts to count tokens in
+            model: Optional model to count for (defaults to the counter's model)
+
+        Returns:
+            Token counts in input order
+        """
+        return self.engine.count_batch(prompts, model or self.model)
 
     def count_with_model(self, prompt: str, model: str = "gpt-4") -> Dict[str, Any]:
         """Count tokens in a prompt using a specific model.
@@ -50,12 +379,11 @@ class TokenCounter:
         Returns:
             Dictionary containing token count and model info
         """
-        # TODO: Implement model-specific token counting
         return {
-            "token_count": self.count(prompt),
+            "token_count": self.count(prompt, model),
             "model": model,
-            "encoding": "cl100k_base",
-            "max_tokens": 8192,
+            "encoding": self.engine.encoding_name_for_model(model),
+            "max_tokens": _match_prefix(model, MODEL_CONTEXT_WINDOWS) or 8192,
         }
 
     def count_tokens(self, text: str) -> int:
@@ -67,54 +395,54 @@ class TokenCounter:
         Returns:
             int: Number of tokens.
         """
-        # Simple whitespace-based tokenization
-        tokens = text.split()
-        token_count = len(tokens)
-
-        # Calculate token distribution
-        distribution: Dict[str, int] = defaultdict(int)
-        for token in tokens:
-            distribution[token] += 1
+        token_count = self.count(text)
 
         result = TokenCount(
-            text=text,
+            text_length=len(text),
             total_tokens=token_count,
-            token_distribution=dict(distribution),
+            token_distribution=dict(Counter(text.split())) if self.track_words else {},
             metadata={
-                "tokenization_method": "whitespace",
+                "tokenization_method": self.engine.encoding_name_for_model(self.model),
                 "timestamp": self._get_timestamp(),
             },
         )
 
-        self.count_history.append(result)
+        # Only the opt-in spill file keeps the text itself.
+        spill_record = None
+        if self.count_history.spill_path is not None:
+            spill_record = {"text": text, **to_record(result)}
+        self.count_history.append(result, spill_record=spill_record)
         return token_count
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics for the shared token count cache.
+
+        Returns:
+            Dict[str, Any]: Cache statistics.
+        """
+        return self.engine.cache.get_stats()
+
     def get_count_stats(self) -> Dict[str, Any]:
         """Get statistics about token counts.
 
+        Totals and averages cover every count. With ``track_words`` enabled,
+        word frequencies cover the counts retained in memory.
+
         Returns:
             Dict[str, Any]: Token count statistics.
         """
         if not self.count_history:
             return {}
 
-        total_counts = len(self.count_history)
-        avg_tokens = sum(r.total_tokens for r in self.count_history) / total_counts
-
-        # Calculate token frequency distribution
-        token_freq: Dict[str, int] = defaultdict(int)
-        for result in self.count_history:
-            for token, count in result.token_distribution.items():
-                token_freq[token] += count
-
-        return {
-            "total_counts": total_counts,
-            "average_tokens": avg_tokens,
-            "unique_tokens": len(token_freq),
-            "most_common_tokens": sorted(
-                token_freq.items(), key=lambda x: x[1], reverse=True
-            )[:10],
+        stats: Dict[str, Any] = {
+            "total_counts": self.count_history.total,
+            "average_tokens": self.count_history.mean("total_tokens"),
         }
+        if self.track_words:
+            word_freq = self.count_history.window_tallies["words"]
+            stats["unique_tokens"] = len(word_freq)
+            stats["most_common_tokens"] = word_freq.most_common(10)
+        return stats
 
     def export_count_history(self, output_path: Path) -> None:
         """Export count history to a file.
@@ -126,7 +454,7 @@ class TokenCounter:
             "statistics": self.get_count_stats(),
             "counts": [
                 {
-                    "text_length": len(result.text),
+                    "text_length": result.text_length,
                     "total_tokens": result.total_tokens,
                     "token_distribution": result.token_distribution,
                     "metadata": result.metadata,
@@ -0,0 +1,69 @@
+"""
+Test suite for the fast (regex) analysis mode of PromptAnalyzer.
+"""
+
+from pathlib import Path
+
+import pytest
+import spacy
+
+from prompt_efficiency_suite.analyzer import PromptAnalyzer
+from prompt_efficiency_suite.nlp_pool import clear_nlp_cache
+from prompt_efficiency_suite.streaming import read_jsonl
+
+CORPUS_PATH = Path(__file__).parent / "data" / "analysis_corpus.jsonl"
+
+
+@pytest.fixture
+def corpus():
+    """Load the analysis fixture corpus."""
+    return list(read_jsonl(CORPUS_PATH))
+
+
+@pytest.fixture
+def spacy_analyzer(tmp_path):
+    """Create a spaCy-mode analyzer over spaCy's English tokenizer rules."""
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    path = tmp_path / "pipeline"
+    nlp.to_disk(path)
+    clear_nlp_cache()
+    yield PromptAnalyzer(model_name=str(path), features=["tokens", "sentences"])
+    clear_nlp_cache()
+
+
+def test_fast_mode_does_not_load_spacy():
+    """Test that fast mode never touches the spaCy pipeline."""
+    analyzer = PromptAnalyzer(model_name="missing-model", analysis_mode="fast")
+    result = analyzer.analyze("Hello there. How are you?")
+
+    assert result.token_count == 7
+    assert result.word_count == 5
+    assert result.sentence_count == 2
+    assert result.key_phrases == []
+
+
+def test_invalid_mode():
+    """Test that unknown analysis modes are rejected."""
+    with pytest.raises(ValueError):
+        PromptAnalyzer(analysis_mode="slow")
+
+
+def test_fast_mode_matches_spacy(corpus, spacy_analyzer):
+    """Cross-check fast counts against the spaCy path on the fixture corpus."""
+    fast = PromptAnalyzer(analysis_mode="fast").batch_analyze(corpus)
+    full = spacy_analyzer.batch_analyze(corpus)
+
+    for fast_result, spacy_result in zip(fast, full):
+        assert fast_result.token_count == spacy_result.token_count
+        assert fast_result.word_count == spacy_result.word_count
+        assert fast_result.sentence_count == spacy_result.sentence_count
+        assert fast_result.readability_score == pytest.approx(
+            spacy_result.readability_score
+        )
+        assert fast_result.complexity_score == pytest.approx(
+            spacy_result.complexity_score
+        )
+        assert fast_result.redundancy_score == pytest.approx(
+            spacy_result.redundancy_score
+        )
@@ -0,0 +1,145 @@
+"""
+Test suite for token-budget trimming.
+"""
+
+import itertools
+import json
+import random
+
+import pytest
+
+from app.trimmer.domain_aware import DomainAwareTrimmer as AppTrimmer
+from prompt_efficiency_suite import budget_trimming
+from prompt_efficiency_suite.budget_trimming import (
+    fit_to_budget,
+    select_spans,
+    split_spans,
+)
+from prompt_efficiency_suite.domain_aware_trimmer import DomainAwareTrimmer
+from prompt_efficiency_suite.token_counter import get_token_engine
+
+TEXT = (
+    "Thanks for reaching out about this. "
+    "The REST API endpoint must return a JSON response within 200 ms. "
+    "We had a nice weekend and the weather was lovely.\n"
+    "Every HTTP request needs an auth header.\n"
+    "Let me know if anything else comes up!"
+)
+
+
+@pytest.fixture
+def trimmer(tmp_path):
+    """Create a trimmer with a weighted API domain."""
+    path = tmp_path / "api.json"
+    path.write_text(
+        json.dumps(
+            {
+                "terms": ["API", "endpoint", "request", "response"],
+                "compound_terms": ["REST API", "HTTP request", "JSON response"],
+                "weights": {"REST API": 3.0, "HTTP request": 2.0},
+            }
+        )
+    )
+    trimmer = DomainAwareTrimmer()
+    trimmer.load_domain("api", path)
+    return trimmer
+
+
+def test_split_spans_covers_text():
+    """Test that spans are contiguous and cover the whole text."""
+    spans = split_spans(TEXT)
+    assert "".join(TEXT[start:end] for start, end in spans) == TEXT
+    assert all(a[1] == b[0] for a, b in zip(spans, spans[1:]))
+    assert len(spans) == 5
+
+
+def test_knapsack_is_optimal():
+    """Test exact selection against brute force on small random inputs."""
+    rng = random.Random(7)
+    for _ in range(200):
+        n = rng.randint(0, 7)
+        values = [rng.choice([0.0, 0.5, 1.0, 2.5, 4.0]) for _ in range(n)]
+        costs = [rng.randint(1, 9) for _ in range(n)]
+        budget = rng.randint(0, 20)
+
+        chosen = select_spans(values, costs, budget)
+        assert chosen == sorted(chosen)
+        assert sum(costs[i] for i in chosen) <= budget
+        best = max(
+            sum(values[i] for i in subset)
+            for r in range(n + 1)
+            for subset in itertools.combinations(range(n), r)
+            if sum(costs[i] for i in subset) <= budget
+        )
+        assert sum(values[i] for i in chosen) == pytest.approx(best)
+
+
+def test_greedy_fallback(monkeypatch):
+    """Test that large tables fall back to density-ordered selection."""
+    monkeypatch.setattr(budget_trimming, "MAX_KNAPSACK_CELLS", 0)
+    assert select_spans([1.0, 5.0, 3.0], [1, 5, 1], 2) == [0, 2]
+
+
+class JunctionEngine:
+    """Engine that charges one extra token wherever two sentences meet."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def count(self, text, model=None):
+        self.calls += 1
+        return len(text.split()) + max(text.count(".") - 1, 0)
+
+    def count_batch(self, texts, model=None):
+        return [len(t.split()) + max(t.count(".") - 1, 0) for t in texts]
+
+
+def test_fit_to_budget_drops_by_cached_costs():
+    """Test that boundary overruns are fixed without re-counting per span."""
+    engine = JunctionEngine()
+    text = " ".join(f"word{i} and more." for i in range(50))
+
+    result = fit_to_budget(text, 60, lambda spans: [1.0] * len(spans), engine=engine)
+    assert result.token_count <= 60
+    assert engine.count(result.text) == result.token_count
+    assert engine.calls <= 4
+    assert len(result.spans) + len(result.dropped_spans) == 50
+
+
+def test_trim_to_budget(trimmer):
+    """Test that the most valuable sentences are kept, in order, within budget."""
+    engine = get_token_engine()
+    budget = engine.count(TEXT) // 2
+    result = trimmer.trim_to_budget(TEXT, "api", max_tokens=budget)
+
+    assert result.trimmed_tokens <= budget
+    assert engine.count(result.trimmed_text) == result.trimmed_tokens
+    assert result.original_tokens == engine.count(TEXT)
+    assert "REST API endpoint" in result.trimmed_text
+    assert "weather" not in result.trimmed_text
+    assert "REST API" in result.preserved_terms
+    assert result.metadata["max_tokens"] == budget
+
+    kept = [s for s in split_spans(TEXT) if TEXT[s[0] : s[1]] in result.trimmed_text]
+    assert kept == sorted(kept)
+
+
+def test_trim_to_budget_fits_already(trimmer):
+    """Test that a prompt within budget is returned unchanged."""
+    result = trimmer.trim_to_budget(TEXT, "api", max_tokens=10_000)
+    assert result.trimmed_text == TEXT
+    assert result.removed_terms == []
+    assert result.compression_ratio == 1.0
+
+
+def test_app_trim_to_budget(tmp_path):
+    """Test that the app trimmer ranks sentences by dictionary importance."""
+    (tmp_path / "legal.json").write_text(
+        json.dumps({"contract": 0.9, "breach": 0.9, "weather": 0.1})
+    )
+    trimmer = AppTrimmer(dictionary_path=str(tmp_path))
+    prompt = "The weather is nice. A breach of contract occurred. Thanks."
+    budget = trimmer.get_token_count("A breach of contract occurred.")
+
+    trimmed = trimmer.trim_to_budget(prompt, "legal", max_tokens=budget)
+    assert trimmed == "A breach of contract occurred."
@@ -0,0 +1,125 @@
+"""
+Test suite for the BulkOptimizer class.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from prompt_efficiency_suite.analyzer import FAST_MODE, PromptAnalyzer
+from prompt_efficiency_suite.bulk_optimizer import BulkOptimizer, prompt_id
+from prompt_efficiency_suite.code_aware_compressor import CodeAwareCompressor
+from prompt_efficiency_suite.metrics import MetricsTracker
+
+
+class RecordingAnalyzer(PromptAnalyzer):
+    """Fast analyzer that records its threads and peak concurrency."""
+
+    def __init__(self, delay=0.0):
+        super().__init__(analysis_mode=FAST_MODE)
+        self.delay = delay
+        self.threads = set()
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def analyze(self, text):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        self.threads.add(threading.current_thread().name)
+        threading.Event().wait(self.delay)
+        with self._lock:
+            self.active -= 1
+        return super().analyze(text)
+
+
+def make_optimizer(analyzer=None, **options):
+    """Create a bulk optimizer around a code-aware compressor."""
+    return BulkOptimizer(
+        CodeAwareCompressor(),
+        analyzer or PromptAnalyzer(analysis_mode=FAST_MODE),
+        MetricsTracker(),
+        **options,
+    )
+
+
+@pytest.fixture
+def prompts():
+    """Create prompts where one is too repetitive to pass the quality bar."""
+    return [
+        "Please   summarize the quarterly report for the board.",
+        "again again again again again again",
+        "Explain  how the   cache eviction policy works.",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_optimize_batch(prompts):
+    """Test results keep input order and low-quality prompts are filtered."""
+    optimizer = make_optimizer()
+    results = await optimizer.optimize_batch(prompts)
+
+    assert [r["compression"].compressed_text for r in results] == [
+        "Summarize the quarterly report for the board.",
+        "Explain how the cache eviction policy works.",
+    ]
+    assert results[0]["metrics"].prompt_id == prompt_id(prompts[0])
+    assert optimizer.get_optimization_stats()["total_prompts"] == 3
+    optimizer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_analysis_runs_on_bounded_workers():
+    """Test analysis leaves the event loop and honors max_in_flight."""
+    analyzer = RecordingAnalyzer(delay=0.01)
+    optimizer = make_optimizer(analyzer, max_workers=8, max_in_flight=3)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.002)
+
+    task = asyncio.create_task(ticker())
+    results = await optimizer.optimize_batch([f"prompt number {i}" for i in range(30)])
+    task.cancel()
+
+    assert len(results) == 30
+    assert analyzer.peak <= 3
+    assert threading.current_thread().name not in analyzer.threads
+    assert ticks > 10
+    optimizer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_iter_optimized_streams_lazily():
+    """Test results stream back as they finish and closing stops the input."""
+    optimizer = make_optimizer(max_in_flight=2)
+    consumed = []
+
+    def source():
+        for i in range(1000):
+            consumed.append(i)
+            yield f"prompt {i}"
+
+    stream = optimizer.iter_optimized(source(), min_quality_score=0.0)
+    seen = [await stream.__anext__() for _ in range(3)]
+    await stream.aclose()
+
+    assert all(result is not None for _, result in seen)
+    assert len(consumed) < 10
+    optimizer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_workers(prompts):
+    """Test analysis in worker processes gives the same results."""
+    optimizer = make_optimizer(max_workers=2, use_processes=True)
+    results = await optimizer.optimize_batch(prompts)
+    optimizer.shutdown()
+
+    expected = await make_optimizer().optimize_batch(prompts)
+    assert [r["analysis"] for r in results] == [r["analysis"] for r in expected]
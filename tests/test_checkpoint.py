@@ -0,0 +1,189 @@
+"""
+Test suite for checkpoint journals, progress reporting and resumable batches.
+"""
+
+import json
+
+import pytest
+
+from prompt_efficiency_suite.analyzer import FAST_MODE, PromptAnalyzer
+from prompt_efficiency_suite.batch_optimizer import BatchOptimizer
+from prompt_efficiency_suite.bulk_optimizer import BulkOptimizer
+from prompt_efficiency_suite.checkpoint import (
+    STATUS_FAILED,
+    STATUS_OK,
+    STATUS_REJECTED,
+    CheckpointJournal,
+    ProgressTracker,
+    prompt_id,
+)
+from prompt_efficiency_suite.code_aware_compressor import CodeAwareCompressor
+from prompt_efficiency_suite.metrics import MetricsTracker
+
+
+class CountingCompressor(CodeAwareCompressor):
+    """Code-aware compressor that counts calls and fails on request."""
+
+    def __init__(self, fail_on=()):
+        super().__init__()
+        self.calls = 0
+        self.fail_on = set(fail_on)
+
+    def compress_sync(self, text, target_ratio=None):
+        self.calls += 1
+        if text in self.fail_on:
+            raise RuntimeError(f"cannot compress {text!r}")
+        return super().compress_sync(text, target_ratio)
+
+
+def make_optimizer(compressor):
+    """Create a bulk optimizer with a fast analyzer."""
+    return BulkOptimizer(
+        compressor, PromptAnalyzer(analysis_mode=FAST_MODE), MetricsTracker()
+    )
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    """Path for a checkpoint journal."""
+    return tmp_path / "run" / "journal.jsonl"
+
+
+@pytest.fixture
+def prompts():
+    """Create distinct prompts for a batch."""
+    return [f"Describe   item number {i} in one sentence." for i in range(12)]
+
+
+def test_journal_replay(journal_path):
+    """Test that a reopened journal knows which items finished or failed."""
+    with CheckpointJournal(journal_path, sync_every=1) as journal:
+        journal.record("a", STATUS_OK, {"value": 1})
+        journal.record("b", STATUS_REJECTED)
+        journal.record("c", STATUS_FAILED, error="boom")
+
+    journal = CheckpointJournal(journal_path)
+    assert journal.finished == {"a", "b"}
+    assert journal.failures == {"c": "boom"}
+    assert list(journal.iter_results()) == [("a", {"value": 1})]
+
+    journal.record("c", STATUS_OK, {"value": 3})
+    journal.close()
+    assert CheckpointJournal(journal_path).failures == {}
+
+
+def test_journal_survives_truncated_write(journal_path):
+    """Test that a partial last line is ignored and not appended onto."""
+    with CheckpointJournal(journal_path) as journal:
+        journal.record("a", STATUS_OK, 1)
+    with open(journal_path, "a") as f:
+        f.write('{"key": "b", "sta')
+
+    journal = CheckpointJournal(journal_path)
+    assert journal.finished == {"a"}
+    journal.record("c", STATUS_OK, 3)
+    journal.close()
+
+    lines = journal_path.read_text().splitlines()
+    assert json.loads(lines[-1])["key"] == "c"
+    assert CheckpointJournal(journal_path).finished == {"a", "c"}
+
+
+def test_progress_reports_throughput_and_eta(monkeypatch):
+    """Test that reports are throttled and estimate the remaining time."""
+    clock = iter([0.0, 1.0, 1.5, 2.0, 2.0])
+    monkeypatch.setattr("time.monotonic", lambda: next(clock))
+    reports = []
+
+    tracker = ProgressTracker(reports.append, total=10, interval=1.0)
+    tracker.skip()
+    tracker.advance()
+    tracker.advance(failed=True)
+    tracker.finish()
+
+    assert len(reports) == 2
+    report = reports[-1]
+    assert (report.completed, report.failed, report.skipped) == (2, 1, 1)
+    assert report.throughput == 1.0
+    assert report.eta == 7.0
+
+
+@pytest.mark.asyncio
+async def test_bulk_resume_skips_finished_prompts(journal_path, prompts):
+    """Test that a restarted bulk run only optimizes unfinished prompts."""
+    first = CountingCompressor(fail_on=[prompts[3]])
+    with CheckpointJournal(journal_path) as journal:
+        await make_optimizer(first).optimize_batch(prompts[:6], journal=journal)
+    assert first.calls == 6
+
+    reports = []
+    second = CountingCompressor()
+    with CheckpointJournal(journal_path) as journal:
+        assert journal.failures.keys() == {prompt_id(prompts[3])}
+        results = await make_optimizer(second).optimize_batch(
+            prompts, journal=journal, progress=reports.append
+        )
+
+    assert second.calls == 7
+    assert [r["compression"].compressed_text for r in results] == [
+        " ".join(prompt.split()) for prompt in prompts
+    ]
+    assert (reports[-1].skipped, reports[-1].completed) == (5, 7)
+
+
+@pytest.mark.asyncio
+async def test_bulk_repeated_prompts_are_restored(journal_path, prompts):
+    """Test that a repeat of a prompt journaled earlier in the batch is kept."""
+    compressor = CountingCompressor()
+    optimizer = BulkOptimizer(
+        compressor,
+        PromptAnalyzer(analysis_mode=FAST_MODE),
+        MetricsTracker(),
+        max_in_flight=1,
+    )
+    batch = [prompts[0], prompts[1], prompts[0]]
+
+    with CheckpointJournal(journal_path) as journal:
+        results = await optimizer.optimize_batch(batch, journal=journal)
+
+    assert compressor.calls == 2
+    assert len(results) == 3
+    assert results[2]["compression"] == results[0]["compression"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_failures_are_isolated(prompts):
+    """Test that one failing prompt does not lose the rest of the batch."""
+    optimizer = make_optimizer(CountingCompressor(fail_on=[prompts[0]]))
+    streamed = [item async for item in optimizer.iter_optimized(prompts[:3])]
+
+    assert sorted(index for index, _ in streamed) == [0, 1, 2]
+    assert dict(streamed)[0] is None
+    assert all(dict(streamed)[i] is not None for i in (1, 2))
+
+
+@pytest.mark.asyncio
+async def test_batch_optimizer_resume(journal_path, prompts, monkeypatch):
+    """Test that BatchOptimizer records failures and resumes from its journal."""
+    optimizer = BatchOptimizer(max_workers=2)
+    optimize = optimizer._optimize_single
+    calls = []
+
+    def flaky(prompt, params):
+        calls.append(prompt)
+        if prompt == prompts[1] and len(calls) <= len(prompts):
+            raise ValueError("transient")
+        return optimize(prompt, params)
+
+    monkeypatch.setattr(optimizer, "_optimize_single", flaky)
+
+    with CheckpointJournal(journal_path) as journal:
+        first = await optimizer.optimize_batch_async(prompts, journal=journal)
+    assert len(first) == len(prompts) - 1
+
+    with CheckpointJournal(journal_path) as journal:
+        second = await optimizer.optimize_batch_async(prompts, journal=journal)
+
+    assert calls[len(prompts) :] == [prompts[1]]
+    assert [r.original_prompt for r in second] == prompts
+    assert second[0] == first[0]
@@ -1,5 +1,8 @@
 import pytest
 
+from prompt_efficiency_suite.base_compressor import (
+    CompressionResult as TokenCompressionResult,
+)
 from prompt_efficiency_suite.code_aware_compressor import (
     CodeAwareCompressor,
     CompressionResult,
@@ -193,3 +196,121 @@ def test_compression_ratio(
     assert 0 < yaml_result.compression_ratio < 1
     assert 0 < python_result.compression_ratio < 1
     assert 0 < markdown_result.compression_ratio < 1
+
+
+def test_split_sections_recognizes_all_code_forms(compressor):
+    """Test that fenced, inline and indented code are split in one scan."""
+    prompt = "Run `make`:\n```sh\nmake all\n```\nthen\n    ./app --fast\ndone"
+    assert compressor._split_sections(prompt) == [
+        ("text", "Run "),
+        ("code", "`make`"),
+        ("text", ":\n"),
+        ("code", "```sh\nmake all\n```"),
+        ("text", "\nthen\n"),
+        ("code", "    ./app --fast"),
+        ("text", "\ndone"),
+    ]
+    assert compressor._extract_code_blocks(prompt) == [
+        "`make`",
+        "```sh\nmake all\n```",
+        "    ./app --fast",
+    ]
+
+
+def test_compress_keeps_code_verbatim(compressor):
+    """Test that prose is collapsed while every code form is kept as is."""
+    prompt = "  Call   `f(a,  b)`,, then...\n\n```py\nx  =  1\n```\nok!!  "
+    assert (
+        compressor.compress_prompt(prompt)
+        == "Call `f(a,  b)`, then. ```py\nx  =  1\n``` ok!"
+    )
+
+
+def test_compress_many(compressor):
+    """Test batch compression keeps input order."""
+    prompts = ["a   b", "`x  y`  z", "a   b"]
+    assert compressor.compress_many(prompts) == ["a b", "`x  y` z", "a b"]
+    assert compressor.compress_many([]) == []
+
+
+@pytest.fixture
+def wordy_prompt():
+    return (
+        "Could you please   explain this function??  I would like you to "
+        "keep it short...\n\n```python\ndef add(a, b):\n    # add numbers\n"
+        "    return a + b\n```\n\n  Thanks!!  "
+    )
+
+
+@pytest.mark.asyncio
+async def test_compress_implements_base_compressor(compressor, wordy_prompt):
+    """Test that the async interface reports token counts for the full pipeline."""
+    result = await compressor.compress(wordy_prompt)
+
+    assert isinstance(result, TokenCompressionResult)
+    assert result.metadata["level"] == "code"
+    assert result.compressed_text == (
+        "Explain this function? Keep it short. "
+        "```python\ndef add(a,b):\n return a+b\n``` Thanks!"
+    )
+    assert result.original_tokens == compressor.count_tokens(wordy_prompt)
+    assert result.compressed_tokens < result.original_tokens
+    assert result.compression_ratio == compressor.calculate_compression_ratio(
+        result.original_tokens, result.compressed_tokens
+    )
+
+
+@pytest.mark.asyncio
+async def test_compress_stops_at_first_level_meeting_target(compressor, wordy_prompt):
+    """Test that milder levels are preferred when they already save enough."""
+    mild = await compressor.compress(wordy_prompt, target_ratio=0.01)
+    strong = await compressor.compress(wordy_prompt, target_ratio=0.99)
+    unchanged = await compressor.compress(wordy_prompt, target_ratio=0.0)
+
+    assert mild.metadata["level"] == "whitespace"
+    assert mild.metadata["target_met"]
+    assert "# add numbers" in mild.compressed_text
+    assert strong.metadata["level"] == "code"
+    assert not strong.metadata["target_met"]
+    assert unchanged.metadata["level"] == "none"
+    assert unchanged.compressed_text == wordy_prompt
+
+
+def test_only_changed_sections_are_recounted(compressor, wordy_prompt, monkeypatch):
+    """Test that token counts are kept per section between levels."""
+    counted = []
+    count_tokens = compressor.count_tokens
+    monkeypatch.setattr(
+        compressor,
+        "count_tokens",
+        lambda text: counted.append(text) or count_tokens(text),
+    )
+
+    compressor.compress_sync("```\nfixed\n```  and  more", target_ratio=None)
+    assert counted.count("```\nfixed\n```") == 1
+    assert counted.count(" and more") == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_compress(compressor):
+    """Test that batch results keep input order."""
+    results = await compressor.batch_compress(["a   b", "in order to  win"], 0.5)
+    assert [r.compressed_text for r in results] == ["a b", "to win"]
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("It is not very accurate.", "It is not very accurate."),
+        ("Do not simply copy it; actually verify it.", None),
+        ("It was a just outcome.", None),
+        ("Do what you please.", None),
+        ("Summarize it, please.", "Summarize it."),
+        ("Please, review it. Can you please  fix it?", "Review it. Fix it?"),
+        ("Due to the fact that it failed, retry.", "Because it failed, retry."),
+    ],
+)
+def test_filler_level_keeps_meaning(compressor, text, expected):
+    """Test that only meaning-preserving filler rewrites are made."""
+    result = compressor.compress_sync(text)
+    assert result.compressed_text == (expected or text)
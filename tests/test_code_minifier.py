@@ -0,0 +1,164 @@
+"""
+Test suite for token-level code minification.
+"""
+
+import ast
+import textwrap
+
+import pytest
+
+from prompt_efficiency_suite.code_aware_compressor import CodeAwareCompressor
+from prompt_efficiency_suite.code_minifier import (
+    CodeMinifier,
+    minify_c_style,
+    minify_python,
+)
+
+PYTHON_SOURCE = textwrap.dedent('''
+    """Module docstring."""
+    import os  # operating system
+
+
+    def compute_total(items, *, scale=1.0):
+        """Sum scaled items."""
+        running_total = 0
+        for current_item in items:
+            # accumulate
+            running_total += current_item * scale
+        squares = [value**2 for value in items if value > running_total]
+        return running_total, squares
+
+
+    class Empty:
+        """Only a docstring."""
+
+
+    def inline(): "doc"; return (1 .real,
+                                 2)
+    ''')
+
+
+def run(source):
+    """Execute source and return its namespace."""
+    namespace = {}
+    exec(compile(source, "<minified>", "exec"), namespace)
+    return namespace
+
+
+def test_minify_python_keeps_semantics():
+    """Test that comments and whitespace go while the AST stays identical."""
+    minified = minify_python(PYTHON_SOURCE)
+
+    assert "#" not in minified
+    assert "\n\n" not in minified
+    assert "\n running_total=0\n" in minified
+    assert ast.dump(ast.parse(minified)) == ast.dump(ast.parse(PYTHON_SOURCE))
+
+
+def test_strip_docstrings():
+    """Test that docstrings are removed and empty bodies get ``pass``."""
+    minified = minify_python(PYTHON_SOURCE, strip_docstrings=True)
+
+    assert "docstring" not in minified
+    assert "class Empty:\n pass" in minified
+    assert "def inline():return" in minified
+    assert run(minified)["inline"]() == (1, 2)
+
+
+def test_rename_locals():
+    """Test that locals shrink while parameters and behavior are kept."""
+    minified = minify_python(PYTHON_SOURCE, rename_locals=True)
+
+    assert "running_total" not in minified
+    assert "current_item" not in minified
+    assert "compute_total(items,*,scale=1.0)" in minified
+    original = run(PYTHON_SOURCE)["compute_total"]([1, 5, 9], scale=2)
+    assert run(minified)["compute_total"]([1, 5, 9], scale=2) == original
+
+
+def test_rename_skips_unsafe_functions():
+    """Test that functions with nested scopes or introspection are untouched."""
+    source = textwrap.dedent("""
+        def outer():
+            counter = 0
+            def inner():
+                return counter
+            return inner
+
+        def introspect():
+            value = 1
+            return locals()
+        """)
+    minified = minify_python(source, rename_locals=True)
+
+    assert "counter" in minified
+    assert run(minified)["introspect"]() == {"value": 1}
+
+
+def test_keep_comments():
+    """Test that kept comments do not swallow the following code."""
+    minified = minify_python(PYTHON_SOURCE, strip_comments=False)
+
+    assert "# operating system" in minified
+    assert ast.dump(ast.parse(minified)) == ast.dump(ast.parse(PYTHON_SOURCE))
+
+
+def test_minify_c_style():
+    """Test comment and whitespace removal that respects string literals."""
+    code = textwrap.dedent("""
+        // leading comment
+        const url = "http://example.com//path";  // trailing
+        const re = /\\/\\//g;
+        function f(a,   b) {
+            /* block
+               comment */
+            return `keep   ${a}
+                spacing`;
+        }
+        """)
+    assert minify_c_style(code, "js") == (
+        'const url = "http://example.com//path";\n'
+        "const re = /\\/\\//g;\n"
+        "function f(a, b) {\n"
+        "return `keep   ${a}\n"
+        "        spacing`;\n"
+        "}"
+    )
+
+
+def test_minifier_cache():
+    """Test that repeated blocks are served from the cache."""
+    minifier = CodeMinifier(cache_size=1)
+    block = "```python\nx  =  1   # set x\n```"
+
+    assert minifier.minify_block(block) == "```python\nx=1\n```"
+    assert minifier.minify_block(block) == "```python\nx=1\n```"
+    assert minifier.stats.hits == 1
+
+    minifier.minify("y = 2")
+    minifier.minify("x  =  1   # set x")
+    assert minifier.stats.evictions == 2
+
+
+@pytest.mark.parametrize(
+    "block",
+    [
+        "```python\ndef broken(:\n```",
+        "```\nplain   text\n```",
+        "```haskell\nmain = print  1\n```",
+    ],
+)
+def test_unsupported_blocks_unchanged(block):
+    """Test that invalid or unknown code is passed through as is."""
+    assert CodeMinifier().minify_block(block) == block
+
+
+def test_code_aware_compressor_minifies_blocks():
+    """Test that the compressor minifies fenced code when configured."""
+    prompt = "Fix   this:\n```py\nif ok:\n    run()  # go\n```\nThanks!!"
+    compressor = CodeAwareCompressor(code_minifier=CodeMinifier())
+
+    assert compressor.compress_prompt(prompt) == (
+        "Fix this: ```py\nif ok:\n run()\n``` Thanks!"
+    )
+    assert CodeAwareCompressor().compress_prompt(prompt).count("    run()  # go") == 1
@@ -0,0 +1,165 @@
+"""
+Test suite for the columnar metrics store.
+"""
+
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pytest
+
+from prompt_efficiency_suite.columnar import ColumnarStore
+from prompt_efficiency_suite.metrics import EfficiencyMetrics, MetricsTracker
+
+
+@dataclass
+class Sample:
+    """Simple result for testing."""
+
+    latency: float
+    tokens: int
+    model: str
+
+
+@pytest.fixture
+def store():
+    """Create a small ColumnarStore that must grow several times."""
+    store = ColumnarStore(
+        columns={"latency": lambda s: s.latency, "tokens": lambda s: s.tokens},
+        groups={"model": lambda s: s.model},
+        initial_capacity=2,
+    )
+    store.extend(
+        Sample(latency=float(i), tokens=10 * i, model="a" if i % 2 else "b")
+        for i in range(10)
+    )
+    return store
+
+
+def test_columns_and_growth(store):
+    """Test that rows survive resizing in insertion order."""
+    assert len(store) == 10
+    np.testing.assert_array_equal(store.column("latency"), np.arange(10.0))
+    with pytest.raises(ValueError):
+        store.column("latency")[0] = 1.0
+
+
+def test_vectorized_statistics(store):
+    """Test means, percentiles, histograms and summaries."""
+    assert store.means() == {"latency": 4.5, "tokens": 45.0}
+    assert store.sum("tokens") == 450.0
+    assert store.percentiles("latency", [0, 50, 100]) == {0: 0.0, 50: 4.5, 100: 9.0}
+    assert store.histogram("latency", bins=2)["counts"] == [5, 5]
+
+    summary = store.describe("latency")
+    assert summary["count"] == 10
+    assert summary["min"] == 0.0
+    assert summary["max"] == 9.0
+    assert summary["p90"] == pytest.approx(8.1)
+
+
+def test_group_by(store):
+    """Test per-group counts and means."""
+    assert store.group_counts("model") == {"b": 5, "a": 5}
+    assert store.group_means("latency", "model") == {"b": 4.0, "a": 5.0}
+
+
+def test_clear(store):
+    """Test that clearing drops rows and categories."""
+    store.clear()
+    assert len(store) == 0
+    assert store.means() == {}
+    assert store.group_counts("model") == {}
+
+
+def test_capacity_keeps_recent_rows_and_all_time_totals():
+    """Test that a full store overwrites its oldest rows but keeps totals."""
+    store = ColumnarStore(
+        columns={"latency": lambda s: s.latency},
+        groups={"model": lambda s: s.model},
+        initial_capacity=2,
+        capacity=4,
+    )
+    for i in range(7):
+        store.append(Sample(latency=float(i), tokens=0, model="a" if i < 5 else "b"))
+    store.extend(Sample(latency=float(i), tokens=0, model="c") for i in range(7, 10))
+
+    assert (len(store), store.total) == (4, 10)
+    np.testing.assert_array_equal(store.column("latency"), [6.0, 7.0, 8.0, 9.0])
+    assert store.group_counts("model") == {"b": 1, "c": 3}
+    assert store.means() == {"latency": 4.5}
+    assert (store.minimum("latency"), store.maximum("latency")) == (0.0, 9.0)
+    assert store.describe("latency")["count"] == 4
+
+    store.extend(Sample(latency=float(i), tokens=0, model="d") for i in range(10, 16))
+    np.testing.assert_array_equal(store.column("latency"), [12.0, 13.0, 14.0, 15.0])
+    assert store.group_counts("model") == {"d": 4}
+
+
+def test_concurrent_reads_see_only_recorded_rows():
+    """Test that readers never observe rows still being allocated."""
+    store = ColumnarStore(columns={"value": lambda v: v}, initial_capacity=1)
+    done = threading.Event()
+    seen = []
+
+    def read():
+        while not done.is_set():
+            seen.append(bool((store.column("value") == 1.0).all()))
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for _ in range(2000):
+        store.extend([1.0] * 7)
+    done.set()
+    reader.join()
+
+    assert all(seen)
+    assert store.mean("value") == 1.0
+
+
+def test_metrics_tracker_distributions_and_groups():
+    """Test MetricsTracker statistics backed by the columnar store."""
+    tracker = MetricsTracker()
+    for i in range(6):
+        tracker.add_metrics(
+            EfficiencyMetrics(
+                prompt_id=str(i),
+                token_count=100,
+                cost=0.01 * (i + 1),
+                latency=float(i),
+                success_rate=1.0,
+                quality_score=0.5,
+                metadata={"model": "gpt-4" if i < 4 else "claude"},
+            )
+        )
+
+    distribution = tracker.get_metric_distribution("latency", bins=3)
+    assert distribution["summary"]["p50"] == pytest.approx(2.5)
+    assert distribution["histogram"]["counts"] == [2, 2, 2]
+
+    by_model = tracker.get_metrics_by_group("model")
+    assert by_model["gpt-4"]["count"] == 4
+    assert by_model["claude"]["avg_latency"] == pytest.approx(4.5)
+    assert tracker.get_metrics_by_group("domain")["unknown"]["count"] == 6
+
+
+def test_metrics_tracker_totals_outlive_the_store_window():
+    """Test that summary totals count every metric, not just retained rows."""
+    tracker = MetricsTracker(history_size=2, store_size=3)
+    for i in range(5):
+        tracker.add_metrics(
+            EfficiencyMetrics(
+                prompt_id=str(i),
+                token_count=10,
+                cost=1.0,
+                latency=float(i),
+                success_rate=1.0,
+                quality_score=1.0,
+            )
+        )
+
+    summary = tracker.get_metrics_summary()
+    assert summary["total_prompts"] == 5
+    assert summary["total_tokens"] == 50
+    assert (summary["min_latency"], summary["max_latency"]) == (0.0, 4.0)
+    assert tracker.get_metric_distribution("latency")["summary"]["count"] == 3
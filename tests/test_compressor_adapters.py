@@ -0,0 +1,171 @@
+"""
+Test suite for executor-backed async compressors.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from prompt_efficiency_suite.base_compressor import (
+    CompressionResult,
+    ExecutorCompressor,
+    get_shared_executor,
+)
+from prompt_efficiency_suite.code_aware_compressor import CodeAwareCompressor
+from prompt_efficiency_suite.compressor_adapters import (
+    DomainAwareCompressorAdapter,
+    MultimodalCompressorAdapter,
+)
+from prompt_efficiency_suite.domain_aware_trimmer import DomainAwareTrimmer
+
+
+class RecordingCompressor(ExecutorCompressor):
+    """Upper-cases text slowly while recording threads and concurrency."""
+
+    def __init__(self, delay=0.0, **options):
+        super().__init__(**options)
+        self.delay = delay
+        self.threads = set()
+        self.compressed = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def compress_sync(self, text, target_ratio=None):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        self.compressed.append(text)
+        with self._lock:
+            self.active -= 1
+        return CompressionResult(
+            original_tokens=1,
+            compressed_tokens=1,
+            compression_ratio=0.0,
+            compressed_text=text.upper(),
+            metadata={},
+        )
+
+
+@pytest.fixture
+def executor():
+    """Create a private executor with more threads than the concurrency limit."""
+    pool = ThreadPoolExecutor(max_workers=8)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_work_runs_off_the_event_loop():
+    """Test that compression happens on the shared executor's threads."""
+    compressor = RecordingCompressor()
+    result = await compressor.compress("abc")
+
+    assert result.compressed_text == "ABC"
+    assert compressor.executor is get_shared_executor()
+    assert compressor.threads and threading.current_thread().name not in (
+        compressor.threads
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_keeps_order_and_limits_concurrency(executor):
+    """Test chunked batches honor max_concurrency and return results in order."""
+    compressor = RecordingCompressor(
+        delay=0.01, executor=executor, max_concurrency=2, chunk_size=3
+    )
+    texts = [f"text {i}" for i in range(20)]
+
+    results = await compressor.batch_compress(texts)
+
+    assert [r.compressed_text for r in results] == [t.upper() for t in texts]
+    assert compressor.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive(executor):
+    """Test that other coroutines keep running during a batch."""
+    compressor = RecordingCompressor(delay=0.01, executor=executor, chunk_size=5)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    await compressor.batch_compress(["x"] * 40)
+    task.cancel()
+
+    assert ticks > 5
+
+
+@pytest.mark.asyncio
+async def test_cancellation_stops_pending_chunks(executor):
+    """Test that cancelling a batch stops chunks that have not finished."""
+    compressor = RecordingCompressor(
+        delay=0.02, executor=executor, max_concurrency=1, chunk_size=2
+    )
+    batch = asyncio.create_task(compressor.batch_compress(["x"] * 50))
+    await asyncio.sleep(0.05)
+    batch.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await batch
+    await asyncio.sleep(0.1)
+    assert len(compressor.compressed) < 10
+
+
+def test_invalid_options():
+    """Test that limits below one are rejected."""
+    with pytest.raises(ValueError):
+        RecordingCompressor(max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_code_aware_batch(executor):
+    """Test that the code-aware compressor batches through the executor."""
+    compressor = CodeAwareCompressor(executor=executor, chunk_size=2)
+    results = await compressor.batch_compress(["a   b", "c  ,,  d", "e"])
+
+    assert [r.compressed_text for r in results] == ["a b", "c , d", "e"]
+
+
+@pytest.mark.asyncio
+async def test_multimodal_adapter():
+    """Test that multimodal results are reported in tokens."""
+    adapter = MultimodalCompressorAdapter()
+    result = await adapter.compress("Look   at   this ![chart](chart.png)  now", 0.1)
+
+    assert result.compressed_text == "Look at this ![chart](chart.png) now"
+    assert result.metadata["media_count"] == 1
+    assert result.compressed_tokens <= result.original_tokens
+
+
+@pytest.mark.asyncio
+async def test_domain_adapter_meets_token_budget():
+    """Test that a target ratio becomes a token budget for the trimmer."""
+    trimmer = DomainAwareTrimmer()
+    trimmer.add_domain_terms("api", ["endpoint", "token"])
+    adapter = DomainAwareCompressorAdapter(trimmer, "api", chunk_size=1)
+    text = (
+        "The weather was pleasant all week long. "
+        "Call the endpoint with a bearer token. "
+        "Lunch options near the office were limited."
+    )
+
+    results = await adapter.batch_compress([text, text], target_ratio=0.5)
+
+    for result in results:
+        assert "endpoint" in result.compressed_text
+        assert result.metadata["target_met"]
+        assert result.compressed_tokens <= result.original_tokens // 2
+
+    with pytest.raises(ValueError):
+        DomainAwareCompressorAdapter(trimmer, "missing")
@@ -0,0 +1,102 @@
+"""
+Test suite for hot-reloadable domain dictionaries.
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from app.trimmer.domain_aware import DomainAwareTrimmer
+from app.trimmer.registry import DictionaryRegistry
+from prompt_efficiency_suite.domain_bundle import compile_domain_bundle
+
+
+def write_dictionary(path, terms, age=0):
+    """Write a flat dictionary and set its mtime ``age`` seconds in the past."""
+    path.write_text(json.dumps(terms))
+    mtime_ns = time.time_ns() - int(age * 1e9)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def legal_path(tmp_path):
+    """Write an initial legal dictionary."""
+    path = tmp_path / "legal.json"
+    write_dictionary(path, {"contract": 0.9}, age=60)
+    return path
+
+
+def test_refresh_swaps_changed_dictionary(tmp_path, legal_path):
+    """Test that edits are picked up while old snapshots stay usable."""
+    registry = DictionaryRegistry(tmp_path)
+    before = registry.get("legal")
+    assert registry.refresh() == []
+
+    write_dictionary(legal_path, {"contract": 0.9, "breach": 0.8})
+    assert registry.refresh() == ["legal"]
+
+    after = registry.get("legal")
+    assert after.matcher.find_terms("breach of contract") == {"breach", "contract"}
+    assert before.matcher.find_terms("breach of contract") == {"contract"}
+    assert before.importance == {"contract": 0.9}
+
+
+def test_failed_reload_keeps_previous(tmp_path, legal_path):
+    """Test that a half-written file does not replace a working dictionary."""
+    registry = DictionaryRegistry(tmp_path)
+    registry.get("legal")
+
+    legal_path.write_text('{"contract": 0.9, "bre')
+    assert registry.refresh() == []
+    assert registry.get("legal").importance == {"contract": 0.9}
+
+
+def test_newest_source_wins(tmp_path, legal_path):
+    """Test that a bundle is used only while it is at least as new as the JSON."""
+    bundle_path = compile_domain_bundle({"clause": 0.7}, tmp_path / "legal.pesb")
+    registry = DictionaryRegistry(tmp_path)
+    assert registry.get("legal").path == bundle_path
+
+    write_dictionary(legal_path, {"contract": 0.9, "breach": 0.8})
+    registry.refresh()
+    assert registry.get("legal").path == legal_path
+    assert registry.get("legal").importance == {"contract": 0.9, "breach": 0.8}
+
+
+def test_background_watcher(tmp_path, legal_path):
+    """Test that the polling thread reloads trimmer dictionaries."""
+    trimmer = DomainAwareTrimmer(dictionary_path=str(tmp_path), poll_interval=0.01)
+    assert trimmer.trim_prompt("A breach of contract.", "legal") == "contract"
+
+    trimmer.start_watching()
+    try:
+        write_dictionary(legal_path, {"contract": 0.9, "breach": 0.8})
+        deadline = time.monotonic() + 5
+        while "breach" not in trimmer.domain_dictionaries["legal"]:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        trimmer.stop_watching()
+
+    assert trimmer.trim_prompt("A breach of contract.", "legal") == "breach contract"
+
+
+def test_missing_domain(tmp_path):
+    """Test that unknown domains are reported as errors."""
+    trimmer = DomainAwareTrimmer(dictionary_path=str(tmp_path))
+    with pytest.raises(ValueError):
+        trimmer.trim_prompt("text", "missing")
+
+
+def test_stale_load_does_not_replace_newer(tmp_path, legal_path):
+    """Test that a load of an older file version keeps the newer entry."""
+    registry = DictionaryRegistry(tmp_path)
+    stale = registry.get("legal")
+
+    write_dictionary(legal_path, {"contract": 0.9, "breach": 0.8})
+    assert registry.refresh() == ["legal"]
+
+    assert registry._swap(stale) is registry.get("legal")
+    assert registry.get("legal").importance == {"contract": 0.9, "breach": 0.8}
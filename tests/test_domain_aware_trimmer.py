@@ -12,6 +12,7 @@ from prompt_efficiency_suite.domain_aware_trimmer import (
     DomainAwareTrimmer,
     TrimmingResult,
 )
+from prompt_efficiency_suite.term_matcher import TermMatcher
 
 
 @pytest.fixture
@@ -173,3 +174,60 @@ def test_invalid_dictionary_file(trimmer):
     """Test loading invalid dictionary file."""
     with pytest.raises(FileNotFoundError):
         trimmer.load_domain("api", "nonexistent.json")
+
+
+def test_trim_keeps_token_order(trimmer, temp_domain_file):
+    """Test that preserved tokens appear once each, in their original order."""
+    trimmer.load_domain("api", temp_domain_file)
+
+    text = "Make an HTTP request to the REST API endpoint and handle the JSON response"
+    tokens = text.split()
+    result = trimmer.trim(text, "api", preserve_ratio=0.0)
+
+    kept = result.trimmed_text.split()
+    positions = iter(range(len(tokens)))
+    assert all(any(tokens[i] == token for i in positions) for token in kept)
+    assert len(kept) + len(result.removed_terms) == len(tokens)
+
+
+class CountingToken(str):
+    """Token that counts equality comparisons, as list membership scans make."""
+
+    comparisons = 0
+
+    def __eq__(self, other):
+        CountingToken.comparisons += 1
+        return str.__eq__(self, other)
+
+    __hash__ = str.__hash__
+
+
+def test_preserved_mask_is_linear(trimmer, temp_domain_file, monkeypatch):
+    """Test that each token is checked a bounded number of times, without scans."""
+    trimmer.load_domain("api", temp_domain_file)
+    text = "call the API endpoint with filler words here " * 500
+    tokens = [CountingToken(token) for token in text.split()]
+    domain_terms = trimmer._identify_domain_terms(text, "api")
+
+    calls = {"terms": 0, "rules": 0}
+    contains_any = TermMatcher.contains_any
+    apply_custom_rules = trimmer._apply_custom_rules
+
+    def counting_contains_any(self, token):
+        calls["terms"] += 1
+        return contains_any(self, token)
+
+    def counting_apply_custom_rules(token, rules):
+        calls["rules"] += 1
+        return apply_custom_rules(token, rules)
+
+    monkeypatch.setattr(TermMatcher, "contains_any", counting_contains_any)
+    monkeypatch.setattr(trimmer, "_apply_custom_rules", counting_apply_custom_rules)
+
+    CountingToken.comparisons = 0
+    mask = trimmer._preserved_mask(tokens, "api", domain_terms, 1.0)
+
+    assert len(mask) == len(tokens)
+    assert calls["terms"] == len(tokens)
+    assert calls["rules"] <= len(tokens)
+    assert CountingToken.comparisons <= len(tokens)
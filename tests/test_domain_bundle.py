@@ -0,0 +1,90 @@
+"""
+Test suite for precompiled domain dictionary bundles.
+"""
+
+import json
+
+import pytest
+
+from app.trimmer.domain_aware import DomainAwareTrimmer as AppTrimmer
+from prompt_efficiency_suite.domain_aware_trimmer import DomainAwareTrimmer
+from prompt_efficiency_suite.domain_bundle import (
+    DomainBundle,
+    compile_domain_bundle,
+)
+from prompt_efficiency_suite.term_matcher import TermMatcher
+
+
+@pytest.fixture
+def domain_file(tmp_path):
+    """Write a structured domain dictionary."""
+    path = tmp_path / "api.json"
+    path.write_text(
+        json.dumps(
+            {
+                "terms": ["API", "endpoint", "request", "response"],
+                "compound_terms": ["REST API", "HTTP request", "JSON response"],
+                "preserve_patterns": [r"\b[A-Z]{2,}\b"],
+                "remove_patterns": [r"\bTODO\b"],
+            }
+        )
+    )
+    return path
+
+
+@pytest.fixture
+def bundle(domain_file):
+    """Compile and map the domain dictionary."""
+    with DomainBundle(compile_domain_bundle(domain_file)) as bundle:
+        yield bundle
+
+
+def test_bundle_round_trip(bundle):
+    """Test that terms, kinds and patterns survive compilation."""
+    terms, compound_terms = bundle.term_sets()
+    assert terms == {"API", "endpoint", "request", "response"}
+    assert compound_terms == {"REST API", "HTTP request", "JSON response"}
+    assert bundle.preserve_patterns == [r"\b[A-Z]{2,}\b"]
+    assert bundle.remove_patterns == [r"\bTODO\b"]
+    assert set(bundle.importance().values()) == {1.0}
+
+
+def test_packed_matcher_matches_in_memory(bundle):
+    """Test that the mapped automaton finds the same hits as a fresh one."""
+    matcher = TermMatcher(sorted(bundle.terms))
+    text = "Send an HTTP request to the REST API; the JSON response names the endpoint"
+    assert bundle.matcher.find_all(text) == matcher.find_all(text)
+
+
+def test_trimmer_loads_bundle(domain_file, bundle):
+    """Test that trimming with a bundle matches trimming with the source."""
+    from_source = DomainAwareTrimmer()
+    from_source.load_domain("api", domain_file)
+    from_bundle = DomainAwareTrimmer()
+    from_bundle.load_domain("api", bundle.path)
+
+    text = "TODO: send an HTTP request to the REST API endpoint"
+    expected = from_source.trim(text, "api")
+    result = from_bundle.trim(text, "api")
+    assert result.trimmed_text == expected.trimmed_text
+    assert sorted(result.preserved_terms) == sorted(expected.preserved_terms)
+
+
+def test_app_trimmer_prefers_bundle(tmp_path):
+    """Test that the app trimmer maps weighted bundles and preloads them."""
+    compile_domain_bundle({"contract": 0.9, "breach": 0.4}, tmp_path / "legal.pesb")
+    trimmer = AppTrimmer(dictionary_path=str(tmp_path))
+
+    assert trimmer.preload() == ["legal"]
+    assert trimmer.domain_dictionaries["legal"] == {"contract": 0.9, "breach": 0.4}
+    assert trimmer.trim_prompt("A breach of contract.", "legal") == "contract"
+
+
+def test_invalid_bundle(tmp_path):
+    """Test that files that are not bundles are rejected."""
+    path = tmp_path / "bad.pesb"
+    path.write_bytes(b"not a bundle at all")
+    with pytest.raises(ValueError):
+        DomainBundle(path)
+    with pytest.raises(ValueError):
+        compile_domain_bundle({"term": 1.0})
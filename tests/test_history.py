@@ -0,0 +1,135 @@
+"""
+Test suite for bounded histories and streaming aggregates.
+"""
+
+import json
+from dataclasses import dataclass
+
+import pytest
+
+from prompt_efficiency_suite.history import BoundedHistory, RunningStats
+from prompt_efficiency_suite.metrics import EfficiencyMetrics, MetricsTracker
+
+
+@dataclass
+class Sample:
+    """Simple history item for testing."""
+
+    value: float
+    label: str
+
+
+@pytest.fixture
+def history():
+    """Create a small BoundedHistory instance for testing."""
+    return BoundedHistory(
+        capacity=3,
+        metrics={"value": lambda s: s.value},
+        tallies={"labels": lambda s: [s.label]},
+    )
+
+
+def test_running_stats():
+    """Test streaming mean, variance, min and max."""
+    stats = RunningStats()
+    for value in [2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0]:
+        stats.add(value)
+
+    assert stats.count == 8
+    assert stats.total == 40.0
+    assert stats.mean == pytest.approx(5.0)
+    assert stats.variance == pytest.approx(4.0)
+    assert stats.stddev == pytest.approx(2.0)
+    assert stats.minimum == 2.0
+    assert stats.maximum == 9.0
+
+
+def test_capacity_bounds_retained_items(history):
+    """Test that only the most recent items are kept in memory."""
+    for i in range(10):
+        history.append(Sample(value=float(i), label="a" if i % 2 else "b"))
+
+    assert len(history) == 3
+    assert [s.value for s in history] == [7.0, 8.0, 9.0]
+    assert history[-1].value == 9.0
+
+
+def test_aggregates_cover_all_items(history):
+    """Test that aggregates include items evicted from the ring buffer."""
+    for i in range(10):
+        history.append(Sample(value=float(i), label="a" if i % 2 else "b"))
+
+    assert history.total == 10
+    assert history.sum("value") == 45.0
+    assert history.mean("value") == pytest.approx(4.5)
+    assert history.tallies["labels"] == {"a": 5, "b": 5}
+
+
+def test_clear(history):
+    """Test that clearing resets items and aggregates."""
+    history.append(Sample(value=1.0, label="a"))
+    assert history
+
+    history.clear()
+    assert not history
+    assert len(history) == 0
+    assert history.sum("value") == 0.0
+    assert not history.tallies["labels"]
+
+
+def test_spill_to_disk(tmp_path):
+    """Test that every item is appended to the spill file."""
+    spill_path = tmp_path / "audit" / "history.jsonl"
+    history = BoundedHistory(capacity=1, spill_path=spill_path)
+    for i in range(3):
+        history.append(Sample(value=float(i), label="x"))
+    history.close()
+
+    records = [json.loads(line) for line in spill_path.read_text().splitlines()]
+    assert len(history) == 1
+    assert records == [{"value": float(i), "label": "x"} for i in range(3)]
+
+
+def test_window_tallies_follow_evictions():
+    """Test that window tallies only count the retained items."""
+    history = BoundedHistory(
+        capacity=2, window_tallies={"labels": lambda s: {s.label: 1}}
+    )
+    for label in ["a", "b", "a", "c"]:
+        history.append(Sample(value=0.0, label=label))
+
+    assert history.window_tallies["labels"] == {"a": 1, "c": 1}
+
+
+def test_spill_record_replaces_item(tmp_path):
+    """Test that an explicit spill record is written instead of the item."""
+    spill_path = tmp_path / "history.jsonl"
+    history = BoundedHistory(capacity=1, spill_path=spill_path)
+    history.append(Sample(value=1.0, label="x"), spill_record={"full": "text"})
+    history.close()
+
+    assert json.loads(spill_path.read_text()) == {"full": "text"}
+
+
+def test_metrics_tracker_uses_running_aggregates():
+    """Test MetricsTracker statistics over a bounded history."""
+    tracker = MetricsTracker(history_size=2)
+    for i in range(4):
+        tracker.add_metrics(
+            EfficiencyMetrics(
+                prompt_id=str(i),
+                token_count=10 * (i + 1),
+                cost=0.01,
+                latency=float(i),
+                success_rate=1.0,
+                quality_score=0.5,
+            )
+        )
+
+    summary = tracker.get_metrics_summary()
+    assert len(tracker.metrics_history) == 2
+    assert summary["total_prompts"] == 4
+    assert summary["total_tokens"] == 100
+    assert summary["min_latency"] == 0.0
+    assert summary["max_latency"] == 3.0
+    assert tracker.get_average_metrics()["avg_token_count"] == pytest.approx(25.0)
@@ -0,0 +1,136 @@
+"""
+Test suite for the ImageOptimizer class.
+"""
+
+import io
+import random
+
+import pytest
+from PIL import Image
+
+from prompt_efficiency_suite.image_optimizer import (
+    ImageOptimizer,
+    estimate_image_tokens,
+    model_dimensions,
+)
+
+
+def encode_image(size, mode="RGB", fmt="PNG", noise=True, **save_args):
+    """Render an image (noisy by default, so it compresses realistically)."""
+    if noise:
+        rng = random.Random(0)
+        channels = len(mode)
+        image = Image.frombytes(mode, size, rng.randbytes(size[0] * size[1] * channels))
+    else:
+        image = Image.new(mode, size)
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **save_args)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    "size, model, expected",
+    [
+        ((512, 512), "gpt-4o", 85 + 170),
+        ((1024, 1024), "gpt-4o", 85 + 170 * 4),
+        ((4096, 2048), "gpt-4o-2024-08-06", 85 + 170 * 6),
+        ((1000, 1000), "claude-3-5-sonnet", 1334),
+    ],
+)
+def test_estimate_image_tokens(size, model, expected):
+    """Test token estimates against each model's published pricing."""
+    assert estimate_image_tokens(*size, model) == expected
+
+
+def test_model_dimensions():
+    """Test that images are scaled the way the model scales them."""
+    assert model_dimensions(4096, 2048, "gpt-4o") == (1536, 768)
+    assert model_dimensions(3000, 1000, "claude") == (1568, 523)
+
+
+def test_large_png_is_resized_and_converted():
+    """Test that an oversized PNG is shrunk to model size and re-encoded lossy."""
+    data = encode_image((2200, 1400))
+    result = ImageOptimizer(model="gpt-4o").optimize(data)
+
+    assert result.original_format == "png"
+    assert result.format == "webp"
+    assert result.mime_type == "image/webp"
+    assert (result.width, result.height) == model_dimensions(2200, 1400, "gpt-4o")
+    assert result.size < len(data) / 2
+    assert result.tokens <= result.original_tokens
+
+
+def test_tile_snap_saves_tiles():
+    """Test that a sliver past a tile boundary is trimmed off."""
+    result = ImageOptimizer().optimize(encode_image((1040, 500)))
+
+    assert result.width == 1024
+    assert result.tokens_saved == 170
+
+
+def test_token_budget():
+    """Test that images shrink until they fit the token budget."""
+    optimizer = ImageOptimizer(model="gpt-4o", max_tokens=500)
+    result = optimizer.optimize(encode_image((1536, 768)))
+
+    assert result.original_tokens == 85 + 170 * 6
+    assert result.tokens <= 500
+
+
+def test_byte_budget():
+    """Test that quality drops until the encoding fits the byte budget."""
+    result = ImageOptimizer(max_bytes=20_000).optimize(encode_image((600, 600)))
+    assert result.size <= 20_000
+
+
+def test_exif_is_stripped():
+    """Test that EXIF is applied to orientation and then removed."""
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotated 90 degrees
+    exif[0x010F] = "Camera Maker"
+    data = encode_image((300, 200), fmt="JPEG", exif=exif.tobytes())
+
+    result = ImageOptimizer(formats=("jpeg",)).optimize(data)
+    image = Image.open(io.BytesIO(result.data))
+
+    assert image.size == (200, 300)
+    assert not image.getexif()
+
+
+def test_alpha_skips_jpeg():
+    """Test that transparent images are not flattened into JPEG."""
+    data = encode_image((400, 400), mode="RGBA")
+    result = ImageOptimizer(formats=("jpeg", "webp")).optimize(data)
+
+    assert result.format == "webp"
+    assert Image.open(io.BytesIO(result.data)).mode == "RGBA"
+
+
+def test_lossless_keeps_png():
+    """Test that lossless mode re-encodes as PNG only."""
+    data = encode_image((900, 900), noise=False)
+    result = ImageOptimizer(lossless=True).optimize(data)
+    assert result.format == "png"
+
+
+def test_unhelpful_reencode_keeps_original():
+    """Test that images re-encoding cannot improve are passed through."""
+    data = encode_image((8, 8), noise=False, optimize=True)
+    result = ImageOptimizer(lossless=True).optimize(data)
+
+    assert result.data == data
+    assert result.metadata["unchanged"]
+
+
+def test_optimize_many():
+    """Test batch optimization keeps order and skips unreadable images."""
+    images = [encode_image((1100, 600)), b"not an image", encode_image((600, 1100))]
+    results = ImageOptimizer().optimize_many(images)
+
+    assert results[1] is None
+    assert results[0].width > results[0].height
+    assert results[2].height > results[2].width
+
+    with pytest.raises(ValueError):
+        ImageOptimizer().optimize(b"not an image")
@@ -0,0 +1,64 @@
+"""
+Test suite for base64 media probing.
+"""
+
+import base64
+import io
+
+import pytest
+from PIL import Image
+
+from prompt_efficiency_suite.media_probe import (
+    base64_decoded_size,
+    probe_base64_image,
+    probe_image_header,
+)
+
+
+def encode_image(fmt, size=(37, 21), **save_args):
+    """Render a small image and return its encoded bytes."""
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 60)).save(buffer, format=fmt, **save_args)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    "fmt, save_args, expected",
+    [
+        ("PNG", {}, "png"),
+        ("GIF", {}, "gif"),
+        ("JPEG", {}, "jpeg"),
+        ("WEBP", {"lossless": False}, "webp"),
+        ("WEBP", {"lossless": True}, "webp"),
+        ("BMP", {}, "bmp"),
+    ],
+)
+def test_probe_formats(fmt, save_args, expected):
+    """Test format and dimensions against images written by Pillow."""
+    header = probe_image_header(encode_image(fmt, **save_args)[:400])
+    assert header.format == expected
+    assert header.dimensions == (37, 21)
+
+
+def test_jpeg_with_large_metadata():
+    """Test that the prefix grows past large JPEG metadata segments."""
+    data = encode_image("JPEG", size=(640, 480), icc_profile=bytes(20000))
+    payload = base64.b64encode(data).decode()
+
+    assert probe_image_header(data[:400]) is None
+    header = probe_base64_image(payload, 0, len(payload))
+    assert header.dimensions == (640, 480)
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 3, 4, 5, 300])
+def test_decoded_size_matches_decode(length):
+    """Test that size arithmetic agrees with a full decode."""
+    payload = "xx" + base64.b64encode(bytes(length)).decode() + "yy"
+    assert base64_decoded_size(payload, 2, len(payload) - 2) == length
+
+
+def test_invalid_payloads():
+    """Test that malformed padding is rejected instead of guessed."""
+    assert base64_decoded_size("QUJD=", 0, 5) is None
+    assert base64_decoded_size("QQ==QUJD", 0, 8) is None
+    assert probe_base64_image("not an image", 0, 12) is None
@@ -0,0 +1,126 @@
+"""
+Test suite for the MultimodalCompressor class.
+"""
+
+import base64
+import io
+import tracemalloc
+
+import pytest
+from PIL import Image
+
+from prompt_efficiency_suite.multimodal_compressor import MultimodalCompressor
+
+
+@pytest.fixture
+def compressor():
+    """Create a MultimodalCompressor instance for testing."""
+    return MultimodalCompressor()
+
+
+def test_many_media_elements_round_trip(compressor):
+    """Test that a dozen media elements survive compression unchanged, in order."""
+    images = [f"![img{i}](https://example.com/{i}.png)" for i in range(12)]
+    text = "  ".join(
+        f"This is really image {i}: {image}" for i, image in enumerate(images)
+    )
+
+    result = compressor.compress(text)
+
+    positions = [result.compressed_text.index(image) for image in images]
+    assert positions == sorted(positions)
+    assert "really" not in result.compressed_text
+    assert "really" in result.removed_tokens
+    assert len(result.preserved_media) == 12
+
+
+def test_media_adjacent_to_text(compressor):
+    """Test that text right next to a media span is compressed around it."""
+    payload = base64.b64encode(b"\x89PNG" + bytes(64)).decode()
+    media = f"data:image/png;base64,{payload}"
+    text = f"See:{media} very   quickly!!"
+
+    result = compressor.compress(text)
+
+    assert result.compressed_text == f"See:{media} quickly!"
+    assert result.preserved_media[0].media_type == "image"
+
+
+def test_large_payload_memory(compressor):
+    """Test that compressing a large image does not copy it repeatedly."""
+    payload = base64.b64encode(bytes(3_000_000)).decode()
+    text = f"Look   at this: data:image/png;base64,{payload} really now."
+
+    tracemalloc.start()
+    try:
+        result = compressor.compress(text)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert payload in result.compressed_text
+    assert peak < 2.5 * len(text)
+
+
+def test_history_keeps_no_payloads(compressor):
+    """Test that the history records lengths, not the prompt texts."""
+    payload = base64.b64encode(bytes(1_000_000)).decode()
+    text = f"Look   at this: data:image/png;base64,{payload}"
+
+    tracemalloc.start()
+    try:
+        compressed_length = len(compressor.compress(text).compressed_text)
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    record = compressor.compression_history[-1]
+    assert (record.original_length, record.compressed_length) == (
+        len(text),
+        compressed_length,
+    )
+    assert retained < len(payload) // 10
+
+
+def test_base64_image_metadata(compressor):
+    """Test that base64 images are sized and measured from their header."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48)).save(buffer, format="PNG")
+    data = buffer.getvalue()
+    text = f"Chart: data:image/jpeg;base64,{base64.b64encode(data).decode()}"
+
+    info = compressor.compress(text).preserved_media[0]
+
+    assert info.format == "png"
+    assert info.size == len(data)
+    assert info.dimensions == (64, 48)
+
+
+def test_image_url_format(compressor):
+    """Test that markdown image formats come from the URL extension."""
+    result = compressor.compress("Logo: ![logo](https://example.com/logo.PNG?v=2)")
+    assert result.preserved_media[0].format == "png"
+
+
+def test_image_optimization():
+    """Test that base64 images are resized and re-encoded when enabled."""
+    buffer = io.BytesIO()
+    Image.effect_noise((1600, 1600), 64).convert("RGB").save(buffer, format="PNG")
+    payload = base64.b64encode(buffer.getvalue()).decode()
+    text = f"Really look at data:image/png;base64,{payload} now."
+    compressor = MultimodalCompressor({"image_optimization": {"model": "gpt-4o"}})
+
+    result = compressor.compress(text)
+    info = result.preserved_media[0]
+
+    assert info.format == "webp"
+    assert info.dimensions == (768, 768)
+    assert info.metadata["optimization"]["original_dimensions"] == (1600, 1600)
+    assert result.metadata["image_tokens_saved"] == 0
+    assert "data:image/webp;base64," in result.compressed_text
+    assert result.compressed_text.endswith(" now.")
+    assert len(result.compressed_text) < len(text) / 2
+
+    disabled = compressor.compress(text, {"image_optimization": False})
+    assert payload in disabled.compressed_text
+    assert compressor.get_compression_stats()["total_image_tokens_saved"] == 0
@@ -0,0 +1,73 @@
+"""
+Test suite for the shared spaCy pipeline pool.
+"""
+
+import pytest
+import spacy
+
+from prompt_efficiency_suite.analyzer import PromptAnalyzer
+from prompt_efficiency_suite.nlp_pool import (
+    clear_nlp_cache,
+    components_to_disable,
+    get_nlp,
+)
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    """Save a small pipeline with a sentencizer to disk."""
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    path = tmp_path / "pipeline"
+    nlp.to_disk(path)
+    clear_nlp_cache()
+    yield str(path)
+    clear_nlp_cache()
+
+
+def test_pipeline_is_loaded_once(model_path):
+    """Test that repeated lookups share one pipeline."""
+    assert get_nlp(model_path) is get_nlp(model_path)
+
+
+def test_components_to_disable(model_path):
+    """Test that components unused by the enabled features are disabled."""
+    nlp = get_nlp(model_path)
+    assert components_to_disable(nlp, ["tokens"]) == ["sentencizer"]
+    assert components_to_disable(nlp, ["tokens", "sentences"]) == []
+
+    with pytest.raises(ValueError):
+        components_to_disable(nlp, ["sentiment"])
+
+
+def test_analyzer_construction_is_cheap(model_path):
+    """Test that analyzers share the pooled pipeline."""
+    first = PromptAnalyzer(model_name=model_path)
+    second = PromptAnalyzer(model_name=model_path)
+    assert first.nlp is second.nlp
+
+
+def test_batch_analyze_matches_analyze(model_path):
+    """Test that nlp.pipe batching gives the same results as single calls."""
+    analyzer = PromptAnalyzer(model_name=model_path, batch_size=2)
+    texts = [
+        "First sentence. Second sentence.",
+        "One more",
+        "Red fish. Blue fish. Done.",
+    ]
+
+    batch = analyzer.batch_analyze(texts)
+    single = [analyzer.analyze(text) for text in texts]
+
+    assert [r.sentence_count for r in batch] == [2, 1, 3]
+    assert [r.model_dump() for r in batch] == [r.model_dump() for r in single]
+
+
+def test_disabled_features_are_skipped(model_path):
+    """Test that disabling sentence features skips the sentencizer."""
+    analyzer = PromptAnalyzer(model_name=model_path, features=["tokens"])
+    result = analyzer.analyze("First sentence. Second sentence.")
+
+    assert analyzer.disabled_components == ["sentencizer"]
+    assert result.sentence_count == 0
+    assert result.token_count == 6
@@ -0,0 +1,46 @@
+"""
+Test suite for process-pool batch optimization in the optimizer module.
+"""
+
+import multiprocessing
+
+import pytest
+
+from prompt_efficiency_suite.optimizer import BatchOptimizer
+
+
+@pytest.fixture
+def prompts():
+    """Create a batch of prompts with filler words and code."""
+    return [f"Prompt {i} is really very simple `keep really`" for i in range(25)]
+
+
+def test_parallel_matches_serial(prompts):
+    """Test that parallel results are identical and in input order."""
+    serial = BatchOptimizer().optimize_batch(prompts)
+
+    with BatchOptimizer(
+        max_workers=2,
+        chunk_size=4,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as batch_optimizer:
+        parallel = batch_optimizer.optimize_batch(prompts, parallel=True)
+
+        assert [r.optimized_prompt for r in parallel] == [
+            r.optimized_prompt for r in serial
+        ]
+        assert parallel[3].original_prompt == prompts[3]
+        assert "`keep really`" in parallel[0].optimized_prompt
+
+        stats = batch_optimizer.get_batch_stats()
+        assert stats["total_prompts"] == len(prompts)
+        assert batch_optimizer.optimizer.optimization_history.total == len(prompts)
+
+
+def test_single_chunk_runs_in_process(prompts):
+    """Test that batches that fit in one chunk do not start a pool."""
+    batch_optimizer = BatchOptimizer(chunk_size=100)
+    results = batch_optimizer.optimize_batch(prompts, parallel=True)
+
+    assert len(results) == len(prompts)
+    assert batch_optimizer._executor is None
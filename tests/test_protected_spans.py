@@ -0,0 +1,97 @@
+"""
+Test suite for the shared protected-span index.
+"""
+
+import pytest
+
+from prompt_efficiency_suite.code_aware_compressor import CodeAwareCompressor
+from prompt_efficiency_suite.multimodal_compressor import MultimodalCompressor
+from prompt_efficiency_suite.protected_spans import (
+    CODE_KINDS,
+    ProtectedSpan,
+    ProtectedSpanIndex,
+)
+
+
+@pytest.fixture
+def text():
+    """Create a prompt mixing prose, code, examples and media."""
+    return (
+        "Intro `x = 1` text\n"
+        "```python\nprint('hi')\n```\n"
+        "    indented = True\n"
+        "Example: keep this\n\n"
+        "See ![chart](chart.png) end"
+    )
+
+
+def test_spans_are_sorted_and_typed(text):
+    """Test that a single scan finds every kind in text order."""
+    index = ProtectedSpanIndex(text)
+    kinds = [span.kind for span in index]
+    assert kinds == ["inline_code", "code_block", "indented_code", "example", "image"]
+    assert all(a.end <= b.start for a, b in zip(index.spans, index.spans[1:]))
+    assert text[index.spans[0].start : index.spans[0].end] == "`x = 1`"
+
+
+def test_kinds_filter(text):
+    """Test restricting the index to a subset of kinds."""
+    index = ProtectedSpanIndex(text, kinds=("code_block",))
+    assert len(index) == 1
+    start = text.index("```")
+    end = text.index("```", start + 3) + 3
+    assert index.spans[0] == ProtectedSpan(start, end, "code_block")
+
+
+def test_gaps_and_is_protected(text):
+    """Test that gaps cover exactly the unprotected text."""
+    index = ProtectedSpanIndex(text, kinds=CODE_KINDS)
+    covered = sum(end - start for start, end in index.gaps())
+    covered += sum(span.end - span.start for span in index)
+    assert covered == len(text)
+    assert index.is_protected(text.index("x = 1"))
+    assert not index.is_protected(0)
+    assert not index.is_protected(len(text) - 1)
+
+
+def test_transform_gaps_leaves_spans_untouched(text):
+    """Test that transforms only ever see editable gaps."""
+    index = ProtectedSpanIndex(text)
+    transformed = index.transform_gaps(str.upper)
+    assert transformed.startswith("INTRO `x = 1` TEXT\n")
+    assert "print('hi')" in transformed
+    assert "![chart](chart.png) END" in transformed
+
+
+def test_transform_gaps_applies_empty_replacement(text):
+    """Test that an empty replacement removes its span instead of keeping it."""
+    index = ProtectedSpanIndex(text)
+    inline, image = index.spans[0], index.spans[-1]
+    transformed = index.transform_gaps(
+        lambda gap: gap, replacements={inline: "", image: "[img]"}
+    )
+    assert transformed.startswith("Intro  text\n")
+    assert transformed.endswith("See [img] end")
+
+
+def test_text_without_spans():
+    """Test that plain text is a single gap."""
+    index = ProtectedSpanIndex("just text")
+    assert len(index) == 0
+    assert list(index.gaps()) == [(0, 9)]
+    assert index.transform_gaps(str.upper) == "JUST TEXT"
+
+
+def test_code_aware_sections():
+    """Test CodeAwareCompressor section splitting on the shared index."""
+    sections = CodeAwareCompressor()._split_sections("a ```b``` c")
+    assert sections == [("text", "a "), ("code", "```b```"), ("text", " c")]
+
+
+def test_multimodal_preserves_media_without_placeholders():
+    """Test that media survive compression and placeholder-like text is kept."""
+    compressor = MultimodalCompressor()
+    text = "MEDIA_0 is really   here ![a](a.png) and very  ![b](b.gif) done"
+    result = compressor.compress(text)
+    assert result.compressed_text == "MEDIA_0 is here ![a](a.png) and ![b](b.gif) done"
+    assert [m.media_type for m in result.preserved_media] == ["image", "image"]
@@ -0,0 +1,58 @@
+"""
+Test suite for the single-pass RewriteEngine.
+"""
+
+import pytest
+
+from prompt_efficiency_suite.rewrite_engine import RewriteEngine
+
+
+@pytest.fixture
+def engine():
+    """Create a RewriteEngine with filler rules and protected code."""
+    return RewriteEngine(
+        removals={
+            "redundant_phrases": [r"\bin other words\b", r"\bbasically\b"],
+            "filler_words": [r"\bvery\b", r"\breally\b", r"\bjust\b"],
+        },
+        protected=[r"```[\s\S]*?```", r"`[^`]+`"],
+    )
+
+
+def test_removes_all_categories_in_one_pass(engine):
+    """Test that every rule category is applied."""
+    text = "In short, basically this is very really simple"
+    assert engine.rewrite(text) == "In short,  this is   simple"
+
+
+def test_protected_regions_are_untouched(engine):
+    """Test that matches inside protected spans are kept."""
+    text = "Run `just very` now\n```\nreally = 1\n```\nreally done"
+    assert engine.rewrite(text) == "Run `just very` now\n```\nreally = 1\n```\n done"
+
+
+def test_placeholder_like_text_is_not_corrupted(engine):
+    """Test that text resembling placeholders survives rewriting."""
+    text = "PRESERVED_0_1 and MEDIA_1 are just labels `code`"
+    assert engine.rewrite(text) == "PRESERVED_0_1 and MEDIA_1 are  labels `code`"
+
+
+def test_rewrite_with_stats(engine):
+    """Test per-category removal counts."""
+    text = "basically very `very` really"
+    rewritten, stats = engine.rewrite_with_stats(text)
+    assert rewritten == "  `very` "
+    assert stats == {"redundant_phrases": 1, "filler_words": 2}
+
+
+def test_empty_rules_return_text_unchanged():
+    """Test that an engine without rules is a no-op."""
+    assert RewriteEngine(removals={}).rewrite("very text") == "very text"
+
+
+def test_large_input(engine):
+    """Test rewriting a large prompt."""
+    text = "Please just really explain `code` basically. " * 2500
+    rewritten = engine.rewrite(text)
+    assert "just" not in rewritten
+    assert rewritten.count("`code`") == 2500
@@ -0,0 +1,87 @@
+"""
+Test suite for the streaming JSONL pipeline.
+"""
+
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import pytest
+
+from prompt_efficiency_suite.streaming import (
+    iter_chunks,
+    ordered_window,
+    read_jsonl,
+    write_jsonl,
+)
+
+
+@dataclass
+class Record:
+    """Simple output record for testing."""
+
+    prompt: str
+    length: int
+
+
+@pytest.fixture
+def jsonl_file(tmp_path):
+    """Create a JSONL input with objects, bare strings and bad lines."""
+    path = tmp_path / "prompts.jsonl"
+    path.write_text(
+        '{"prompt": "first"}\n'
+        '"second"\n'
+        "\n"
+        "not json\n"
+        '{"other": "missing prompt"}\n'
+        '{"prompt": "third", "id": 3}\n'
+    )
+    return path
+
+
+def test_read_jsonl(jsonl_file):
+    """Test that valid prompts are yielded and bad lines skipped."""
+    assert list(read_jsonl(jsonl_file)) == ["first", "second", "third"]
+
+
+def test_read_jsonl_is_lazy():
+    """Test that lines are only read as prompts are consumed."""
+    source = io.StringIO('"a"\n"b"\n"c"\n')
+    prompts = read_jsonl(source)
+    assert next(prompts) == "a"
+    assert source.readline() == '"b"\n'
+
+
+def test_write_jsonl(tmp_path):
+    """Test writing dataclass records incrementally."""
+    path = tmp_path / "out.jsonl"
+    count = write_jsonl((Record(p, len(p)) for p in ["a", "bb"]), path)
+
+    assert count == 2
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert lines == [{"prompt": "a", "length": 1}, {"prompt": "bb", "length": 2}]
+
+
+def test_iter_chunks():
+    """Test lazy chunking."""
+    assert list(iter_chunks(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(iter_chunks([], 3)) == []
+
+
+def test_ordered_window_bounds_in_flight():
+    """Test that results are ordered and input is pulled within the window."""
+    pulled = []
+
+    def items():
+        for i in range(20):
+            pulled.append(i)
+            yield i
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = ordered_window(
+            lambda i: executor.submit(lambda x: x * x, i), items(), window=3
+        )
+        assert next(results) == 0
+        assert len(pulled) == 3
+        assert list(results) == [i * i for i in range(1, 20)]
@@ -0,0 +1,215 @@
+"""
+Test suite for streaming JSON and YAML minification.
+"""
+
+import io
+import json
+import random
+import tracemalloc
+
+import pytest
+import yaml
+
+from prompt_efficiency_suite.structured_minifier import (
+    minify_json,
+    minify_json_stream,
+    minify_yaml,
+    minify_yaml_stream,
+)
+
+SAMPLE = {
+    "name": "Test",
+    "version": 1.5,
+    "notes": None,
+    "tags": [],
+    "deps": {"a": None, "b": {}},
+    "items": [None, {}, {"id": 1, "secret": "x"}],
+    "text": 'quote " backslash \\ café',
+}
+
+
+def random_value(rng, depth=0):
+    """Build a random JSON value."""
+    choice = rng.random()
+    if depth > 4 or choice < 0.4:
+        return rng.choice(
+            [None, True, 0, -1.5e3, 'a"\\b', "", "x" * rng.randint(0, 90)]
+        )
+    if choice < 0.7:
+        return {f"k{i}": random_value(rng, depth + 1) for i in range(rng.randint(0, 4))}
+    return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+
+
+def prune(value, keys=()):
+    """Reference implementation of drop_nulls + drop_empty + drop_keys."""
+    if isinstance(value, dict):
+        pruned = {}
+        for key, member in value.items():
+            member = prune(member, keys)
+            if key in keys or member is None or member in ({}, []):
+                continue
+            pruned[key] = member
+        return pruned
+    if isinstance(value, list):
+        return [prune(item, keys) for item in value]
+    return value
+
+
+def test_minify_json():
+    """Test that whitespace goes and everything else is kept."""
+    text = json.dumps(SAMPLE, indent=4)
+    assert minify_json(text) == json.dumps(
+        SAMPLE, separators=(",", ":"), ensure_ascii=False
+    )
+
+
+def test_drop_options():
+    """Test that nulls, empty containers and keys are dropped as members."""
+    result = minify_json(
+        json.dumps(SAMPLE), drop_nulls=True, drop_empty=True, drop_keys=["secret"]
+    )
+    assert json.loads(result) == {
+        "name": "Test",
+        "version": 1.5,
+        "items": [None, {}, {"id": 1}],
+        "text": SAMPLE["text"],
+    }
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 65536])
+def test_chunk_boundaries(chunk_size):
+    """Test random documents at chunk sizes that split every kind of token."""
+    rng = random.Random(chunk_size)
+    for _ in range(100):
+        value = random_value(rng)
+        text = json.dumps(value, indent=rng.choice([None, 2]))
+        assert json.loads(minify_json(text, chunk_size=chunk_size)) == value
+        pruned = minify_json(
+            text,
+            chunk_size=chunk_size,
+            drop_nulls=True,
+            drop_empty=True,
+            drop_keys=["k1"],
+        )
+        assert json.loads(pruned) == prune(value, keys=["k1"])
+
+
+def test_numbers_keep_their_text():
+    """Test that numbers are copied, not re-formatted through floats."""
+    assert minify_json('{"a": [1e5, 1.50, -0.0, 10]}') == '{"a":[1e5,1.50,-0.0,10]}'
+
+
+def test_pruned_output_does_not_depend_on_chunk_size():
+    """Test that output, pruned or not, is the same at every chunk size."""
+    text = '{"a": 1.10, "big": 1e400, "n": null, "s": "\\u00e9", "l": [-0, {}]}'
+    outputs = {
+        minify_json(text, chunk_size=chunk_size, drop_nulls=True, drop_empty=True)
+        for chunk_size in (1, 4, 16, 64, 65536)
+    }
+    assert outputs == {'{"a":1.10,"big":1e400,"s":"é","l":[-0,{}]}'}
+
+    rng = random.Random(0)
+    for _ in range(50):
+        value = {"s": 'é😀\n"', "f": 2.50, "n": None, "v": random_value(rng)}
+        text = json.dumps(value, indent=2)
+        for options in ({}, {"drop_nulls": True, "drop_keys": ["k1"]}):
+            outputs = {
+                minify_json(text, chunk_size=chunk_size, **options)
+                for chunk_size in (1, 3, 64, 65536)
+            }
+            assert len(outputs) == 1
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "{", "[1,]", '{"a" 1}', '{"a":1,}', "[1 2]", "1 2", '"abc', "[}", "[NaN]"],
+)
+def test_invalid_json(text):
+    """Test that malformed documents raise ValueError."""
+    with pytest.raises(ValueError):
+        minify_json(text, chunk_size=4)
+
+
+def test_large_document_memory(tmp_path):
+    """Test that memory stays bounded by the chunk size, not the document."""
+    source = tmp_path / "large.json"
+    record = json.dumps({"id": 1, "name": "x" * 50, "meta": {"n": None}}, indent=2)
+    with open(source, "w") as f:
+        f.write('{"blob": "' + "y" * 2_000_000 + '", "records": [')
+        f.write(",".join([record] * 20000))
+        f.write("]}")
+
+    tracemalloc.start()
+    try:
+        stats = minify_json_stream(source, tmp_path / "out.json", drop_nulls=True)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 1_000_000 < stats.input_chars
+    assert stats.output_chars < stats.input_chars
+    result = json.loads((tmp_path / "out.json").read_text())
+    assert result["records"][0] == {"id": 1, "name": "x" * 50, "meta": {}}
+
+
+def test_minify_yaml():
+    """Test that YAML becomes the same compact JSON safe_load would give."""
+    text = """
+base: &base {a: 1, b: [x, "2"]}
+other:
+  <<: *base
+  c: 2020-01-01
+  d: ~
+  flag: yes
+copies: [*base, *base]
+"""
+    expected = json.loads(json.dumps(yaml.safe_load(text), default=str))
+    assert json.loads(minify_yaml(text)) == expected
+    assert json.loads(minify_yaml(text, drop_nulls=True))["other"].keys() == {
+        "a",
+        "b",
+        "c",
+        "flag",
+    }
+
+
+def test_yaml_stream():
+    """Test streaming YAML between file handles, one line per document."""
+    output = io.StringIO()
+    stats = minify_yaml_stream(io.StringIO("a: 1\n---\n- b\n"), output)
+
+    assert output.getvalue() == '{"a":1}\n["b"]'
+    assert (stats.input_chars, stats.output_chars) == (13, 13)
+
+    with pytest.raises(ValueError):
+        minify_yaml("a: [1, 2")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "b: &b {x: 1, y: 2}\no: {x: 5, <<: *b}",
+        "a: &a {x: 1}\nb: &b {x: 2, z: 3}\no: {<<: [*a, *b], z: 9}",
+        "a: &a {x: 1, <<: {y: 2}}\nb: {<<: *a, x: 0}",
+    ],
+)
+def test_yaml_merge_precedence(text):
+    """Test that merged keys never override explicit or earlier ones."""
+    result = minify_yaml(text)
+    pairs = json.loads(result, object_pairs_hook=lambda items: items)
+    for _, members in pairs:
+        assert len({key for key, _ in members}) == len(members)
+    assert json.loads(result) == yaml.safe_load(text)
+
+
+@pytest.mark.parametrize("text", ["a: .inf", "- -.inf", "a: [1, .nan]"])
+def test_yaml_non_finite_rejected(text):
+    """Test that YAML infinities and NaNs raise, as they do for JSON input."""
+    with pytest.raises(ValueError):
+        minify_yaml(text)
+
+
+def test_yaml_complex_keys_rejected():
+    """Test that non-scalar mapping keys raise instead of writing bad JSON."""
+    with pytest.raises(ValueError):
+        minify_yaml("? [1, 2]\n: c\n")
@@ -0,0 +1,52 @@
+"""
+Test suite for the Aho-Corasick term matcher.
+"""
+
+import pytest
+
+from prompt_efficiency_suite.term_matcher import TermMatch, TermMatcher
+
+
+@pytest.fixture
+def matcher():
+    """Create a matcher with overlapping and compound terms."""
+    return TermMatcher(["he", "she", "his", "hers", "REST API", "API"])
+
+
+def test_finds_overlapping_matches(matcher):
+    """Test that every occurrence is found with offsets."""
+    assert matcher.find_all("ushers") == [
+        TermMatch(1, 4, "she"),
+        TermMatch(2, 4, "he"),
+        TermMatch(2, 6, "hers"),
+    ]
+
+
+def test_case_insensitive(matcher):
+    """Test that matching ignores case and reports dictionary spellings."""
+    text = "Call our rest api"
+    assert matcher.find_terms(text) == {"REST API", "API"}
+    hit = matcher.find_all(text)[0]
+    assert text[hit.start : hit.end] == "rest api"
+
+
+def test_contains_any(matcher):
+    """Test early-exit containment checks."""
+    assert matcher.contains_any("Theory")
+    assert not matcher.contains_any("xyz")
+
+
+def test_empty_and_duplicate_terms():
+    """Test that empty terms are ignored and case duplicates collapse."""
+    matcher = TermMatcher(["", "Term", "term"])
+    assert len(matcher) == 1
+    assert matcher.find_terms("TERM") == {"Term"}
+    assert TermMatcher().find_all("anything") == []
+
+
+def test_large_dictionary():
+    """Test that a large dictionary is searched in a single pass."""
+    matcher = TermMatcher(f"term{i}x" for i in range(10000))
+    text = "the term42x and term9999x appear here " * 100
+    assert matcher.find_terms(text) == {"term42x", "term9999x"}
+    assert len(matcher.find_all(text)) == 200
@@ -0,0 +1,109 @@
+"""
+Test suite for the TokenCountCache class.
+"""
+
+import pytest
+
+from prompt_efficiency_suite.token_cache import TokenCountCache
+from prompt_efficiency_suite.token_counter import TokenCountingEngine
+
+
+@pytest.fixture
+def cache():
+    """Create a small TokenCountCache instance for testing."""
+    return TokenCountCache(max_size=2, ttl=None)
+
+
+def test_hit_and_miss(cache):
+    """Test that lookups are counted as hits and misses."""
+    key = cache.make_key("cl100k_base", "Hello world")
+    assert cache.get(key) is None
+    cache.put(key, 2)
+    assert cache.get(key) == 2
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_keys_depend_on_encoding():
+    """Test that the same text under different encodings uses different keys."""
+    assert TokenCountCache.make_key("cl100k_base", "text") != TokenCountCache.make_key(
+        "o200k_base", "text"
+    )
+
+
+def test_lru_eviction(cache):
+    """Test that the least recently used entry is evicted first."""
+    first = cache.make_key("enc", "first")
+    second = cache.make_key("enc", "second")
+    third = cache.make_key("enc", "third")
+
+    cache.put(first, 1)
+    cache.put(second, 2)
+    cache.get(first)
+    cache.put(third, 3)
+
+    assert len(cache) == 2
+    assert cache.get(second) is None
+    assert cache.get(first) == 1
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_ttl_expiry(monkeypatch):
+    """Test that entries expire after the configured TTL."""
+    now = [100.0]
+    monkeypatch.setattr(
+        "prompt_efficiency_suite.token_cache.time.monotonic", lambda: now[0]
+    )
+
+    cache = TokenCountCache(max_size=10, ttl=60)
+    key = cache.make_key("enc", "text")
+    cache.put(key, 5)
+    now[0] += 30
+    assert cache.get(key) == 5
+    now[0] += 31
+    assert cache.get(key) is None
+    assert cache.get_stats()["expirations"] == 1
+
+
+def test_from_config():
+    """Test building a cache from the config.yaml cache block."""
+    cache = TokenCountCache.from_config(
+        {"enabled": True, "ttl": 3600, "max_size": 1000}
+    )
+    assert cache.enabled
+    assert cache.ttl == 3600
+    assert cache.max_size == 1000
+
+
+def test_disabled_cache_stores_nothing():
+    """Test that a disabled cache never stores or serves entries."""
+    cache = TokenCountCache(enabled=False)
+    key = cache.make_key("enc", "text")
+    cache.put(key, 1)
+    assert cache.get(key) is None
+    assert len(cache) == 0
+
+
+def test_engine_serves_repeated_counts_from_cache():
+    """Test that the engine only counts a repeated text once."""
+    engine = TokenCountingEngine(cache=TokenCountCache(max_size=10))
+    first = engine.count("The same system prompt")
+    second = engine.count("The same system prompt")
+    assert first == second
+
+    stats = engine.cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_engine_batch_uses_cache():
+    """Test that batch counting reuses and fills the cache."""
+    engine = TokenCountingEngine(cache=TokenCountCache(max_size=10))
+    engine.count("cached prompt")
+    counts = engine.count_batch(["cached prompt", "new prompt", "cached prompt"])
+
+    assert counts[0] == counts[2] == engine.count("cached prompt")
+    assert engine.cache.get_stats()["size"] == 2
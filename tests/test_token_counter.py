@@ -0,0 +1,122 @@
+"""
+Test suite for the TokenCounter class and the shared token counting engine.
+"""
+
+import json
+
+import pytest
+
+from prompt_efficiency_suite.token_counter import (
+    ApproximateEncoding,
+    TokenCounter,
+    TokenCountingEngine,
+    get_token_engine,
+)
+
+
+@pytest.fixture
+def counter():
+    """Create a TokenCounter instance for testing."""
+    return TokenCounter()
+
+
+def test_engine_is_shared():
+    """Test that every counter uses the same process-wide engine."""
+    assert TokenCounter().engine is get_token_engine()
+    assert TokenCounter("gpt-3.5-turbo").engine is TokenCounter().engine
+
+
+def test_encoding_loaded_once_per_model():
+    """Test that encodings are cached and shared between models."""
+    engine = TokenCountingEngine()
+    encoding = engine.get_encoding("gpt-4")
+    assert engine.get_encoding("gpt-4") is encoding
+    assert engine.get_encoding("gpt-3.5-turbo") is encoding
+
+
+def test_encoding_name_for_model():
+    """Test resolving encodings from model names."""
+    engine = TokenCountingEngine()
+    assert engine.encoding_name_for_model("gpt-4") == "cl100k_base"
+    assert engine.encoding_name_for_model("gpt-4o-mini") == "o200k_base"
+    assert engine.encoding_name_for_model("text-davinci-003") == "p50k_base"
+    assert engine.encoding_name_for_model("unknown-model") == "cl100k_base"
+
+
+def test_count(counter):
+    """Test counting tokens in a prompt."""
+    assert counter.count("") == 0
+    assert counter.count("Hello") > 0
+    assert counter.count("Hello, world!") > counter.count("Hello")
+
+
+def test_count_batch_matches_count(counter):
+    """Test that batch counts match single counts and keep input order."""
+    prompts = ["Hello", "Hello, world!", "", "A longer prompt with more tokens."]
+    assert counter.count_batch(prompts) == [counter.count(p) for p in prompts]
+
+
+def test_count_batch_chunking():
+    """Test that batch counting works across chunk boundaries."""
+    engine = TokenCountingEngine(batch_chunk_size=2)
+    prompts = [f"prompt number {i}" for i in range(5)]
+    assert engine.count_batch(prompts) == [engine.count(p) for p in prompts]
+
+
+def test_count_with_model(counter):
+    """Test counting tokens with model information."""
+    result = counter.count_with_model("This is a test prompt", "gpt-4o")
+    assert result["token_count"] > 0
+    assert result["model"] == "gpt-4o"
+    assert result["encoding"] == "o200k_base"
+    assert result["max_tokens"] == 128000
+
+
+def test_approximate_encoding_counts_pieces():
+    """Test the regex fallback used when BPE encodings are unavailable."""
+    encoding = ApproximateEncoding("cl100k_base")
+    assert encoding.count("") == 0
+    assert encoding.count("Hello world") == 2
+    assert encoding.count("Hello, world!") == 4
+
+
+def test_count_tokens_records_history(counter):
+    """Test that count_tokens records a history entry."""
+    count = counter.count_tokens("This is a test text")
+    assert count > 0
+    assert len(counter.count_history) == 1
+    assert counter.get_count_stats()["total_counts"] == 1
+
+
+def test_history_keeps_no_text(counter):
+    """Test that retained records hold counts, not the counted text."""
+    counter.count_tokens("alpha beta alpha")
+
+    record = counter.count_history[-1]
+    assert record.text_length == len("alpha beta alpha")
+    assert record.token_distribution == {}
+    assert "unique_tokens" not in counter.get_count_stats()
+
+
+def test_history_path_receives_text(tmp_path):
+    """Test that the opt-in spill file keeps the full text."""
+    history_path = tmp_path / "counts.jsonl"
+    counter = TokenCounter(history_path=history_path)
+    counter.count_tokens("alpha beta")
+    counter.count_history.close()
+
+    record = json.loads(history_path.read_text())
+    assert record["text"] == "alpha beta"
+    assert record["text_length"] == 10
+
+
+def test_word_frequencies_cover_retained_counts():
+    """Test that word statistics stay bounded by the history size."""
+    counter = TokenCounter(history_size=2, track_words=True)
+    for i in range(5):
+        counter.count_tokens(f"word{i} shared")
+
+    stats = counter.get_count_stats()
+    assert stats["total_counts"] == 5
+    assert stats["unique_tokens"] == 3
+    assert stats["most_common_tokens"][0] == ("shared", 2)